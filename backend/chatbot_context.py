@@ -0,0 +1,113 @@
+"""
+Pre-rendered `/api/chatbot/context` responses.
+
+The endpoint used to format the same multi-line prompt context and response
+dict for a district on every call. A `ChatbotContexts` belongs to one
+`DistrictIndex`, so everything in it is for one data version. For each
+district, or tuple of districts in a comparison such as "Hisar vs Karnal",
+it renders the response once into JSON fragments. These are held in a
+bounded LRU, and a request only splices in the name it asked with. A
+comparison is assembled from the districts' cached sections.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+CONTEXT_CACHE_SIZE = 256
+
+SUGGESTIONS = {"Critical": "critical_warning", "Warning": "warning", "Safe": "safe_to_proceed"}
+COMPARISON_SUGGESTION = "compare_districts"
+
+INSTRUCTIONS = """INSTRUCTIONS:
+- Use the REAL-TIME DATA above to answer the user's question
+- Cite actual numbers (water level, RMSE, status)
+- If status is "Critical" → strongly advise AGAINST extraction
+- If status is "Warning" → suggest caution + monitoring
+- If status is "Safe" → approve with sustainable practices
+- Keep answer under 150 words
+- Be specific and helpful"""
+
+COMPARISON_INSTRUCTIONS = """INSTRUCTIONS:
+- Compare the districts using the REAL-TIME DATA above
+- Cite actual numbers for each district (water level, RMSE, status)
+- Say which district is at higher risk and why
+- Apply each district's advisory to that district only
+- Keep answer under 200 words
+- Be specific and helpful"""
+
+
+def _json_string_body(text: str) -> bytes:
+    """`text` JSON-escaped, without the surrounding quotes, so fragments can be joined"""
+    return orjson.dumps(text)[1:-1]
+
+
+def _district_facts(entry: Dict[str, Any]) -> str:
+    record, data = entry["record"], entry["chatbot"]
+    return f"""Location: {record['village']}, {record['block']} Block
+Current Water Level: {data['meanActual']}m depth
+Predicted Water Level: {data['meanPredicted']}m
+Prediction Accuracy (RMSE): {data['rmse']}m
+Mean Absolute Error (MAE): {data['mae']}m
+Model Fit Quality (R²): {data['r2']}
+Number of Predictions: {data['nPredictions']}
+Risk Status: {entry['status']}"""
+
+
+class ContextPayload:
+    """One rendered response; `render(name)` only inserts the displayed district name"""
+
+    def __init__(self, district_data: Dict[str, Any], context_tail: str, suggestion: str,
+                 comparison: Optional[List[Dict[str, Any]]] = None):
+        # {"district_found": <name>, "district_data": ..., "context": "REAL-TIME DATA FOR <NAME>:<tail>", ...}
+        self.district_data = district_data
+        self.suggestion = suggestion
+        self._middle = (b',"district_data":' + orjson.dumps(district_data)
+                        + b',"context":"REAL-TIME DATA FOR ')
+        self._tail = (_json_string_body(context_tail) + b'","suggestion":' + orjson.dumps(suggestion)
+                      + b',"comparison":' + orjson.dumps(comparison) + b'}')
+
+    def render(self, name: str) -> bytes:
+        return (b'{"district_found":' + orjson.dumps(name) + self._middle
+                + _json_string_body(name.upper()) + self._tail)
+
+
+class ChatbotContexts:
+    """LRU of rendered chatbot responses for the districts of one `DistrictIndex`"""
+
+    def __init__(self, by_name: Dict[str, Dict[str, Any]], maxsize: int = CONTEXT_CACHE_SIZE):
+        self.by_name = by_name
+        self.maxsize = maxsize
+        self._payloads: "OrderedDict[Tuple[str, ...], ContextPayload]" = OrderedDict()
+
+    def _build(self, keys: Tuple[str, ...]) -> ContextPayload:
+        entries = [self.by_name[key] for key in keys]
+        if len(entries) == 1:
+            entry = entries[0]
+            tail = f":\n{_district_facts(entry)}\n\nOFFICIAL ADVISORY: {entry['chatbot_advisory']}\n\n{INSTRUCTIONS}"
+            return ContextPayload(entry["chatbot"], tail, SUGGESTIONS.get(entry["status"], "safe_to_proceed"))
+
+        sections = [
+            f"{entry['record']['district'].upper()}:\n{_district_facts(entry)}\n"
+            f"OFFICIAL ADVISORY: {entry['chatbot_advisory']}"
+            for entry in entries
+        ]
+        tail = ":\n\n" + "\n\n".join(sections) + f"\n\n{COMPARISON_INSTRUCTIONS}"
+        comparison = [entry["chatbot"] for entry in entries]
+        # The first district stays in `district_data` for clients that show one district
+        return ContextPayload(entries[0]["chatbot"], tail, COMPARISON_SUGGESTION, comparison)
+
+    def get(self, keys: Sequence[str]) -> Optional[ContextPayload]:
+        """Payload for one or more normalized district names, or None if one is unknown"""
+        keys = tuple(dict.fromkeys(keys))
+        payload = self._payloads.get(keys)
+        if payload is not None:
+            self._payloads.move_to_end(keys)
+            return payload
+        if not keys or any(key not in self.by_name for key in keys):
+            return None
+        payload = self._build(keys)
+        self._payloads[keys] = payload
+        if len(self._payloads) > self.maxsize:
+            self._payloads.popitem(last=False)
+        return payload
@@ -0,0 +1,285 @@
+"""
+Hot-reloadable, versioned view of `data/predictions`.
+
+`load_csv` used to stat its file on every call and re-read it inline when it
+had changed. The first request after a retrain paid for the reload and the
+index rebuilds. A request reading several tables could see some old and some
+new ones, and a half-written CSV was parsed as if it were complete.
+
+A `DataSet` is one immutable, validated version of the directory. It holds
+every table in `DATA_FILES` and the structures derived from them. The
+`DataRegistry` holds the current one. A background watcher polls the file
+signatures, and once a change has been stable for one poll interval (the
+retrain has finished writing) it loads the new data set off the request path:
+
+- Files whose signature did not change keep their DataFrames.
+- Every table is checked against its `DATA_FILES` schema.
+- The eagerly used indexes are built.
+
+Only then is the new set published with a single reference assignment.
+`PinnedDataMiddleware` pins the data set that was current when a request
+arrived, so in-flight requests finish on the old version while new ones see
+the new one. If a reload fails (missing column, non-numeric values,
+unreadable file), the old version stays in service and the error is
+reported by `/api/health`.
+"""
+import contextvars
+import hashlib
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from snapshot_store import load_table
+
+# Columns the API reads from each file, "number" ones must parse as numeric
+_PREDICTION_COLUMNS = {
+    "actual_water_level": "number", "predicted_water_level": "number", "error": "number",
+    "absolute_error": "number", "squared_error": "number", "dataset": "text",
+}
+DATA_FILES: Dict[str, Dict[str, str]] = {
+    "district_wise_performance.csv": {
+        "location_id": "number", "district": "text", "block": "text", "village": "text",
+        "latitude": "number", "longitude": "number", "n_predictions": "number",
+        "mean_actual": "number", "mean_predicted": "number", "rmse": "number", "mae": "number", "r2": "number",
+    },
+    "test_predictions_detailed.csv": {
+        "prediction_id": "number", "location_id": "number", "district": "text", "block": "text",
+        "village": "text", "latitude": "number", "longitude": "number",
+        "actual_water_level": "number", "predicted_water_level": "number", "error": "number",
+        "absolute_error": "number", "squared_error": "number",
+    },
+    "all_predictions.csv": _PREDICTION_COLUMNS,
+    "train_predictions.csv": _PREDICTION_COLUMNS,
+    "validation_predictions.csv": _PREDICTION_COLUMNS,
+    "test_predictions.csv": _PREDICTION_COLUMNS,
+    "model_performance_metrics.csv": {
+        "dataset": "text", "rmse": "number", "mae": "number", "r2_score": "number", "n_samples": "number",
+    },
+    "prediction_summary_statistics.csv": {"metric": "text"},
+}
+
+Signature = Optional[Tuple[int, int]]
+
+
+class DataSchemaError(ValueError):
+    """A data file does not have the columns the API reads"""
+
+
+def file_signature(path: str) -> Signature:
+    """(mtime_ns, size) of a file, or None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def validate_table(filename: str, df: pd.DataFrame) -> None:
+    """Raise DataSchemaError unless `df` has the columns of `DATA_FILES[filename]`"""
+    schema = DATA_FILES.get(filename, {})
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        raise DataSchemaError(f"missing columns {', '.join(missing)}")
+    not_numeric = [column for column, kind in schema.items()
+                   if kind == "number" and not pd.api.types.is_numeric_dtype(df[column])]
+    if not_numeric:
+        raise DataSchemaError(f"non-numeric values in {', '.join(not_numeric)}")
+
+
+class DataSet:
+    """One validated version of the data directory plus the structures derived from it"""
+
+    def __init__(self, data_dir: str, signatures: Dict[str, Signature], tables: Dict[str, pd.DataFrame],
+                 inherited: Optional[Dict[str, Tuple[str, Any]]] = None):
+        self.data_dir = data_dir
+        self.signatures = signatures
+        self.tables = tables
+        self.version = self.version_of(sorted(signatures))
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        # name -> (sources version, value); entries of the previous version whose sources did not change
+        self._inherited = dict(inherited or {})
+        self._derived: Dict[str, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def table(self, filename: str) -> Optional[pd.DataFrame]:
+        return self.tables.get(filename)
+
+    def version_of(self, filenames: List[str]) -> str:
+        """Version string that changes whenever any of the given files changes"""
+        parts = [f"{filename}:{self.signatures.get(filename)}" for filename in filenames]
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+    def derived(self, name: str, sources: List[str], build: Callable[[str], Any]) -> Any:
+        """Value built once per data set from `sources`; reused from the previous version if they are unchanged"""
+        cached = self._derived.get(name)
+        if cached is not None:
+            return cached[1]
+        with self._lock:
+            cached = self._derived.get(name)
+            if cached is None:
+                version = self.version_of(sources)
+                inherited = self._inherited.get(name)
+                cached = inherited if inherited is not None and inherited[0] == version else (version, build(version))
+                self._derived[name] = cached
+        return cached[1]
+
+    def release_previous(self) -> None:
+        """Drop the previous version's values that were not reused"""
+        self._inherited = {}
+
+
+def load_data_set(data_dir: str, previous: Optional[DataSet] = None) -> Tuple[DataSet, Dict[str, str]]:
+    """Read and validate every data file; returns the data set and per-file errors
+
+    Tables whose file is unchanged since `previous` are reused as they are.
+    A file that fails to load or validate is left out of the data set.
+    """
+    signatures = {filename: file_signature(os.path.join(data_dir, filename)) for filename in DATA_FILES}
+    tables = {}
+    errors = {}
+    for filename, signature in signatures.items():
+        if signature is None:
+            continue
+        if previous is not None and previous.signatures.get(filename) == signature and filename in previous.tables:
+            tables[filename] = previous.tables[filename]
+            continue
+        try:
+            df = load_table(os.path.join(data_dir, filename))
+            validate_table(filename, df)
+        except (OSError, ValueError, pd.errors.ParserError) as e:
+            errors[filename] = str(e)
+            continue
+        tables[filename] = df
+    inherited = previous._derived if previous is not None else None
+    return DataSet(data_dir, signatures, tables, inherited), errors
+
+
+class DataRegistry:
+    """Holds the current `DataSet` and replaces it when the files change"""
+
+    def __init__(self, data_dir: str, prepare: Optional[Callable[[DataSet], None]] = None):
+        self.data_dir = data_dir
+        self.prepare = prepare
+        self.current: Optional[DataSet] = None
+        self.last_error: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._pending: Optional[Dict[str, Signature]] = None
+        self._rejected: Optional[Dict[str, Signature]] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def signatures(self) -> Dict[str, Signature]:
+        return {filename: file_signature(os.path.join(self.data_dir, filename)) for filename in DATA_FILES}
+
+    def get(self) -> DataSet:
+        """Current data set, loading the first one on demand"""
+        current = self.current
+        if current is None:
+            self.reload()
+            current = self.current
+        return current
+
+    def reload(self) -> bool:
+        """Load, validate and prepare the files as they are now, then publish them; True if published
+
+        With a version already in service, any load, schema or `prepare`
+        error keeps that version, and the same files are not retried until
+        they change again. The first load publishes whatever did load.
+        """
+        with self._reload_lock:
+            previous = self.current
+            data, errors = load_data_set(self.data_dir, previous)
+            if previous is not None:
+                vanished = [name for name in previous.tables if name not in data.tables and name not in errors]
+                errors.update({name: "file removed" for name in vanished})
+            if errors and previous is not None:
+                self.last_error = "; ".join(f"{name}: {error}" for name, error in errors.items())
+                print(f"⚠️ Data reload rejected, still serving {previous.version}: {self.last_error}")
+                # Not retried until the files change again
+                self._rejected = data.signatures
+                return False
+            if self.prepare is not None:
+                try:
+                    self.prepare(data)
+                except Exception as e:
+                    self.last_error = f"preparing data: {e}"
+                    self._rejected = data.signatures
+                    if previous is None:
+                        raise
+                    print(f"⚠️ Data reload rejected, still serving {previous.version}: {self.last_error}")
+                    return False
+            data.release_previous()
+            self.last_error = "; ".join(f"{name}: {error}" for name, error in errors.items()) or None
+            # Requests already running keep the data set they pinned
+            self.current = data
+            if previous is not None and previous.version != data.version:
+                print(f"🔄 Data reloaded: version {previous.version} → {data.version}")
+            return True
+
+    def poll(self) -> bool:
+        """True once the files differ from the current version and were unchanged since the last poll"""
+        signatures = self.signatures()
+        current = self.current
+        if current is None or signatures == current.signatures or signatures == self._rejected:
+            self._pending = None
+            return False
+        if signatures != self._pending:
+            # Still being written, or first sight of the change: wait for one more poll
+            self._pending = signatures
+            return False
+        self._pending = None
+        return True
+
+    def start_watching(self, interval: float) -> None:
+        """Poll the data directory every `interval` seconds on a daemon thread and reload on changes"""
+        if self._watcher is not None or interval <= 0:
+            return
+
+        def watch() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    if self.poll():
+                        self.reload()
+                except Exception as e:  # the watcher must outlive a bad reload
+                    self.last_error = str(e)
+                    print(f"⚠️ Data reload failed: {e}")
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=watch, name="data-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+_pinned: "contextvars.ContextVar[Optional[DataSet]]" = contextvars.ContextVar("pinned_data_set", default=None)
+
+
+def pinned_data_set() -> Optional[DataSet]:
+    """Data set pinned for the running request, if any"""
+    return _pinned.get()
+
+
+class PinnedDataMiddleware:
+    """ASGI middleware pinning the current data set for the whole request, streaming included"""
+
+    def __init__(self, app, registry: DataRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _pinned.set(self.registry.get())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _pinned.reset(token)
+
@@ -0,0 +1,265 @@
+"""
+In-process district index.
+
+Built once per data version from `district_wise_performance.csv` and
+`test_predictions_detailed.csv` so the district endpoints become dictionary
+lookups instead of DataFrame scans. Lookups are by normalized district name
+(lowercase) or by location_id; a district name resolves to its first row in
+`district_wise_performance.csv`, matching the previous `.iloc[0]` behaviour.
+Place names mentioned in chatbot messages are resolved by a `Gazetteer` over
+the districts, blocks and villages of both files, and chatbot responses are
+rendered once per district (or comparison) by `ChatbotContexts`.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from chatbot_context import ChatbotContexts
+from gazetteer import Gazetteer
+
+# Advisory shown in the district detail panel
+DETAIL_ADVISORIES = {
+    "Critical": "⚠️ Immediate action required. Groundwater levels critically low. Implement water conservation measures and restrict non-essential usage.",
+    "Warning": "⚡ Monitor closely. Water levels declining. Consider rainwater harvesting and reduced irrigation.",
+    "Safe": "✅ Water levels stable. Continue sustainable practices."
+}
+
+# Advisory injected into the chatbot prompt
+CHATBOT_ADVISORIES = {
+    "Critical": "⚠️ CRITICAL: Groundwater levels critically low. Immediate action required. Restrict extraction and implement conservation measures.",
+    "Warning": "⚡ WARNING: Water levels declining. Monitor closely. Consider rainwater harvesting and reduced irrigation.",
+    "Safe": "✅ SAFE: Water levels stable. Continue sustainable practices."
+}
+
+TIME_SERIES_POINTS = 20
+
+
+def calculate_risk_status(rmse: float, mae: float) -> str:
+    """Calculate risk status based on error metrics"""
+    if rmse > 5.0 or mae > 4.0:
+        return "Critical"
+    elif rmse > 3.0 or mae > 2.5:
+        return "Warning"
+    else:
+        return "Safe"
+
+
+def risk_status_column(rmse: np.ndarray, mae: np.ndarray) -> np.ndarray:
+    """Vectorized `calculate_risk_status` over metric columns"""
+    return np.select(
+        [(rmse > 5.0) | (mae > 4.0), (rmse > 3.0) | (mae > 2.5)],
+        ["Critical", "Warning"],
+        default="Safe"
+    )
+
+
+def _rounded(values: np.ndarray, ndigits: int) -> List[float]:
+    # Python's round() keeps results identical to the per-row code it replaces
+    return [round(v, ndigits) for v in values.tolist()]
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def normalize_name(name: str) -> str:
+    """Key used for case-insensitive district lookups"""
+    return str(name).lower()
+
+
+def _sample_time_series(df_detailed: pd.DataFrame, positions: np.ndarray) -> List[Dict[str, Any]]:
+    """Evenly sample up to TIME_SERIES_POINTS predictions for one district"""
+    sample_size = min(TIME_SERIES_POINTS, len(positions))
+    if sample_size == 0:
+        return []
+    sampled = positions[np.linspace(0, len(positions) - 1, sample_size, dtype=int)]
+    actual = df_detailed['actual_water_level'].to_numpy()[sampled]
+    predicted = df_detailed['predicted_water_level'].to_numpy()[sampled]
+
+    base_date = datetime(2024, 1, 1)
+    return [
+        {
+            "date": (base_date + timedelta(days=15 * i)).strftime("%Y-%m-%d"),
+            "actual": round(float(actual[i]), 2),
+            "predicted": round(float(predicted[i]), 2)
+        }
+        for i in range(sample_size)
+    ]
+
+
+def _build_district_records(df: pd.DataFrame, status: List[str]) -> List[Dict[str, Any]]:
+    """Rows of `/api/districts`, assembled column by column"""
+    r2 = df['r2'].to_numpy(dtype=float)
+    columns = {
+        "id": df['location_id'].astype(np.int64).astype(str).tolist(),
+        "name": df['district'].astype(str).tolist(),
+        "block": df['block'].astype(str).tolist(),
+        "village": df['village'].astype(str).tolist(),
+        "level": df['mean_actual'].to_numpy(dtype=float).tolist(),
+        "predictedLevel": df['mean_predicted'].to_numpy(dtype=float).tolist(),
+        "status": status,
+        "lat": df['latitude'].to_numpy(dtype=float).tolist(),
+        "lng": df['longitude'].to_numpy(dtype=float).tolist(),
+        "rmse": df['rmse'].to_numpy(dtype=float).tolist(),
+        "mae": df['mae'].to_numpy(dtype=float).tolist(),
+        "r2": np.where(np.isnan(r2), None, r2).tolist(),
+        "nPredictions": df['n_predictions'].astype(np.int64).tolist(),
+    }
+    return [
+        {
+            "id": id_, "name": name, "block": block, "village": village, "state": "Haryana",
+            "level": level, "predictedLevel": predicted, "status": status_, "lat": lat, "lng": lng,
+            "rmse": rmse, "mae": mae, "r2": r2_, "nPredictions": n
+        }
+        for id_, name, block, village, level, predicted, status_, lat, lng, rmse, mae, r2_, n in zip(
+            *columns.values()
+        )
+    ]
+
+
+def _build_geojson(df: pd.DataFrame, status: List[str]) -> Dict[str, Any]:
+    """FeatureCollection for `/api/geojson/districts`, assembled column by column"""
+    columns = (
+        df['longitude'].to_numpy(dtype=float).tolist(),
+        df['latitude'].to_numpy(dtype=float).tolist(),
+        df['location_id'].astype(str).tolist(),
+        df['district'].astype(str).tolist(),
+        df['block'].astype(str).tolist(),
+        df['village'].astype(str).tolist(),
+        _rounded(df['mean_actual'].to_numpy(dtype=float), 2),
+        _rounded(df['mean_predicted'].to_numpy(dtype=float), 2),
+        status,
+        _rounded(df['rmse'].to_numpy(dtype=float), 2),
+        _rounded(df['mae'].to_numpy(dtype=float), 2),
+    )
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lng, lat]},
+            "properties": {
+                "id": id_, "name": name, "block": block, "village": village,
+                "level": level, "predictedLevel": predicted, "status": status_,
+                "rmse": rmse, "mae": mae
+            }
+        }
+        for lng, lat, id_, name, block, village, level, predicted, status_, rmse, mae in zip(*columns)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _detail_payload(record: Dict[str, Any], status: str, time_series: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Body of `/api/districts/{district_name}`"""
+    return {
+        "district": record['district'],
+        "block": record['block'],
+        "village": record['village'],
+        "location": {
+            "lat": record['latitude'],
+            "lng": record['longitude']
+        },
+        "metrics": {
+            "meanActual": round(record['mean_actual'], 2),
+            "meanPredicted": round(record['mean_predicted'], 2),
+            "rmse": round(record['rmse'], 2),
+            "mae": round(record['mae'], 2),
+            "r2": round(record['r2'], 3),
+            "nPredictions": int(record['n_predictions'])
+        },
+        "status": status,
+        "advisory": DETAIL_ADVISORIES.get(status, "No advisory available"),
+        "timeSeries": time_series
+    }
+
+
+def _chatbot_data(record: Dict[str, Any], status: str) -> Dict[str, Any]:
+    """`district_data` block returned by `/api/chatbot/context`"""
+    return {
+        "district": record['district'],
+        "block": record['block'],
+        "village": record['village'],
+        "meanActual": round(record['mean_actual'], 2),
+        "meanPredicted": round(record['mean_predicted'], 2),
+        "rmse": round(record['rmse'], 2),
+        "mae": round(record['mae'], 2),
+        "r2": round(record['r2'], 3) if pd.notna(record['r2']) else None,
+        "nPredictions": int(record['n_predictions']),
+        "status": status
+    }
+
+
+def _places(df_district: pd.DataFrame, df_detailed: pd.DataFrame) -> List[Tuple[str, str, str]]:
+    """(name, kind, district) of every district, block and village in both tables"""
+    columns = ['district', 'block', 'village']
+    places = pd.concat([df_district[columns], df_detailed[columns]]).dropna().astype(str).drop_duplicates()
+    return [
+        (name, kind, district)
+        for kind in columns
+        for name, district in zip(places[kind].tolist(), places['district'].tolist())
+    ]
+
+
+class DistrictIndex:
+    """Precomputed per-district responses for one data version"""
+
+    def __init__(self, df_district: pd.DataFrame, df_detailed: pd.DataFrame, version: str):
+        self.version = version
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.by_location: Dict[int, Dict[str, Any]] = {}
+
+        df_district = df_district.replace([np.inf, -np.inf], np.nan)
+        status = risk_status_column(
+            df_district['rmse'].to_numpy(dtype=float), df_district['mae'].to_numpy(dtype=float)
+        ).tolist()
+
+        # Full-table responses are serialized once per data version
+        self.districts = _build_district_records(df_district, status)
+        self.districts_json = orjson.dumps(self.districts)
+        self.districts_etag = _etag(self.districts_json)
+        self.geojson_json = orjson.dumps(_build_geojson(df_district, status))
+        self.geojson_etag = _etag(self.geojson_json)
+        # `?limit=` prefixes, serialized on first use; keyed by row count so at most one per row
+        self._district_pages: Dict[int, Tuple[bytes, str]] = {}
+
+        records = df_district.astype(object).to_dict('records')
+        detailed_keys = df_detailed['district'].astype(str).str.lower().to_numpy()
+        positions_by_name = pd.Series(np.arange(len(df_detailed))).groupby(detailed_keys, sort=False).indices
+
+        for record, status_ in zip(records, status):
+            entry = {"record": record, "status": status_}
+            self.by_location.setdefault(int(record['location_id']), entry)
+
+            key = normalize_name(record['district'])
+            if key in self.by_name:
+                continue
+            positions = positions_by_name.get(key, np.array([], dtype=int))
+            entry["detail"] = _detail_payload(record, status_, _sample_time_series(df_detailed, positions))
+            entry["chatbot"] = _chatbot_data(record, status_)
+            entry["chatbot_advisory"] = CHATBOT_ADVISORIES.get(status_, "Monitor water levels regularly.")
+            self.by_name[key] = entry
+
+        self.names = sorted({str(record['district']) for record in records})
+        self.gazetteer = Gazetteer(_places(df_district, df_detailed))
+        self.chatbot_contexts = ChatbotContexts(self.by_name)
+
+    def districts_page(self, limit: int) -> Tuple[bytes, str]:
+        """JSON body and ETag of `districts[:limit]`"""
+        count = len(range(len(self.districts))[:limit])
+        if count == len(self.districts):
+            return self.districts_json, self.districts_etag
+        page = self._district_pages.get(count)
+        if page is None:
+            page = (orjson.dumps(self.districts[:count]), f'{self.districts_etag[:-1]}-{count}"')
+            self._district_pages[count] = page
+        return page
+
+    def get(self, district_name: str) -> Optional[Dict[str, Any]]:
+        """Entry for a district name (case-insensitive), or None"""
+        return self.by_name.get(normalize_name(district_name))
+
+    def get_location(self, location_id: int) -> Optional[Dict[str, Any]]:
+        """Entry for a monitoring location, or None"""
+        return self.by_location.get(int(location_id))
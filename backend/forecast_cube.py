@@ -0,0 +1,165 @@
+"""
+Per-month aggregate cube behind `/api/dashboard/forecast`.
+
+The endpoint used to pick 12 evenly spaced rows of
+`test_predictions_detailed.csv` and label them with made-up monthly dates
+(Jan 2024 + 30 days per point), iterating over them with `iterrows()` on
+every request. The prediction pipeline now writes the `date` of the reading
+each prediction is for. A `ForecastCube` is built once per data version: it
+groups the predictions by (district, year, month), plus one all-district
+series, and keeps count, mean, min, max and the `PERCENTILES` of the actual
+and predicted levels in arrays indexed by [district row, month offset].
+
+Each district's series is also rendered once into per-month JSON fragments,
+so a request finds its district by key and joins the last `horizon` months.
+It never touches the DataFrame. Files written before the `date` column
+existed get the old evenly sampled rows, built from arrays instead of
+`iterrows()`.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from district_index import normalize_name
+
+DEFAULT_HORIZON = 12
+MAX_FORECAST_HORIZON = 240
+PERCENTILES = (10, 50, 90)
+# Series label when no district is asked for
+ALL_DISTRICTS = "Haryana"
+STATS = ["min", "max"] + [f"p{p}" for p in PERCENTILES]
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _rounded(value: float) -> float:
+    return round(float(value), 2)
+
+
+def _grouped_stats(codes: np.ndarray, values: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """Mean, min, max and linear-interpolated percentiles of `values` per group code
+
+    One sort by (code, value) serves every statistic; groups without values are NaN.
+    """
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    count = np.bincount(codes, minlength=n_groups)
+    first = np.concatenate(([0], np.cumsum(count)[:-1]))
+    present = count > 0
+    stats = {"count": count, "mean": np.full(n_groups, np.nan)}
+    stats["mean"][present] = np.bincount(codes, weights=values, minlength=n_groups)[present] / count[present]
+    for name, q in [("min", 0.0), ("max", 1.0)] + [(f"p{p}", p / 100) for p in PERCENTILES]:
+        result = np.full(n_groups, np.nan)
+        # Same interpolation as np.percentile's default
+        position = first[present] + q * (count[present] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        result[present] = values[lower] + (values[upper] - values[lower]) * (position - lower)
+        stats[name] = result
+    return stats
+
+
+class ForecastCube:
+    """Monthly actual/predicted statistics by district for one data version"""
+
+    def __init__(self, df_detailed: pd.DataFrame, version: str):
+        self.version = version
+        dates = pd.to_datetime(df_detailed["date"], errors="coerce") if "date" in df_detailed.columns else None
+        self.dated = dates is not None and bool(dates.notna().any())
+        if self.dated:
+            self._build_cube(df_detailed, dates)
+        else:
+            self._build_samples(df_detailed)
+
+    def _build_cube(self, df: pd.DataFrame, dates: pd.Series) -> None:
+        actual = df["actual_water_level"].to_numpy(dtype=float)
+        predicted = df["predicted_water_level"].to_numpy(dtype=float)
+        valid = (dates.notna() & df["district"].notna()).to_numpy() & ~np.isnan(actual) & ~np.isnan(predicted)
+        if not valid.any():
+            # No usable dated row: nothing to aggregate, serve the sampled rows instead
+            self.dated = False
+            self._build_samples(df)
+            return
+        actual, predicted = actual[valid], predicted[valid]
+        month_codes = (dates[valid].dt.year * 12 + dates[valid].dt.month - 1).to_numpy(dtype=np.int64)
+        district_codes, names = pd.factorize(df["district"][valid].astype(str), sort=True)
+
+        # Row 0 is the all-district series, row i + 1 district `names[i]`
+        self.names: List[str] = [ALL_DISTRICTS] + list(names)
+        self.first_month = int(month_codes.min())
+        self.n_months = int(month_codes.max()) - self.first_month + 1
+        offsets = month_codes - self.first_month
+        shape = (len(self.names), self.n_months)
+        cells = np.concatenate([offsets, (district_codes + 1) * self.n_months + offsets])
+        actual_stats = _grouped_stats(cells, np.concatenate([actual, actual]), shape[0] * shape[1])
+        predicted_stats = _grouped_stats(cells, np.concatenate([predicted, predicted]), shape[0] * shape[1])
+
+        self.count = actual_stats["count"].reshape(shape)
+        self.actual = {name: values.reshape(shape) for name, values in actual_stats.items() if name != "count"}
+        self.predicted = {name: values.reshape(shape) for name, values in predicted_stats.items() if name != "count"}
+
+        self._rows: Dict[str, int] = {normalize_name(name): row for row, name in enumerate(self.names)}
+        # Month fragments of each row, oldest first, for months with predictions only
+        self._points: List[List[bytes]] = [
+            [orjson.dumps(self._point(row, offset)) for offset in np.flatnonzero(self.count[row])]
+            for row in range(len(self.names))
+        ]
+
+    def _point(self, row: int, offset: int) -> Dict[str, object]:
+        year, month = divmod(self.first_month + int(offset), 12)
+        point = {
+            "month": f"{MONTH_NAMES[month]} {year}",
+            "historical": _rounded(self.actual["mean"][row, offset]),
+            "predicted": _rounded(self.predicted["mean"][row, offset]),
+            "district": self.names[row],
+            "date": f"{year:04d}-{month + 1:02d}",
+            "count": int(self.count[row, offset]),
+        }
+        for prefix, stats in (("historical", self.actual), ("predicted", self.predicted)):
+            for name in STATS:
+                point[prefix + name.capitalize()] = _rounded(stats[name][row, offset])
+        return point
+
+    def _build_samples(self, df: pd.DataFrame) -> None:
+        # No dates: evenly spaced rows on a placeholder monthly timeline, as before
+        self.names = [ALL_DISTRICTS] + sorted(df["district"].dropna().astype(str).unique())
+        self._rows = {normalize_name(name): row for row, name in enumerate(self.names)}
+        self._actual = df["actual_water_level"].to_numpy(dtype=float)
+        self._predicted = df["predicted_water_level"].to_numpy(dtype=float)
+        self._districts = df["district"].astype(str).to_numpy()
+        keys = pd.Series(np.arange(len(df))).groupby(df["district"].astype(str).str.lower().to_numpy()).indices
+        self._positions = [np.arange(len(df))] + [keys[normalize_name(name)] for name in self.names[1:]]
+
+    def _sampled_points(self, row: int, horizon: int) -> List[bytes]:
+        positions = self._positions[row]
+        if len(positions) == 0:
+            return []
+        sampled = positions[np.linspace(0, len(positions) - 1, horizon, dtype=int)]
+        base_date = datetime(2024, 1, 1)
+        return [
+            orjson.dumps({
+                "month": (base_date + timedelta(days=30 * i)).strftime("%b %Y"),
+                "historical": _rounded(self._actual[position]),
+                "predicted": _rounded(self._predicted[position]),
+                "district": self._districts[position],
+            })
+            for i, position in enumerate(sampled.tolist())
+        ]
+
+    def row(self, district: Optional[str]) -> Optional[int]:
+        """Row of a district name (case-insensitive), 0 for all districts, None if unknown"""
+        return 0 if district is None else self._rows.get(normalize_name(district))
+
+    def cell(self, row: int, year: int, month: int) -> Optional[Dict[str, object]]:
+        """Statistics of one district row for one calendar month, or None without predictions"""
+        offset = year * 12 + month - 1 - self.first_month if self.dated else -1
+        if not 0 <= offset < self.n_months or not self.count[row, offset]:
+            return None
+        return self._point(row, offset)
+
+    def render(self, row: int, horizon: int = DEFAULT_HORIZON) -> Tuple[bytes, str]:
+        """JSON body and ETag of the last `horizon` months of a row"""
+        points = self._points[row][-horizon:] if self.dated else self._sampled_points(row, horizon)
+        return b"[" + b",".join(points) + b"]", f'"forecast-{self.version}-{row}-{horizon}"'
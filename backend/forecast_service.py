@@ -0,0 +1,224 @@
+"""
+On-demand LSTM inference for `/api/forecast/infer`.
+
+The trained `best_groundwater_model.h5` and its `scalers.json` (written by
+`HaryanaGroundwaterLSTM.save_artifacts`) are loaded once. Requests are queued
+on an asyncio micro-batcher: the first request opens a short collection window
+(a few milliseconds), everything that arrives inside it is stacked into one
+array, and a single batched predict call runs on a dedicated one-thread
+executor so the event loop never blocks on inference. While one batch is
+running, new requests queue up and form the next batch.
+
+When `groundwater_lstm.onnx` (from `python -m groundwater_lstm.export`) is
+present the batch runs on onnxruntime; that graph has the scalers folded in
+and takes raw features. Otherwise the Keras model is used, with TensorFlow
+imported on the inference thread the first time a batch runs, so the API
+starts (and serves everything else) without it.
+"""
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MODEL_FILENAME = "best_groundwater_model.h5"
+ONNX_FILENAME = "groundwater_lstm.onnx"
+SCALERS_FILENAME = "scalers.json"
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+class ModelUnavailable(RuntimeError):
+    """Model artifacts or the inference runtime are missing"""
+
+
+class ForecastArtifacts:
+    """Feature order and MinMaxScaler parameters saved next to the model"""
+
+    def __init__(self, scalers_path: str):
+        with open(scalers_path, encoding="utf-8") as f:
+            artifacts = json.load(f)
+        self.sequence_length = int(artifacts["sequence_length"])
+        self.feature_names: List[str] = list(artifacts["feature_names"])
+        self.target = artifacts["target"]
+
+        scalers = artifacts["scalers"]
+        # scaled = value * scale + min, applied to all features at once
+        self.feature_scale = np.array([scalers[name]["scale"] for name in self.feature_names], dtype=np.float32)
+        self.feature_min = np.array([scalers[name]["min"] for name in self.feature_names], dtype=np.float32)
+        self.target_scale = float(scalers[self.target]["scale"])
+        self.target_min = float(scalers[self.target]["min"])
+
+    def encode(self, steps: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Raw feature dicts (oldest step first) -> (sequence_length, n_features) float32 array"""
+        if len(steps) != self.sequence_length:
+            raise ValueError(f"Expected {self.sequence_length} time steps, got {len(steps)}")
+        missing = [name for name in self.feature_names if name not in steps[0]]
+        if missing:
+            raise ValueError(f"Missing features: {', '.join(missing)}")
+        try:
+            values = np.array([[step[name] for name in self.feature_names] for step in steps], dtype=np.float32)
+        except KeyError as e:
+            raise ValueError(f"Missing feature {e.args[0]} in one of the time steps")
+        return values
+
+    def scale(self, inputs: np.ndarray) -> np.ndarray:
+        """Raw feature batch -> model input scale"""
+        return inputs * self.feature_scale + self.feature_min
+
+    def decode(self, predictions: np.ndarray) -> np.ndarray:
+        """Scaled model output -> water level in meters below ground"""
+        return (np.asarray(predictions, dtype=np.float64).reshape(-1) - self.target_min) / self.target_scale
+
+
+class MicroBatcher:
+    """Collects concurrent single-sequence requests into batched predict calls"""
+
+    def __init__(
+        self,
+        predict_batch: Callable[[np.ndarray], np.ndarray],
+        executor: ThreadPoolExecutor,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        self.predict_batch = predict_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        # Created on first use so the queue binds to the serving event loop
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, sequence: np.ndarray) -> Tuple[float, int]:
+        """Prediction for one sequence and the size of the batch it ran in"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((sequence, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            inputs = np.stack([sequence for sequence, _ in batch])
+            try:
+                outputs = await loop.run_in_executor(self.executor, self.predict_batch, inputs)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), value in zip(batch, outputs.tolist()):
+                if not future.done():
+                    future.set_result((value, len(batch)))
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+class ForecastService:
+    """Model + scalers loaded once, served through a MicroBatcher"""
+
+    def __init__(
+        self,
+        model_dir: str,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        self.model_dir = model_dir
+        self.model_path = os.path.join(model_dir, MODEL_FILENAME)
+        self.onnx_path = os.path.join(model_dir, ONNX_FILENAME)
+        scalers_path = os.path.join(model_dir, SCALERS_FILENAME)
+        has_model = os.path.exists(self.onnx_path) or os.path.exists(self.model_path)
+        if not has_model or not os.path.exists(scalers_path):
+            raise ModelUnavailable(
+                f"Model artifacts not found in {model_dir} "
+                f"(expected {ONNX_FILENAME} or {MODEL_FILENAME}, and {SCALERS_FILENAME})"
+            )
+        self.artifacts = ForecastArtifacts(scalers_path)
+        self.runtime: Optional[str] = None
+        self._model = None
+        self._model_lock = threading.Lock()
+        # One inference thread: batches run back to back, never on the event loop
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast")
+        self.batcher = MicroBatcher(self._predict_batch, self.executor, max_batch_size, max_wait_ms)
+
+    def _load_model(self):
+        with self._model_lock:
+            if self._model is None:
+                self._model = self._load_onnx() or self._load_keras()
+        return self._model
+
+    def _load_onnx(self):
+        if not os.path.exists(self.onnx_path):
+            return None
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return None
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(self.onnx_path, options, providers=["CPUExecutionProvider"])
+        input_name = session.get_inputs()[0].name
+        self.runtime = "onnxruntime"
+        # Scalers are folded into the graph: raw features in, meters out
+        return lambda inputs: session.run(None, {input_name: inputs})[0].reshape(-1)
+
+    def _load_keras(self):
+        if not os.path.exists(self.model_path):
+            raise ModelUnavailable(f"{ONNX_FILENAME} needs onnxruntime, which is not installed")
+        try:
+            import tensorflow as tf
+        except ImportError:
+            raise ModelUnavailable("TensorFlow is not installed; install it to enable on-demand forecasts")
+        model = tf.keras.models.load_model(self.model_path, compile=False)
+        self.runtime = "keras"
+        # predict_on_batch runs the whole stack in one call without predict()'s
+        # per-call data adapter and callback setup
+        return lambda inputs: self.artifacts.decode(model.predict_on_batch(self.artifacts.scale(inputs)))
+
+    def warm_up(self):
+        """Load the model and trace the predict function (runs on the inference thread)"""
+        shape = (1, self.artifacts.sequence_length, len(self.artifacts.feature_names))
+        return self.executor.submit(self._predict_batch, np.zeros(shape, dtype=np.float32))
+
+    def _predict_batch(self, inputs: np.ndarray) -> np.ndarray:
+        return self._load_model()(inputs)
+
+    async def infer(self, steps: Sequence[Dict[str, float]]) -> Tuple[float, int]:
+        """Water level forecast for one well sequence and the batch size it ran in"""
+        return await self.batcher.submit(self.artifacts.encode(steps))
+
+    async def close(self):
+        await self.batcher.close()
+        self.executor.shutdown(wait=False)
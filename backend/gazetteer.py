@@ -0,0 +1,253 @@
+"""
+Place-name matcher for the chatbot endpoint.
+
+`/api/chatbot/context` used to try one `\\b<district>\\b` regex per district on
+every request. The gazetteer here is built once per data version from every
+district, block and village in the prediction tables (plus `ALIASES` for old
+or alternative district names such as Gurgaon → Gurugram) and compiled into an
+Aho–Corasick automaton, so a message is scanned once no matter how many
+villages there are. The longest whole-word match wins; on equal length a
+district beats a block, a block beats a village.
+
+Names and messages are compared in a folded spelling (`fold`): lowercase,
+accents stripped, punctuation collapsed to single spaces, and the common
+romanization variants of Hindi place names merged (w/v, z/j, q/k, ph/f,
+ee/i, oo/u, aspirated consonants, doubled letters), so "Hissar", "Bhiwaani"
+and "Charkhi-Dadri" find "Hisar", "Bhiwani" and "Charki Dadri". When nothing
+matches exactly, words of the message are looked up with edit distance 1
+through a deletion index, which catches most remaining misspellings without
+comparing the message against every name.
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+KINDS = ("district", "block", "village")
+
+# Alternative district names → district name used in the data
+ALIASES = {
+    "Gurgaon": "Gurugram",
+    "Mewat": "Nuh",
+    "Dadri": "Charki Dadri",
+    "Sonepat": "Sonipat",
+    "Mohindergarh": "Mahendragarh",
+    "Narnaul": "Mahendragarh",
+    "Yamuna Nagar": "Yamunanagar",
+    "Jagadhri": "Yamunanagar",
+    "Thanesar": "Kurukshetra",
+}
+
+# Fuzzy matching only for folded names at least this long; shorter ones
+# are too close to ordinary words
+MIN_FUZZY_LENGTH = 5
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+_VOWEL_PAIRS = re.compile(r"ee|oo")
+_ASPIRATED = re.compile(r"([bcdgjkpst])h")
+_DOUBLED = re.compile(r"([a-z])\1+")
+_LETTERS = str.maketrans({"w": "v", "z": "j", "q": "k"})
+# "Gharaunda (Part)", "Hansi-I", "Hisar-Ii" are also found as "Gharaunda", "Hansi", "Hisar"
+_NAME_SUFFIX = re.compile(r"\s*\(.*?\)\s*$|[\s-]+(?:i{1,3}|iv|v)$", re.IGNORECASE)
+
+
+def fold(text: str) -> str:
+    """Spelling-insensitive form of a place name or message"""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    text = _SEPARATORS.sub(" ", text).translate(_LETTERS).replace("ph", "f")
+    text = _VOWEL_PAIRS.sub(lambda m: "i" if m.group() == "ee" else "u", text)
+    text = _ASPIRATED.sub(r"\1", text)
+    return _DOUBLED.sub(r"\1", text).strip()
+
+
+def _deletions(word: str) -> List[str]:
+    return [word] + [word[:i] + word[i + 1:] for i in range(len(word))]
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether a and b differ by at most one insertion, deletion, substitution or transposition"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1])
+    return a[i + 1:] == b[i:] if len(a) > len(b) else a[i:] == b[i + 1:]
+
+
+class GazetteerMatch(NamedTuple):
+    name: str       # place name as written in the data (or the alias)
+    kind: str       # "district", "block" or "village"
+    district: str   # district the place belongs to
+    fuzzy: bool     # found by the edit-distance fallback
+
+
+class Gazetteer:
+    """Aho–Corasick automaton over folded district, block and village names"""
+
+    def __init__(self, places: Iterable[Tuple[str, str, str]], aliases: Optional[Dict[str, str]] = None):
+        """`places` are (name, kind, district) triples, kind being one of `KINDS`"""
+        places = list(places)
+        districts = {district for _, _, district in places}
+        places += [(alias, "district", district)
+                   for alias, district in (ALIASES if aliases is None else aliases).items()
+                   if district in districts]
+
+        # One pattern per folded spelling; district over block over village, then the first seen
+        self.patterns: List[str] = []
+        self.targets: List[GazetteerMatch] = []
+        ranks: List[int] = []
+        pattern_ids: Dict[str, int] = {}
+        for name, kind, district in places:
+            rank = KINDS.index(kind)
+            for variant in {fold(name), fold(_NAME_SUFFIX.sub("", str(name)))}:
+                if not variant:
+                    continue
+                target = GazetteerMatch(str(name), kind, str(district), False)
+                pattern_id = pattern_ids.get(variant)
+                if pattern_id is None:
+                    pattern_ids[variant] = len(self.patterns)
+                    self.patterns.append(variant)
+                    self.targets.append(target)
+                    ranks.append(rank)
+                elif rank < ranks[pattern_id]:
+                    self.targets[pattern_id] = target
+                    ranks[pattern_id] = rank
+        self._ranks = ranks
+        self._build_automaton()
+        self._build_fuzzy_index()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _build_automaton(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._pattern: List[int] = [-1]   # pattern ending exactly at this node
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._pattern.append(-1)
+                node = nxt
+            self._pattern[node] = pattern_id
+
+        # Breadth-first failure links; `_output` jumps to the next suffix node that ends a pattern
+        self._fail = [0] * len(self._goto)
+        self._output = [-1] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                state = self._fail[node]
+                while ch not in self._goto[state] and state:
+                    state = self._fail[state]
+                fail = self._goto[state].get(ch, 0)
+                self._fail[child] = fail if fail != child else 0
+                self._output[child] = fail if self._pattern[fail] >= 0 else self._output[fail]
+
+    def _build_fuzzy_index(self) -> None:
+        # Every pattern under each single-character deletion (SymSpell with distance 1)
+        self._deletion_index: Dict[str, List[int]] = {}
+        self._max_words = 1
+        for pattern_id, pattern in enumerate(self.patterns):
+            if len(pattern) < MIN_FUZZY_LENGTH:
+                continue
+            self._max_words = max(self._max_words, pattern.count(" ") + 1)
+            for key in set(_deletions(pattern)):
+                self._deletion_index.setdefault(key, []).append(pattern_id)
+
+    def _better(self, candidate: Tuple[int, int], best: Optional[Tuple[int, int]]) -> bool:
+        """(pattern_id, start): longer first, then district over block over village, then earlier"""
+        if best is None:
+            return True
+        length, other = len(self.patterns[candidate[0]]), len(self.patterns[best[0]])
+        if length != other:
+            return length > other
+        rank, other_rank = self._ranks[candidate[0]], self._ranks[best[0]]
+        return rank < other_rank if rank != other_rank else candidate[1] < best[1]
+
+    def _exact(self, text: str) -> List[Tuple[int, int]]:
+        """(pattern_id, start) of every whole-word occurrence, in order of their end"""
+        goto, fail, pattern_at, output, patterns = self._goto, self._fail, self._pattern, self._output, self.patterns
+        found = []
+        node = 0
+        end = len(text)
+        for i, ch in enumerate(text):
+            while ch not in goto[node] and node:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            # Whole words only: a match must end at a space or the end of the text ...
+            if i + 1 < end and text[i + 1] != " ":
+                continue
+            hit = node if pattern_at[node] >= 0 else output[node]
+            while hit > 0:
+                pattern_id = pattern_at[hit]
+                start = i + 1 - len(patterns[pattern_id])
+                # ... and start at one
+                if start == 0 or text[start - 1] == " ":
+                    found.append((pattern_id, start))
+                hit = output[hit]
+        return found
+
+    def _fuzzy(self, text: str) -> List[Tuple[int, int]]:
+        """(pattern_id, start) of word runs within one edit of a name"""
+        words = text.split(" ")
+        offsets = [0]
+        for word in words[:-1]:
+            offsets.append(offsets[-1] + len(word) + 1)
+        found = []
+        for start in range(len(words)):
+            for stop in range(start + 1, min(start + self._max_words, len(words)) + 1):
+                phrase = " ".join(words[start:stop])
+                if len(phrase) < MIN_FUZZY_LENGTH - 1:
+                    continue
+                seen = set()
+                for key in _deletions(phrase):
+                    for pattern_id in self._deletion_index.get(key, ()):
+                        pattern = self.patterns[pattern_id]
+                        # Misspellings rarely change the first letter; requiring it keeps ordinary words out
+                        if pattern_id not in seen and pattern[0] == phrase[0] and _within_one_edit(phrase, pattern):
+                            seen.add(pattern_id)
+                            found.append((pattern_id, offsets[start]))
+        return found
+
+    def _matches(self, message: str, fuzzy: bool) -> Tuple[List[Tuple[int, int]], bool]:
+        text = fold(message)
+        if not text:
+            return [], False
+        found = self._exact(text)
+        if found or not fuzzy:
+            return found, False
+        return self._fuzzy(text), True
+
+    def find(self, message: str, fuzzy: bool = True) -> Optional[GazetteerMatch]:
+        """Best place mentioned in `message`, or None"""
+        found, fuzzy_hit = self._matches(message, fuzzy)
+        best = None
+        for candidate in found:
+            if self._better(candidate, best):
+                best = candidate
+        if best is None:
+            return None
+        return self.targets[best[0]]._replace(fuzzy=fuzzy_hit)
+
+    def find_all(self, message: str, fuzzy: bool = True) -> List[GazetteerMatch]:
+        """Non-overlapping places mentioned in `message`, in message order
+
+        Overlaps are resolved as in `find` (longest, then district over block),
+        so "Charkhi Dadri" is one match, not also "Dadri".
+        """
+        found, fuzzy_hit = self._matches(message, fuzzy)
+        ranked = sorted(found, key=lambda c: (-len(self.patterns[c[0]]), self._ranks[c[0]], c[1]))
+        taken: List[Tuple[int, int, int]] = []
+        for pattern_id, start in ranked:
+            stop = start + len(self.patterns[pattern_id])
+            if all(stop <= other_start or start >= other_stop for other_start, other_stop, _ in taken):
+                taken.append((start, stop, pattern_id))
+        return [self.targets[pattern_id]._replace(fuzzy=fuzzy_hit) for _, _, pattern_id in sorted(taken)]
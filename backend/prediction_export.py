@@ -0,0 +1,66 @@
+"""
+Streaming export of filtered prediction sets.
+
+Each generator walks a selection from `PredictionIndex.select` in fixed-size
+record batches and yields one encoded chunk per batch, so server memory stays
+bounded by the batch size and clients can start on the first batch right away.
+Rows keep the source CSV columns at full precision.
+"""
+import io
+from typing import Iterator
+
+import numpy as np
+
+from prediction_index import PredictionIndex
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _batches(index: PredictionIndex, selection: np.ndarray, batch_size: int):
+    for start in range(0, len(selection), batch_size):
+        yield index.export_frame(selection[start:start + batch_size])
+
+
+def stream_ndjson(index: PredictionIndex, selection: np.ndarray, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """One JSON object per line"""
+    for frame in _batches(index, selection, batch_size):
+        yield frame.to_json(orient="records", lines=True, double_precision=15).rstrip("\n").encode() + b"\n"
+
+
+def stream_csv(index: PredictionIndex, selection: np.ndarray, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """CSV with a single header line"""
+    header = ",".join(index.frame.columns) + "\n"
+    yield header.encode()
+    for frame in _batches(index, selection, batch_size):
+        yield frame.to_csv(index=False, header=False).encode()
+
+
+def stream_arrow(index: PredictionIndex, selection: np.ndarray, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """Arrow IPC stream: schema message, one message per record batch, end-of-stream marker"""
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(index.export_frame(selection[:0]), preserve_index=False)
+    # Text columns of an empty frame are inferred as null; they hold strings
+    schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                        for field in schema], metadata=schema.metadata)
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def drain() -> bytes:
+        # Hand out what the writer produced so far and reuse the buffer
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    for frame in _batches(index, selection, batch_size):
+        writer.write_batch(pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False))
+        yield drain()
+    writer.close()
+    yield drain()
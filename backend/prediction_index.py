@@ -0,0 +1,178 @@
+"""
+Keyset-paginated index over a prediction table.
+
+Rows are kept in ascending key order (`prediction_id` when the table has one,
+otherwise the row position). Filters resolve to an ascending array of ranks in
+that order using precomputed per-district/per-location rank lists and sorted
+value arrays for range filters, and recently used selections are memoized. A
+page is then two binary searches and a slice, so its cost does not depend on
+how deep the client has paged. Rows are emitted straight from column slices.
+"""
+import base64
+import binascii
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Numeric columns exposed in the API, with their response field names
+NUMERIC_FIELDS = [
+    ("actual_water_level", "actual"),
+    ("predicted_water_level", "predicted"),
+    ("error", "error"),
+    ("absolute_error", "absoluteError"),
+    ("squared_error", "squaredError"),
+]
+
+SELECTION_CACHE_SIZE = 64
+
+
+def encode_cursor(key: int) -> str:
+    """Opaque cursor pointing just after the row with this key"""
+    return base64.urlsafe_b64encode(str(int(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Inverse of `encode_cursor`; raises ValueError on malformed input"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+class PredictionIndex:
+    """Sorted, filterable view of one prediction table for one data version"""
+
+    def __init__(self, df: pd.DataFrame, version: str, default_dataset: str = ""):
+        self.version = version
+        self.n_rows = len(df)
+
+        if 'prediction_id' in df.columns:
+            keys = df['prediction_id'].to_numpy(dtype=np.int64)
+        else:
+            keys = np.arange(self.n_rows, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.frame = df
+        self.order = order
+
+        # Columns in key order; rounding happens once here, not per page
+        self.columns: Dict[str, np.ndarray] = {}
+        for column, field in NUMERIC_FIELDS:
+            self.columns[field] = np.round(df[column].to_numpy(dtype=float)[order], 2)
+        self.raw_absolute_error = df['absolute_error'].to_numpy(dtype=float)[order]
+        self.raw_actual = df['actual_water_level'].to_numpy(dtype=float)[order]
+
+        if 'dataset' in df.columns:
+            dataset = df['dataset'].astype(str).to_numpy()[order]
+        else:
+            # test_predictions_detailed.csv has no dataset column
+            dataset = np.full(self.n_rows, default_dataset, dtype=object)
+        self.columns["dataset"] = dataset
+        self.dataset_ranks = self._group_ranks(dataset)
+
+        self.has_locations = 'district' in df.columns and 'location_id' in df.columns
+        self.district_ranks: Dict[str, np.ndarray] = {}
+        self.location_ranks: Dict[int, np.ndarray] = {}
+        if self.has_locations:
+            self.columns["predictionId"] = self.keys
+            self.columns["locationId"] = df['location_id'].to_numpy(dtype=np.int64)[order]
+            district = df['district'].astype(str).to_numpy()[order]
+            self.columns["district"] = district
+            self.district_ranks = self._group_ranks(np.char.lower(district.astype(str)))
+            self.location_ranks = self._group_ranks(self.columns["locationId"])
+
+        # Sorted values for range filters: value_sorted[i] belongs to rank rank_sorted[i]. NaN
+        # sorts last and never matches a range, so only the first n_valid entries are searched
+        self.range_columns = {}
+        for name, values in (("absolute_error", self.raw_absolute_error), ("actual", self.raw_actual)):
+            rank_sorted = np.argsort(values, kind="stable")
+            n_valid = len(values) - int(np.isnan(values).sum())
+            self.range_columns[name] = (values[rank_sorted][:n_valid], rank_sorted[:n_valid])
+
+        self._all = np.arange(self.n_rows)
+        self._selections: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def _group_ranks(values: np.ndarray) -> Dict[Any, np.ndarray]:
+        """Ascending rank arrays per distinct value"""
+        groups = pd.Series(np.arange(len(values))).groupby(values, sort=False).indices
+        return {key.item() if hasattr(key, "item") else key: ranks for key, ranks in groups.items()}
+
+    def _range_ranks(self, name: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        values, ranks = self.range_columns[name]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return np.sort(ranks[start:stop])
+
+    def select(
+        self,
+        dataset: Optional[str] = None,
+        district: Optional[str] = None,
+        location_id: Optional[int] = None,
+        min_abs_error: Optional[float] = None,
+        max_abs_error: Optional[float] = None,
+        min_actual: Optional[float] = None,
+        max_actual: Optional[float] = None,
+    ) -> np.ndarray:
+        """Ascending ranks of the rows matching every given filter"""
+        key = (dataset, district.lower() if district else None, location_id,
+               min_abs_error, max_abs_error, min_actual, max_actual)
+        cached = self._selections.get(key)
+        if cached is not None:
+            self._selections.move_to_end(key)
+            return cached
+
+        empty = np.array([], dtype=np.int64)
+        parts = []
+        if dataset is not None:
+            parts.append(self.dataset_ranks.get(dataset, empty))
+        if district is not None:
+            parts.append(self.district_ranks.get(district.lower(), empty))
+        if location_id is not None:
+            parts.append(self.location_ranks.get(int(location_id), empty))
+        if min_abs_error is not None or max_abs_error is not None:
+            parts.append(self._range_ranks("absolute_error", min_abs_error, max_abs_error))
+        if min_actual is not None or max_actual is not None:
+            parts.append(self._range_ranks("actual", min_actual, max_actual))
+
+        if not parts:
+            selection = self._all
+        else:
+            # Intersect smallest first; every part is sorted and unique
+            parts.sort(key=len)
+            selection = parts[0]
+            for part in parts[1:]:
+                selection = np.intersect1d(selection, part, assume_unique=True)
+
+        self._selections[key] = selection
+        if len(self._selections) > SELECTION_CACHE_SIZE:
+            self._selections.popitem(last=False)
+        return selection
+
+    def page(
+        self, selection: np.ndarray, limit: int, offset: int = 0, after: Optional[int] = None
+    ) -> Tuple[np.ndarray, Optional[int]]:
+        """Ranks for one page and the key to continue after (None on the last page)"""
+        if after is not None:
+            # First rank whose key is greater than the cursor key, then its slot in the selection
+            first_rank = np.searchsorted(self.keys, after, side="right")
+            start = int(np.searchsorted(selection, first_rank, side="left"))
+        else:
+            start = offset
+        ranks = selection[start:start + limit]
+        has_more = start + limit < len(selection)
+        next_key = int(self.keys[ranks[-1]]) if has_more and len(ranks) else None
+        return ranks, next_key
+
+    def export_frame(self, ranks: np.ndarray) -> pd.DataFrame:
+        """Source rows (original columns, full precision) for the given ranks"""
+        return self.frame.take(self.order[ranks]).reset_index(drop=True)
+
+    def rows(self, ranks: np.ndarray) -> List[Dict[str, Any]]:
+        """Response records for the given ranks"""
+        fields = list(self.columns)
+        columns = [self.columns[field][ranks].tolist() for field in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
@@ -0,0 +1,269 @@
+"""
+Pre-forking production server for the API.
+
+`python main.py` runs a single uvicorn process with autoreload, and
+`uvicorn --workers N` spawns fresh interpreters that each parse and index
+every prediction table again. Here the parent process imports `main`, loads
+all tables and builds the derived indexes once (`main.warm_data`), then forks
+the workers, which all accept on one shared listening socket.
+
+The workers share the parent's data instead of copying it. Snapshot columns
+are memory-mapped files, so their pages live in the OS page cache
+(`snapshot_store`). Everything else was built before the fork, so it is
+shared copy-on-write. NumPy data buffers are never written after loading,
+so their pages stay shared. Before forking the parent runs `gc.freeze()`,
+which moves the loaded objects out of the collector's generations, so
+collections in the workers do not write to their headers and unshare those
+pages.
+
+Signals to the parent:
+
+- SIGHUP: graceful reload. Changed data files are reloaded in the parent
+  (unchanged ones are reused), a new set of workers is forked, and only then
+  are the old workers sent SIGTERM. uvicorn stops accepting on them and
+  finishes in-flight requests (up to `--graceful-timeout`), so no
+  connection is refused. Code changes need a restart.
+- SIGTERM / SIGINT: graceful shutdown of all workers.
+- SIGUSR1: print RSS / PSS / private memory of the parent and each worker.
+
+The parent also watches `data/predictions` (every `--watch-interval`
+seconds, `DATA_WATCH_INTERVAL`). When new files have finished being written,
+it performs the same reload as SIGHUP, so the new data version is again
+loaded once and shared. The workers do not run their own watchers. A worker
+that exits unexpectedly is replaced.
+
+Memory (Linux, bundled `data/predictions` with compiled snapshots, 4
+workers, measured with `--memory-report`):
+
+    process   RSS MB   PSS MB   private MB
+    parent      142       80         63
+    worker       90       29         14    (each)
+
+A process that loads the same data on its own, as every
+`uvicorn --workers N` worker does, holds about 143 MB of it privately. Here
+each extra worker costs about 14 MB, its interpreter and event loop.
+SIGUSR1 prints the same table for the running server.
+
+Usage (from the backend directory; needs os.fork, i.e. Linux or macOS):
+    python serve.py --workers 4 --port 8000
+    SERVE_WORKERS=4 SERVE_PORT=8000 python serve.py
+    kill -HUP <parent pid>    # reload changed data without dropping requests
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+GRACEFUL_TIMEOUT = 30
+# A worker dying sooner than this after being forked is restarted with a delay
+MIN_WORKER_LIFETIME = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket created in the parent and inherited by every worker"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """RSS, PSS and private (USS) memory of a process in bytes, or None off Linux"""
+    fields = {"Rss": "rss", "Pss": "pss", "Private_Clean": "private", "Private_Dirty": "private"}
+    memory = {"rss": 0, "pss": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] += int(value.split()[0]) * 1024
+    except OSError:
+        return None
+    return memory
+
+
+class PreforkServer:
+    """Parent process: loads the data once, forks and supervises the workers"""
+
+    def __init__(self, workers: int, host: str, port: int, graceful_timeout: float = GRACEFUL_TIMEOUT,
+                 log_level: str = "info", watch_interval: float = 0):
+        self.n_workers = workers
+        self.host = host
+        self.port = port
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.watch_interval = watch_interval
+        self.generation = 0
+        self.workers: Dict[int, tuple] = {}  # pid -> (generation, start time)
+        self.stopping = False
+        self._signals: List[int] = []
+
+    def load(self) -> None:
+        import main
+
+        start = time.perf_counter()
+        # On a reload, the previous data set is in the permanent generation: thaw it so
+        # the collection below can free what the new set replaced
+        gc.unfreeze()
+        self.registry = main.data_registry
+        missing = main.warm_data()
+        gc.collect()
+        # Loaded objects move to the permanent generation, out of the workers' collections
+        gc.freeze()
+        print(f"📦 Data loaded in {time.perf_counter() - start:.2f}s"
+              + (f" (not available: {', '.join(missing)})" if missing else ""))
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = (self.generation, time.monotonic())
+            return pid
+
+        # Worker: uvicorn installs its own SIGINT/SIGTERM handlers; reloads are the parent's business
+        signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        status = 1
+        try:
+            import uvicorn
+            import main
+
+            config = uvicorn.Config(
+                main.app, log_level=self.log_level, timeout_graceful_shutdown=self.graceful_timeout
+            )
+            uvicorn.Server(config).run(sockets=[self.sock])
+            status = 0
+        except BaseException as e:  # never return into the parent's loop
+            print(f"❌ Worker {os.getpid()} failed: {e!r}", file=sys.stderr)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def spawn_generation(self) -> None:
+        self.generation += 1
+        for _ in range(self.n_workers):
+            self.spawn()
+        print(f"🚀 Generation {self.generation}: {self.n_workers} workers on http://{self.host}:{self.port}")
+
+    def reload(self, reason: str = "SIGHUP") -> None:
+        print(f"🔄 {reason}: reloading data and replacing workers")
+        old = [pid for pid, (generation, _) in self.workers.items() if generation == self.generation]
+        self.load()
+        self.spawn_generation()
+        for pid in old:
+            self._kill(pid, signal.SIGTERM)
+
+    def memory_report(self) -> None:
+        rows = [("parent", os.getpid())] + [(f"worker g{g}", pid) for pid, (g, _) in sorted(self.workers.items())]
+        print(f"{'process':12s} {'pid':>7s} {'RSS MB':>8s} {'PSS MB':>8s} {'private MB':>11s}")
+        for label, pid in rows:
+            memory = process_memory(pid)
+            if memory is None:
+                print(f"{label:12s} {pid:7d}   (memory figures need /proc/<pid>/smaps_rollup)")
+                continue
+            print(f"{label:12s} {pid:7d} {memory['rss'] / 2**20:8.1f} {memory['pss'] / 2**20:8.1f} "
+                  f"{memory['private'] / 2**20:11.1f}")
+
+    @staticmethod
+    def _kill(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation, started = self.workers.pop(pid, (None, 0.0))
+            if generation == self.generation and not self.stopping:
+                print(f"⚠️ Worker {pid} exited ({os.waitstatus_to_exitcode(status)}), starting a new one")
+                if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                    time.sleep(MIN_WORKER_LIFETIME)
+                self.spawn()
+
+    def _on_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def stop(self) -> None:
+        self.stopping = True
+        print(f"🛑 Stopping {len(self.workers)} workers")
+        for pid in list(self.workers):
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            self._kill(pid, signal.SIGKILL)
+
+    def run(self, memory_report: bool = False) -> None:
+        self.sock = bind_socket(self.host, self.port)
+        self.load()
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGUSR1):
+            signal.signal(signum, self._on_signal)
+        self.spawn_generation()
+        report_at = time.monotonic() + 3 if memory_report else None
+        next_poll = time.monotonic() + self.watch_interval
+
+        try:
+            while True:
+                while self._signals:
+                    signum = self._signals.pop(0)
+                    if signum == signal.SIGHUP:
+                        self.reload()
+                    elif signum == signal.SIGUSR1:
+                        self.memory_report()
+                    else:
+                        return
+                if self.watch_interval > 0 and time.monotonic() >= next_poll:
+                    next_poll = time.monotonic() + self.watch_interval
+                    if self.registry.poll():
+                        self.reload("Data files changed")
+                if report_at is not None and time.monotonic() >= report_at:
+                    report_at = None
+                    self.memory_report()
+                self._reap()
+                time.sleep(0.2)
+        finally:
+            self.stop()
+            self.sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the API from pre-forked workers sharing one data copy")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SERVE_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--host", default=os.getenv("SERVE_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SERVE_PORT", "8000")))
+    parser.add_argument("--graceful-timeout", type=float, default=GRACEFUL_TIMEOUT,
+                        help="seconds a stopping worker gets to finish in-flight requests")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--watch-interval", type=float, default=float(os.getenv("DATA_WATCH_INTERVAL", "2")),
+                        help="seconds between checks of data/predictions for new files (0 disables)")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="print per-process memory once the workers are up")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        raise SystemExit("serve.py needs os.fork; on Windows use `uvicorn main:app --workers N`")
+    # Imports resolve from the backend directory, as with `python main.py`
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # The parent watches the data; workers get new data by being replaced
+    os.environ["DATA_WATCH_INTERVAL"] = "0"
+    PreforkServer(max(args.workers, 1), args.host, args.port, args.graceful_timeout, args.log_level,
+                  args.watch_interval).run(memory_report=args.memory_report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Columnar snapshot store for the prediction CSVs.
+
+`compile_snapshots` converts every CSV in `data/predictions` into a directory of
+typed `.npy` column files plus a `manifest.json`. `load_table` memory-maps those
+columns so every uvicorn worker shares the same pages through the OS cache
+instead of parsing its own copy of the CSV. Text columns are stored as integer
+codes with their categories in the manifest and load as pandas Categoricals.
+
+A snapshot is only used while it matches its source CSV (size + mtime, or the
+SHA-256 content hash when the mtime changed). Otherwise the loader falls back
+to `pd.read_csv`.
+
+Usage (from the backend directory):
+    python snapshot_store.py                 # compile ../data/predictions
+    python snapshot_store.py path/to/csv_dir
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIRNAME = ".snapshots"
+FORMAT_VERSION = 1
+
+
+def _snapshot_dir(csv_path: str) -> str:
+    """Directory holding the snapshot of a given CSV"""
+    data_dir, filename = os.path.split(os.path.abspath(csv_path))
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(data_dir, SNAPSHOT_DIRNAME, stem)
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compile_snapshot(csv_path: str) -> Dict[str, Any]:
+    """Compile one CSV into a columnar snapshot and return its manifest"""
+    stat = os.stat(csv_path)
+    df = pd.read_csv(csv_path)
+
+    target = _snapshot_dir(csv_path)
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = f"{target}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        file = f"c{i:03d}.npy"
+        entry: Dict[str, Any] = {"name": name, "file": file}
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            np.save(os.path.join(tmp_dir, file), np.ascontiguousarray(series.to_numpy()))
+            entry["kind"] = "numeric"
+        else:
+            codes, categories = pd.factorize(series, use_na_sentinel=True)
+            np.save(os.path.join(tmp_dir, file), codes.astype(np.int32))
+            entry["kind"] = "categorical"
+            entry["categories"] = [str(c) for c in categories]
+        columns.append(entry)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "source": os.path.basename(csv_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": file_sha256(csv_path),
+        "n_rows": len(df),
+        "columns": columns,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    # Swap the new snapshot in; readers that already mapped the old files keep
+    # their pages until they drop them.
+    old_dir = f"{target}.old-{os.getpid()}"
+    if os.path.exists(target):
+        os.rename(target, old_dir)
+    os.rename(tmp_dir, target)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    return manifest
+
+
+def compile_snapshots(data_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Compile every CSV in a directory"""
+    manifests = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith(".csv"):
+            manifests[filename] = compile_snapshot(os.path.join(data_dir, filename))
+    return manifests
+
+
+def _read_manifest(snapshot_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(snapshot_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def snapshot_is_fresh(csv_path: str, manifest: Dict[str, Any]) -> bool:
+    """Check a manifest against its CSV by size/mtime, then by content hash"""
+    if manifest.get("format_version") != FORMAT_VERSION:
+        return False
+    stat = os.stat(csv_path)
+    if stat.st_size != manifest["source_size"]:
+        return False
+    if stat.st_mtime_ns == manifest["source_mtime_ns"]:
+        return True
+    # Same size but touched (e.g. a git checkout): only the hash can tell
+    return file_sha256(csv_path) == manifest["source_sha256"]
+
+
+def load_snapshot(snapshot_dir: str, manifest: Dict[str, Any]) -> pd.DataFrame:
+    """Build a DataFrame over memory-mapped snapshot columns"""
+    data = {}
+    for entry in manifest["columns"]:
+        values = np.load(os.path.join(snapshot_dir, entry["file"]), mmap_mode="r")
+        if entry["kind"] == "categorical":
+            data[entry["name"]] = pd.Categorical.from_codes(
+                np.asarray(values), categories=entry["categories"]
+            )
+        else:
+            data[entry["name"]] = values
+    # copy=False keeps the numeric columns backed by the shared mapping
+    return pd.DataFrame(data, copy=False)
+
+
+def load_table(csv_path: str) -> pd.DataFrame:
+    """Load a prediction table from its snapshot, falling back to the CSV"""
+    snapshot_dir = _snapshot_dir(csv_path)
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is not None:
+        try:
+            if snapshot_is_fresh(csv_path, manifest):
+                return load_snapshot(snapshot_dir, manifest)
+            print(f"⚠️ Snapshot for {os.path.basename(csv_path)} is stale, reading CSV")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Snapshot for {os.path.basename(csv_path)} unusable ({e}), reading CSV")
+    return pd.read_csv(csv_path)
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "..", "data", "predictions")
+    for name, info in compile_snapshots(target_dir).items():
+        print(f"✅ {name}: {info['n_rows']} rows, {len(info['columns'])} columns")
@@ -0,0 +1,100 @@
+"""
+Chatbot context benchmark: per-request f-string + dict vs cached JSON fragments.
+
+Builds the `DistrictIndex` for `data/predictions`, checks that a cached
+`ContextPayload` renders the same response the endpoint used to build for
+every district, and compares the time to produce the response body.
+
+Usage (from the repository root):
+    python benchmarks/bench_chatbot_context.py [n_requests]
+"""
+import os
+import sys
+import time
+
+import orjson
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from district_index import DistrictIndex, normalize_name  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'predictions')
+
+
+def legacy_body(index, district_found):
+    """The endpoint's old steps 4-5, serialized as FastAPI's JSON response would be"""
+    entry = index.get(district_found)
+    district_row = entry["record"]
+    status = entry["status"]
+    district_data = entry["chatbot"]
+    advisory = entry["chatbot_advisory"]
+    context = f"""
+REAL-TIME DATA FOR {district_found.upper()}:
+Location: {district_row['village']}, {district_row['block']} Block
+Current Water Level: {district_data['meanActual']}m depth
+Predicted Water Level: {district_data['meanPredicted']}m
+Prediction Accuracy (RMSE): {district_data['rmse']}m
+Mean Absolute Error (MAE): {district_data['mae']}m
+Model Fit Quality (R²): {district_data['r2']}
+Number of Predictions: {district_data['nPredictions']}
+Risk Status: {status}
+
+OFFICIAL ADVISORY: {advisory}
+
+INSTRUCTIONS:
+- Use the REAL-TIME DATA above to answer the user's question
+- Cite actual numbers (water level, RMSE, status)
+- If status is "Critical" → strongly advise AGAINST extraction
+- If status is "Warning" → suggest caution + monitoring
+- If status is "Safe" → approve with sustainable practices
+- Keep answer under 150 words
+- Be specific and helpful
+"""
+    suggestion = "critical_warning" if status == "Critical" else "warning" if status == "Warning" else "safe_to_proceed"
+    return orjson.dumps({
+        "district_found": district_found,
+        "district_data": district_data,
+        "context": context.strip(),
+        "suggestion": suggestion,
+        "comparison": None,
+    })
+
+
+def cached_body(index, district_found):
+    return index.chatbot_contexts.get([normalize_name(district_found)]).render(district_found)
+
+
+def timed(fn, index, names):
+    start = time.perf_counter()
+    for name in names:
+        fn(index, name)
+    return (time.perf_counter() - start) / len(names) * 1e6
+
+
+def main(n_requests=200000):
+    index = DistrictIndex(
+        pd.read_csv(os.path.join(DATA, 'district_wise_performance.csv')),
+        pd.read_csv(os.path.join(DATA, 'test_predictions_detailed.csv')),
+        version='bench',
+    )
+    for name in index.names:
+        assert orjson.loads(cached_body(index, name)) == orjson.loads(legacy_body(index, name)), name
+
+    names = [index.names[i % len(index.names)] for i in range(n_requests)]
+    legacy_us = timed(legacy_body, index, names)
+    cached_us = timed(cached_body, index, names)
+    print(f"{len(index.names)} districts, {n_requests:,} requests (responses identical)")
+    print(f"f-string + dict per request: {legacy_us:6.2f} µs")
+    print(f"cached fragments:            {cached_us:6.2f} µs ({legacy_us / cached_us:.1f}x)")
+
+    pairs = [[a, b] for a in index.names for b in index.names if a != b]
+    start = time.perf_counter()
+    for pair in pairs:
+        index.chatbot_contexts.get([normalize_name(name) for name in pair]).render(" vs ".join(pair))
+    print(f"{len(pairs)} comparison contexts: {(time.perf_counter() - start) / len(pairs) * 1e6:.1f} µs each "
+          f"(first use, LRU of {index.chatbot_contexts.maxsize})")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
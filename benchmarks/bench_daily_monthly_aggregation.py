@@ -0,0 +1,97 @@
+"""
+Hourly-to-daily/monthly aggregation benchmark: pandas groupby passes vs one bincount scan.
+
+Generates an hourly table shaped like the sampled IMDAA `APCP_sfc` frame
+(grid cells x hours, rows shuffled, a few NaNs), checks that
+`aggregate_daily_monthly` reproduces the notebook's daily and monthly totals
+(cells 68, 70 and 71), and times both.
+
+Usage (from the repository root):
+    python benchmarks/bench_daily_monthly_aggregation.py [n_cells] [n_days]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm.pipeline.aggregation import aggregate_daily_monthly  # noqa: E402
+
+
+def legacy_aggregation(df_apcp):
+    """Notebook cells 68, 70 and 71"""
+    df_apcp = df_apcp.copy()
+    df_apcp['time'] = pd.to_datetime(df_apcp['time'])
+    apcp_daily = (
+        df_apcp.groupby([df_apcp['time'].dt.date, 'latitude', 'longitude'])['APCP_sfc']
+        .sum()
+        .reset_index()
+    )
+    apcp_daily.rename(columns={'time': 'date', 'APCP_sfc': 'rainfall'}, inplace=True)
+    apcp_daily['date'] = pd.to_datetime(apcp_daily['date'])
+
+    apcp_daily['date'] = pd.to_datetime(apcp_daily['date'])
+    apcp_daily_sum = (
+        apcp_daily
+        .groupby([apcp_daily['date'].dt.date, 'latitude', 'longitude'])['rainfall']
+        .sum()
+        .reset_index()
+    )
+    apcp_daily_sum['date'] = pd.to_datetime(apcp_daily_sum['date'])
+
+    apcp_daily_sum['year'] = apcp_daily_sum['date'].dt.year
+    apcp_daily_sum['month'] = apcp_daily_sum['date'].dt.month
+    apcp_monthly_sum = (
+        apcp_daily_sum
+        .groupby(['year', 'month', 'latitude', 'longitude'])['rainfall']
+        .sum()
+        .reset_index()
+    )
+    return apcp_daily_sum[['date', 'latitude', 'longitude', 'rainfall']], apcp_monthly_sum
+
+
+def make_frame(n_cells, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(n_cells)))
+    lat = (27.0 + 0.12 * (np.arange(n_cells) // side)).round(2)
+    lon = (74.0 + 0.12 * (np.arange(n_cells) % side)).round(2)
+    times = pd.date_range('1990-01-01', periods=n_days * 24, freq='h')
+    df = pd.DataFrame({
+        'time': np.tile(times.to_numpy(), n_cells),
+        'latitude': np.repeat(lat, len(times)),
+        'longitude': np.repeat(lon, len(times)),
+        'APCP_sfc': rng.gamma(0.3, 2.0, size=n_cells * len(times)),
+    })
+    df.loc[rng.random(len(df)) < 0.001, 'APCP_sfc'] = np.nan
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(n_cells=120, n_days=730):
+    df = make_frame(n_cells, n_days)
+    print(f"Table: {len(df)} hourly rows, {n_cells} grid cells, {n_days} days")
+
+    legacy_s, (daily_old, monthly_old) = timed(legacy_aggregation, df, repeat=1)
+    new_s, (daily_new, monthly_new) = timed(aggregate_daily_monthly, df, 'APCP_sfc', output_column='rainfall')
+
+    pd.testing.assert_frame_equal(daily_new, daily_old, check_dtype=False)
+    pd.testing.assert_frame_equal(monthly_new, monthly_old, check_dtype=False)
+    print(f"✅ Identical output: {len(daily_new)} daily and {len(monthly_new)} monthly rows")
+
+    print(f"pandas groupby passes : {legacy_s * 1000:9.1f} ms")
+    print(f"Single bincount scan  : {new_s * 1000:9.1f} ms  ({legacy_s / new_s:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
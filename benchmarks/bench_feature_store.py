@@ -0,0 +1,97 @@
+"""
+Feature store benchmark: re-reading the final CSV vs pruned Parquet loads.
+
+Builds a table shaped like `groundwater_final_with_multilevel_temp_lags.csv`
+(847 wells, four readings a year, 12 rainfall and 84 temperature lag
+columns), stores it with `FeatureStore.stage`, and times:
+
+- a full `pd.read_csv` of the CSV (what training did before),
+- a rerun of the stage with unchanged inputs (skipped, read back),
+- loading only the feature groups `prepare_features` uses,
+- the same with a district / date filter (partition and row-group pruning).
+
+Usage (from the repository root):
+    python benchmarks/bench_feature_store.py [n_wells] [n_years]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm.pipeline.feature_store import FEATURE_GROUPS, FeatureStore  # noqa: E402
+from groundwater_lstm.pipeline.temperature import TEMPERATURE_COLUMNS  # noqa: E402
+
+LAG_COLUMNS = [f'{column}_{suffix}' for column in TEMPERATURE_COLUMNS
+               for suffix in ['current'] + [f'lag_{lag}' for lag in range(1, 7)]]
+
+
+def make_frame(n_wells, n_years, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.to_datetime([f'{year}-{month:02d}-01' for year in range(1994, 1994 + n_years)
+                            for month in (1, 5, 8, 11)])
+    wells = pd.DataFrame({
+        'LATITUDE': rng.uniform(27.6, 30.9, n_wells).round(4),
+        'LONGITUDE': rng.uniform(74.4, 77.6, n_wells).round(4),
+        'DISTRICT': [f'District{i % 22}' for i in range(n_wells)],
+        'BLOCK': [f'Block{i % 140}' for i in range(n_wells)],
+        'VILLAGE': [f'Village{i}' for i in range(n_wells)],
+    })
+    df = wells.loc[np.repeat(np.arange(n_wells), len(dates))].reset_index(drop=True)
+    df.insert(0, 'date', np.tile(dates, n_wells))
+    df['WL (in mbgl)'] = rng.uniform(1, 60, len(df))
+    feature_columns = list(dict.fromkeys(FEATURE_GROUPS['rainfall'] + LAG_COLUMNS))
+    features = pd.DataFrame(rng.random((len(df), len(feature_columns))), columns=feature_columns)
+    return pd.concat([df, features], axis=1)
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main(n_wells=847, n_years=27):
+    df = make_frame(n_wells, n_years)
+    workdir = tempfile.mkdtemp(prefix='feature_store_bench_')
+    try:
+        csv_path = os.path.join(workdir, 'final.csv')
+        df.to_csv(csv_path, index=False)
+        print(f"Table: {len(df):,} rows x {df.shape[1]} columns, CSV {os.path.getsize(csv_path) / 2**20:.0f} MiB")
+
+        csv_s, from_csv = timed(pd.read_csv, csv_path, parse_dates=['date'])
+        print(f"Full CSV read             : {csv_s:6.2f} s")
+
+        store = FeatureStore(os.path.join(workdir, 'store'))
+        build_s, _ = timed(store.stage, 'groundwater_features', lambda: from_csv, inputs=[csv_path])
+        print(f"First stage run (write)   : {build_s:6.2f} s")
+
+        rerun_s, stored = timed(FeatureStore(store.root).stage, 'groundwater_features',
+                                lambda: pd.read_csv(csv_path), inputs=[csv_path])
+        pd.testing.assert_frame_equal(stored, from_csv)
+        print(f"Rerun, inputs unchanged   : {rerun_s:6.2f} s  ({csv_s / rerun_s:.1f}x)")
+
+        groups_s, pruned = timed(store.load, 'groundwater_features', feature_groups=FEATURE_GROUPS)
+        pd.testing.assert_frame_equal(pruned, from_csv[pruned.columns])
+        print(f"Feature groups only       : {groups_s:6.2f} s  ({csv_s / groups_s:.1f}x, {pruned.shape[1]} columns)")
+
+        filters = [('DISTRICT', '=', 'District3'), ('date', '>=', pd.Timestamp('2010-01-01'))]
+        filtered_s, subset = timed(store.load, 'groundwater_features', feature_groups=FEATURE_GROUPS, filters=filters)
+        expected = from_csv[(from_csv['DISTRICT'] == 'District3') & (from_csv['date'] >= '2010-01-01')]
+        pd.testing.assert_frame_equal(subset, expected[pruned.columns].reset_index(drop=True))
+        print(f"One district since 2010   : {filtered_s:6.2f} s  ({csv_s / filtered_s:.1f}x, {len(subset):,} rows)")
+        print("✅ Stored and pruned loads match the CSV")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
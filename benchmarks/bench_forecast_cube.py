@@ -0,0 +1,119 @@
+"""
+Forecast timeline benchmark: per-request pandas groupby vs the precomputed cube.
+
+Generates dated detailed predictions (districts of `data/predictions`,
+monthly readings over ten years) and checks that `ForecastCube` gives the
+same monthly statistics as a pandas groupby. It then compares the time to
+answer `/api/dashboard/forecast?district=...&horizon=12` by grouping the
+table on each request, by the old sampled-rows handler, and by slicing the
+cube.
+
+Usage (from the repository root):
+    python benchmarks/bench_forecast_cube.py [n_rows] [n_requests]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import orjson
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from forecast_cube import ForecastCube  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'predictions')
+HORIZON = 12
+
+
+def synthetic_predictions(n_rows, seed=0):
+    districts = pd.read_csv(os.path.join(DATA, 'test_predictions_detailed.csv'))['district'].dropna().unique()
+    rng = np.random.default_rng(seed)
+    actual = rng.gamma(2.0, 5.0, n_rows)
+    months = pd.to_datetime('2014-01-01') + pd.to_timedelta(rng.integers(0, 120 * 30, n_rows), unit='D')
+    return pd.DataFrame({
+        'district': rng.choice(districts, n_rows),
+        'date': months.strftime('%Y-%m-%d'),
+        'actual_water_level': actual,
+        'predicted_water_level': actual + rng.normal(0, 2, n_rows),
+    })
+
+
+def groupby_body(df, district):
+    """Real monthly timeline computed from the table on every request"""
+    rows = df[df['district'] == district] if district else df
+    month = pd.to_datetime(rows['date']).dt.to_period('M')
+    grouped = rows.groupby(month)
+    stats = grouped[['actual_water_level', 'predicted_water_level']].agg(['mean', 'min', 'max']).tail(HORIZON)
+    return orjson.dumps([
+        {"month": period.strftime('%b %Y'), "historical": round(values[0], 2), "predicted": round(values[3], 2),
+         "district": district or "Haryana"}
+        for period, values in zip(stats.index, stats.to_numpy().tolist())
+    ])
+
+
+def legacy_body(df, district):
+    """The old handler: 12 evenly spaced rows with placeholder dates"""
+    sampled = df.iloc[np.linspace(0, len(df) - 1, HORIZON, dtype=int)]
+    base_date = datetime(2024, 1, 1)
+    return orjson.dumps([
+        {"month": (base_date + timedelta(days=30 * i)).strftime("%b %Y"),
+         "historical": round(row['actual_water_level'], 2), "predicted": round(row['predicted_water_level'], 2),
+         "district": row['district']}
+        for i, (_, row) in enumerate(sampled.iterrows())
+    ])
+
+
+def cube_body(cube, district):
+    return cube.render(cube.row(district), HORIZON)[0]
+
+
+def check(df, cube):
+    month = pd.to_datetime(df['date']).dt.strftime('%Y-%m')
+    for district in [None, df['district'].iloc[0]]:
+        rows = df if district is None else df[df['district'] == district]
+        grouped = rows.groupby(month[rows.index])
+        points = orjson.loads(cube.render(cube.row(district), 10 ** 6)[0])
+        assert [p['date'] for p in points] == list(grouped.size().index)
+        assert [p['count'] for p in points] == grouped.size().tolist()
+        for key, column, stat in [('historical', 'actual_water_level', 'mean'),
+                                  ('predictedMax', 'predicted_water_level', 'max'),
+                                  ('historicalP50', 'actual_water_level', 0.5),
+                                  ('predictedP90', 'predicted_water_level', 0.9)]:
+            expected = grouped[column].agg(stat) if isinstance(stat, str) else grouped[column].quantile(stat)
+            # Values are rounded to 2 decimals; sums in a different order may round the other way
+            assert np.allclose([p[key] for p in points], expected.to_numpy(), atol=0.0051), key
+
+
+def timed(fn, source, districts):
+    start = time.perf_counter()
+    for district in districts:
+        fn(source, district)
+    return (time.perf_counter() - start) / len(districts) * 1e6
+
+
+def main(n_rows=200000, n_requests=2000):
+    df = synthetic_predictions(n_rows)
+    start = time.perf_counter()
+    cube = ForecastCube(df, version='bench')
+    build_s = time.perf_counter() - start
+    check(df, cube)
+
+    names = [None] + cube.names[1:]
+    districts = [names[i % len(names)] for i in range(n_requests)]
+    slow = districts[:max(len(names), n_requests // 100)]
+    groupby_us = timed(groupby_body, df, slow)
+    legacy_us = timed(legacy_body, df, slow)
+    cube_us = timed(cube_body, cube, districts)
+    print(f"{n_rows:,} dated predictions, {len(names) - 1} districts, {cube.n_months} months "
+          f"(cube statistics match pandas)")
+    print(f"cube build (once per data version): {build_s * 1000:8.1f} ms")
+    print(f"groupby per request:              {groupby_us:10.1f} µs")
+    print(f"old sampled rows + iterrows:      {legacy_us:10.1f} µs (placeholder dates)")
+    print(f"cube slice:                       {cube_us:10.1f} µs ({groupby_us / cube_us:.0f}x vs groupby)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,92 @@
+"""
+Chatbot place-name matching benchmark: per-name regex loop vs gazetteer automaton.
+
+Adds synthetic villages to the districts, blocks and villages of
+`district_wise_performance.csv`, checks that the `Gazetteer` finds the same
+district as the endpoint's old `\\b<district>\\b` loop for messages naming a
+district, and compares time per message against that loop (22 districts)
+and against the same loop run over every place name.
+
+Usage (from the repository root):
+    python benchmarks/bench_gazetteer_matcher.py [n_villages] [n_messages]
+"""
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from gazetteer import Gazetteer  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'predictions')
+TEMPLATES = [
+    "Can I dig a borewell in {}?",
+    "Is {} safe for farming expansion?",
+    "What about {} water levels next season, and should I switch to drip irrigation?",
+    "I want to install irrigation in {} district",
+    "my village is near {} - is the groundwater going down there?",
+]
+SYLLABLES = ['ka', 'ra', 'pur', 'khe', 'di', 'ban', 'sa', 'li', 'ma', 'gar', 'ho', 'wa', 'ni', 'tu', 'bad']
+
+
+def legacy_find(message, names_by_length):
+    """The endpoint's old extraction loop"""
+    message_lower = message.lower()
+    for district in names_by_length:
+        pattern = r'\b' + re.escape(district.lower()) + r'\b'
+        if re.search(pattern, message_lower):
+            return district
+    return None
+
+
+def make_places(n_villages, seed=0):
+    df = pd.read_csv(os.path.join(DATA, 'district_wise_performance.csv'))
+    places = [(name, kind, district) for kind in ('district', 'block', 'village')
+              for name, district in zip(df[kind].astype(str), df['district'].astype(str))]
+    rng = np.random.default_rng(seed)
+    districts = df['district'].astype(str).unique()
+    for i in range(n_villages):
+        name = ''.join(rng.choice(SYLLABLES, rng.integers(2, 5))).capitalize() + f" {i}"
+        places.append((name, 'village', str(rng.choice(districts))))
+    return places
+
+
+def timed(fn, messages):
+    start = time.perf_counter()
+    results = [fn(message) for message in messages]
+    return results, (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main(n_villages=5000, n_messages=2000):
+    places = make_places(n_villages)
+    start = time.perf_counter()
+    gazetteer = Gazetteer(places)
+    build = time.perf_counter() - start
+    print(f"{len(places):,} places → {len(gazetteer):,} patterns, automaton built in {build * 1000:.0f} ms")
+
+    districts = sorted({district for _, _, district in places})
+    districts_by_length = sorted(districts, key=len, reverse=True)
+    all_names_by_length = sorted({name for name, _, _ in places}, key=len, reverse=True)
+
+    rng = np.random.default_rng(1)
+    messages = [TEMPLATES[i % len(TEMPLATES)].format(rng.choice(districts)) for i in range(n_messages)]
+    messages += ["Can I dig a borewell here?"] * (n_messages // 10)
+
+    legacy, legacy_us = timed(lambda m: legacy_find(m, districts_by_length), messages)
+    matches, gazetteer_us = timed(gazetteer.find, messages)
+    assert legacy == [match.district if match else None for match in matches]
+
+    sample = messages[:200]
+    _, all_names_us = timed(lambda m: legacy_find(m, all_names_by_length), sample)
+
+    print(f"{'regex loop, ' + str(len(districts)) + ' districts':32s} {legacy_us:10.1f} µs/message")
+    print(f"{'regex loop, ' + format(len(all_names_by_length), ',') + ' place names':32s} {all_names_us:10.1f} µs/message")
+    print(f"{'gazetteer, all place names':32s} {gazetteer_us:10.1f} µs/message (same districts as the loop)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,101 @@
+"""
+Temperature-lag merge benchmark: rounded-float/string keys vs integer keys.
+
+Builds groundwater readings for 847 wells (four readings a year) and a monthly
+temperature-lag table for the same wells, checks that `merge_temperature_lags`
+returns the same frame as the notebook's `merge_correct_temperature_lags`,
+and compares time and peak key memory.
+
+Usage (from the repository root):
+    python benchmarks/bench_key_merge.py [n_wells] [n_years]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm.pipeline.temperature import TEMPERATURE_COLUMNS, merge_temperature_lags  # noqa: E402
+
+LAG_COLUMNS = [f'{column}_{suffix}' for column in TEMPERATURE_COLUMNS
+               for suffix in ['current'] + [f'lag_{lag}' for lag in range(1, 7)]]
+
+
+def legacy_merge(gw_df, temp_with_lags):
+    """merge_correct_temperature_lags minus the prints"""
+    result_df = gw_df.copy()
+    temp_with_lags = temp_with_lags.copy()
+    result_df['date_dt'] = pd.to_datetime(result_df['date'])
+    result_df['month_period'] = result_df['date_dt'].dt.to_period('M').astype(str)
+    result_df['lat_round'] = result_df['LATITUDE'].round(4)
+    result_df['lon_round'] = result_df['LONGITUDE'].round(4)
+    temp_with_lags['lat_round'] = temp_with_lags['well_lat'].round(4)
+    temp_with_lags['lon_round'] = temp_with_lags['well_lon'].round(4)
+    lag_columns = [col for col in temp_with_lags.columns if ('_current' in col or '_lag_' in col) and col.endswith(
+        ('_current', '_lag_1', '_lag_2', '_lag_3', '_lag_4', '_lag_5', '_lag_6'))]
+    merged = result_df.merge(
+        temp_with_lags[['lat_round', 'lon_round', 'month_period'] + lag_columns],
+        on=['lat_round', 'lon_round', 'month_period'],
+        how='left'
+    )
+    return merged.drop(['date_dt', 'month_period', 'lat_round', 'lon_round'], axis=1)
+
+
+def make_frames(n_wells, n_years, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(27.6, 30.9, n_wells).round(4)
+    lon = rng.uniform(74.4, 77.6, n_wells).round(4)
+    months = pd.date_range('1994-01-01', periods=n_years * 12, freq='MS')
+    temp = pd.DataFrame({
+        'month_period': np.tile(months.strftime('%Y-%m'), n_wells),
+        'well_lat': np.repeat(lat, len(months)),
+        'well_lon': np.repeat(lon, len(months)),
+    })
+    temp = pd.concat([temp, pd.DataFrame(rng.normal(290, 8, (len(temp), len(LAG_COLUMNS))), columns=LAG_COLUMNS)],
+                     axis=1)
+    reading_months = months[np.isin(months.month, [1, 5, 8, 11])]
+    gw = pd.DataFrame({
+        'LATITUDE': np.repeat(lat, len(reading_months)),
+        'LONGITUDE': np.repeat(lon, len(reading_months)),
+        'date': np.tile((reading_months + pd.Timedelta(days=14)).strftime('%Y-%m-%d'), n_wells),
+        'WL (in mbgl)': rng.random(n_wells * len(reading_months)) * 30,
+    })
+    # A few readings fall outside the temperature record
+    gw.loc[gw.sample(frac=0.01, random_state=seed).index, 'date'] = '2030-01-15'
+    return gw.sample(frac=1.0, random_state=seed).reset_index(drop=True), temp
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(n_wells=847, n_years=27):
+    gw, temp = make_frames(n_wells, n_years)
+    print(f"Groundwater: {len(gw)} rows, temperature lags: {len(temp)} rows x {len(LAG_COLUMNS)} features")
+
+    legacy_s, old = timed(legacy_merge, gw, temp)
+    new_s, new = timed(merge_temperature_lags, gw, temp)
+    pd.testing.assert_frame_equal(new, old)
+    print(f"✅ Identical output: {new.shape}")
+
+    float_keys = (gw['LATITUDE'].round(4).memory_usage(index=False) * 2
+                  + gw['date'].str[:7].memory_usage(index=False, deep=True))
+    int_keys = len(gw) * (4 + 4)
+    print(f"Rounded float + string keys : {legacy_s * 1000:8.1f} ms, {float_keys / 1e6:6.2f} MB of keys")
+    print(f"int32 well / month keys     : {new_s * 1000:8.1f} ms, {int_keys / 1e6:6.2f} MB of keys "
+          f"({legacy_s / new_s:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
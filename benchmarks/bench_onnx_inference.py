@@ -0,0 +1,85 @@
+"""
+Keras vs ONNX Runtime inference benchmark for HaryanaGroundwaterLSTM.
+
+Rebuilds the X_test sequences with `prepare_data`, checks that the exported
+ONNX graph (raw features in, meters out) matches the Keras model on every
+test sequence, then measures latency and throughput at batch sizes 1-1024.
+
+Usage (from the repository root, after training and exporting):
+    python -m groundwater_lstm.export models
+    python benchmarks/bench_onnx_inference.py groundwater_final_with_multilevel_temp_lags.csv models
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm import HaryanaGroundwaterLSTM  # noqa: E402
+from groundwater_lstm.export import ONNX_FILENAME, load_scaler_arrays  # noqa: E402
+from groundwater_lstm.model import MODEL_FILENAME, SCALERS_FILENAME  # noqa: E402
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+PARITY_ATOL_METERS = 1e-3
+
+
+def time_call(fn, batch, min_seconds=0.5, min_runs=5):
+    """Median seconds per call of fn(batch)"""
+    fn(batch)  # warm-up
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_runs or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        fn(batch)
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings))
+
+
+def main(data_csv, model_dir):
+    import onnxruntime as ort
+    import tensorflow as tf
+
+    lstm = HaryanaGroundwaterLSTM()
+    lstm.prepare_data(pd.read_csv(data_csv))
+    scaling = load_scaler_arrays(os.path.join(model_dir, SCALERS_FILENAME))
+
+    keras_model = tf.keras.models.load_model(os.path.join(model_dir, MODEL_FILENAME), compile=False)
+    session = ort.InferenceSession(os.path.join(model_dir, ONNX_FILENAME), providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+
+    # The ONNX graph expects raw features; undo the scaling applied by prepare_data
+    x_scaled = lstm.X_test.astype(np.float32)
+    x_raw = ((x_scaled - scaling['feature_min']) / scaling['feature_scale']).astype(np.float32)
+
+    def keras_predict(batch):
+        scaled = batch * scaling['feature_scale'] + scaling['feature_min']
+        out = keras_model.predict_on_batch(scaled).reshape(-1)
+        return (out - scaling['target_min']) / scaling['target_scale']
+
+    def onnx_predict(batch):
+        return session.run(None, {input_name: batch})[0].reshape(-1)
+
+    # Parity on every X_test sequence
+    keras_levels = np.concatenate([keras_predict(x_raw[i:i + 1024]) for i in range(0, len(x_raw), 1024)])
+    onnx_levels = np.concatenate([onnx_predict(x_raw[i:i + 1024]) for i in range(0, len(x_raw), 1024)])
+    max_diff = float(np.max(np.abs(keras_levels - onnx_levels)))
+    np.testing.assert_allclose(onnx_levels, keras_levels, atol=PARITY_ATOL_METERS, rtol=0)
+    print(f"✅ Parity on {len(x_raw)} X_test sequences (max |Δ| = {max_diff:.2e} m)")
+
+    print(f"\n{'batch':>6} {'keras ms':>10} {'onnx ms':>10} {'keras seq/s':>12} {'onnx seq/s':>12} {'speedup':>8}")
+    for batch_size in BATCH_SIZES:
+        batch = np.resize(x_raw, (batch_size,) + x_raw.shape[1:]).astype(np.float32)
+        keras_s = time_call(keras_predict, batch)
+        onnx_s = time_call(onnx_predict, batch)
+        print(f"{batch_size:>6} {keras_s * 1000:>10.3f} {onnx_s * 1000:>10.3f} "
+              f"{batch_size / keras_s:>12.0f} {batch_size / onnx_s:>12.0f} {keras_s / onnx_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else 'models')
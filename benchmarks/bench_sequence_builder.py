@@ -0,0 +1,88 @@
+"""
+Sequence builder benchmark: per-location loop vs sort-once strided gather.
+
+Generates a table shaped like the training data (847 wells, ~37 readings each,
+30 features, rows shuffled), checks that `build_sequences` reproduces the
+original `create_sequences_by_location` output, and times both.
+
+Usage (from the repository root):
+    python benchmarks/bench_sequence_builder.py [n_wells] [rows_per_well]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm.sequences import build_sequences  # noqa: E402
+
+SEQUENCE_LENGTH = 6
+N_FEATURES = 30
+TARGET = 'WL (in mbgl)'
+
+
+def legacy_sequences(df, feature_names, target_column, sequence_length):
+    """The original HaryanaGroundwaterLSTM.create_sequences_by_location loop"""
+    X_sequences = []
+    y_sequences = []
+    location_ids = []
+    for location_id in df['location_id'].unique():
+        location_data = df[df['location_id'] == location_id].sort_values('date', kind='stable')
+        if len(location_data) < sequence_length + 1:
+            continue
+        location_features = location_data[feature_names].values
+        location_target = location_data[target_column].values
+        for i in range(sequence_length, len(location_data)):
+            X_sequences.append(location_features[i - sequence_length:i])
+            y_sequences.append(location_target[i])
+            location_ids.append(location_id)
+    return np.array(X_sequences), np.array(y_sequences), np.array(location_ids)
+
+
+def make_frame(n_wells, rows_per_well, seed=0):
+    rng = np.random.default_rng(seed)
+    # Uneven well histories, including some too short to form a sequence
+    counts = rng.integers(2, 2 * rows_per_well, size=n_wells)
+    location_id = np.repeat(np.arange(n_wells), counts)
+    offsets = np.concatenate([rng.permutation(c) for c in counts])
+    df = pd.DataFrame({
+        'location_id': location_id,
+        'date': pd.Timestamp('1990-01-01') + pd.to_timedelta(offsets * 73, unit='D'),
+        TARGET: rng.random(len(location_id)),
+    })
+    features = [f'feature_{i}' for i in range(N_FEATURES)]
+    df = pd.concat([df, pd.DataFrame(rng.random((len(df), N_FEATURES)), columns=features)], axis=1)
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True), features
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(n_wells=847, rows_per_well=37):
+    df, features = make_frame(n_wells, rows_per_well)
+    print(f"Table: {len(df)} rows, {df['location_id'].nunique()} wells, {len(features)} features")
+
+    legacy_s, (X_old, y_old, loc_old) = timed(legacy_sequences, df, features, TARGET, SEQUENCE_LENGTH, repeat=1)
+    new_s, (X_new, y_new, loc_new) = timed(build_sequences, df, features, TARGET, SEQUENCE_LENGTH)
+
+    assert X_new.dtype == np.float32 and X_new.shape == X_old.shape
+    np.testing.assert_array_equal(X_new, X_old.astype(np.float32))
+    np.testing.assert_array_equal(y_new, y_old)
+    np.testing.assert_array_equal(loc_new, loc_old)
+    print(f"✅ Identical output: {len(X_new)} sequences of shape {X_new.shape[1:]}")
+
+    print(f"Per-location loop : {legacy_s * 1000:9.1f} ms")
+    print(f"Strided gather    : {new_s * 1000:9.1f} ms  ({legacy_s / new_s:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
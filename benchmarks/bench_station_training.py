@@ -0,0 +1,104 @@
+"""
+Station training benchmark: serial groupby loop vs the process-pool executor.
+
+Generates a station table shaped like the final groundwater dataset (uneven
+station histories, a few missing feature values), checks that
+`train_station_models` reproduces the notebook's serial
+`build_simple_station_models` metrics, and times the serial loop against the
+executor at 1, 2, 4, ... workers up to the machine's core count.
+
+Usage (from the repository root):
+    python benchmarks/bench_station_training.py [n_stations]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm.pipeline.station_training import TARGET_COLUMN, train_station_models  # noqa: E402
+
+FEATURES = [f'rainfall_lag_{lag}' for lag in range(1, 7)] + [
+    'tmax_surface_K_surface_current', 'tmin_surface_K_surface_current', 'tmean_surface_K_surface_current',
+    'tmax_surface_K_surface_lag_1', 'tmax_surface_K_surface_lag_2', 'tmax_surface_K_surface_lag_3',
+    'tmin_surface_K_surface_lag_1', 'tmin_surface_K_surface_lag_2',
+]
+COMPARED = ['district', 'village', 'station_id', 'records', 'train_r2', 'test_r2', 'test_rmse',
+            'top_feature', 'top_importance']
+
+
+def legacy_station_models(df, min_records=20):
+    """The serial loop of build_simple_station_models"""
+    station_results = []
+    for (district, village), station_data in df.groupby(['DISTRICT', 'VILLAGE']):
+        if len(station_data) < min_records:
+            continue
+        model_data = station_data[FEATURES + [TARGET_COLUMN]].dropna()
+        if len(model_data) < min_records:
+            continue
+        X, y = model_data[FEATURES], model_data[TARGET_COLUMN]
+        test_size = 0.3 if len(model_data) < 50 else 0.25
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42)
+        rf = RandomForestRegressor(n_estimators=50, max_depth=6, min_samples_split=5, min_samples_leaf=3,
+                                   random_state=42)
+        rf.fit(X_train, y_train)
+        y_pred_test = rf.predict(X_test)
+        top_feature = max(dict(zip(FEATURES, rf.feature_importances_)).items(), key=lambda x: x[1])
+        station_results.append({
+            'district': district,
+            'village': village,
+            'station_id': f"{district}-{village}",
+            'records': len(model_data),
+            'train_r2': r2_score(y_train, rf.predict(X_train)),
+            'test_r2': r2_score(y_test, y_pred_test),
+            'test_rmse': np.sqrt(mean_squared_error(y_test, y_pred_test)),
+            'top_feature': top_feature[0],
+            'top_importance': top_feature[1],
+        })
+    return pd.DataFrame(station_results)
+
+
+def make_frame(n_stations, seed=0):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(10, 90, size=n_stations)
+    df = pd.DataFrame(rng.random((counts.sum(), len(FEATURES))), columns=FEATURES)
+    df['DISTRICT'] = np.repeat([f'District{i % 21}' for i in range(n_stations)], counts)
+    df['VILLAGE'] = np.repeat([f'Village{i}' for i in range(n_stations)], counts)
+    df[TARGET_COLUMN] = 10 * df['rainfall_lag_1'] + rng.normal(0, 1, len(df))
+    df.loc[rng.random(len(df)) < 0.03, 'tmax_surface_K_surface_lag_3'] = np.nan
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main(n_stations=200):
+    df = make_frame(n_stations)
+    print(f"Table: {len(df)} rows, {n_stations} stations, {len(FEATURES)} features, {os.cpu_count()} cores")
+
+    serial_s, reference = timed(legacy_station_models, df)
+    print(f"Serial groupby loop : {serial_s:7.2f} s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        pool_s, (results, _) = timed(train_station_models, df, FEATURES, max_workers=workers)
+        pd.testing.assert_frame_equal(results[COMPARED], reference, check_dtype=False)
+        print(f"Executor, {workers:2d} workers: {pool_s:7.2f} s  ({serial_s / pool_s:.1f}x)")
+        workers *= 2
+    print(f"✅ Identical metrics for {len(reference)} stations")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
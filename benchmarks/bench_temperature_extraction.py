@@ -0,0 +1,109 @@
+"""
+Well temperature extraction benchmark: per-well mask loop vs integer cell-key gather.
+
+Generates a combined IMDAA-style monthly table (grid cells x months) and a
+groundwater frame with 847 well locations, checks that the pipeline's
+`extract_temperature_at_wells` returns the same frames as the notebook's
+original loop (cell 98), and times both.
+
+Usage (from the repository root):
+    python benchmarks/bench_temperature_extraction.py [n_wells] [grid_side] [n_months]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from groundwater_lstm.pipeline.temperature import extract_temperature_at_wells  # noqa: E402
+
+
+def legacy_extract(imdaa_data, gw_df):
+    """The notebook loop, minus the CSV read/write and progress prints"""
+    well_locations = gw_df[['LATITUDE', 'LONGITUDE']].drop_duplicates()
+    imdaa_coords = imdaa_data[['latitude', 'longitude']].drop_duplicates()
+    tree = cKDTree(imdaa_coords[['latitude', 'longitude']].values)
+    distances, indices = tree.query(well_locations[['LATITUDE', 'LONGITUDE']].values)
+
+    well_to_grid_mapping = []
+    for i, (_, well) in enumerate(well_locations.iterrows()):
+        nearest_grid = imdaa_coords.iloc[indices[i]]
+        well_to_grid_mapping.append({
+            'well_lat': well['LATITUDE'],
+            'well_lon': well['LONGITUDE'],
+            'imdaa_lat': nearest_grid['latitude'],
+            'imdaa_lon': nearest_grid['longitude'],
+            'distance_km': distances[i] * 111
+        })
+    mapping_df = pd.DataFrame(well_to_grid_mapping)
+
+    well_temperature_data = []
+    for _, mapping in mapping_df.iterrows():
+        temp_series = imdaa_data[
+            (imdaa_data['latitude'] == mapping['imdaa_lat']) &
+            (imdaa_data['longitude'] == mapping['imdaa_lon'])
+        ].copy()
+        temp_series['well_lat'] = mapping['well_lat']
+        temp_series['well_lon'] = mapping['well_lon']
+        temp_series['distance_km'] = mapping['distance_km']
+        well_temperature_data.append(temp_series)
+    return pd.concat(well_temperature_data, ignore_index=True), mapping_df
+
+
+def make_frames(n_wells, grid_side, n_months, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = 27.5 + 0.12 * np.arange(grid_side)
+    lon = 74.4 + 0.12 * np.arange(grid_side)
+    months = pd.date_range('1990-01-31', periods=n_months, freq='ME')
+    n_cells = grid_side * grid_side
+    imdaa = pd.DataFrame({
+        'time': np.repeat(months.strftime('%Y-%m-%d'), n_cells),
+        'latitude': np.tile(np.repeat(lat, grid_side), n_months),
+        'longitude': np.tile(np.tile(lon, grid_side), n_months),
+        'tmax_K': rng.normal(305, 5, n_cells * n_months),
+        'tmin_K': rng.normal(285, 5, n_cells * n_months),
+        'tmean_K': rng.normal(295, 5, n_cells * n_months),
+    })
+    wells = pd.DataFrame({
+        'LATITUDE': rng.uniform(lat[0], lat[-1], n_wells).round(4),
+        'LONGITUDE': rng.uniform(lon[0], lon[-1], n_wells).round(4),
+    })
+    # Several readings per well, as in the groundwater table
+    gw_df = wells.sample(n_wells * 5, replace=True, random_state=seed).reset_index(drop=True)
+    return imdaa, gw_df
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(n_wells=847, grid_side=30, n_months=372):
+    imdaa, gw_df = make_frames(n_wells, grid_side, n_months)
+    print(f"IMDAA: {len(imdaa)} rows ({grid_side * grid_side} cells x {n_months} months), "
+          f"{gw_df[['LATITUDE', 'LONGITUDE']].drop_duplicates().shape[0]} wells")
+
+    legacy_s, (temp_old, mapping_old) = timed(legacy_extract, imdaa, gw_df, repeat=1)
+    new_s, (temp_new, mapping_new) = timed(extract_temperature_at_wells, imdaa, gw_df, output_file=None)
+
+    pd.testing.assert_frame_equal(temp_new, temp_old)
+    pd.testing.assert_frame_equal(mapping_new, mapping_old)
+    print(f"✅ Identical output: {len(temp_new)} rows")
+
+    print(f"Per-well mask loop : {legacy_s * 1000:9.1f} ms")
+    print(f"Cell-key gather    : {new_s * 1000:9.1f} ms  ({legacy_s / new_s:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:4]])
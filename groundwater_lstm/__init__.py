@@ -0,0 +1,11 @@
+"""Groundwater level prediction with LSTM networks"""
+
+__all__ = ['HaryanaGroundwaterLSTM']
+
+
+def __getattr__(name):
+    # Imported lazily so data-pipeline modules can be used without TensorFlow
+    if name == 'HaryanaGroundwaterLSTM':
+        from .model import HaryanaGroundwaterLSTM
+        return HaryanaGroundwaterLSTM
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
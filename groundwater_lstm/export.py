@@ -0,0 +1,81 @@
+"""
+Export HaryanaGroundwaterLSTM to ONNX for lightweight CPU inference.
+
+The exported graph takes raw (unscaled) feature sequences and returns water
+levels in meters: the MinMaxScaler parameters from `scalers.json` are folded
+in as Rescaling layers around the trained network, so the serving side only
+needs onnxruntime - no TensorFlow, no sklearn, no scaling code.
+
+Usage (from the repository root):
+    python -m groundwater_lstm.export                # models/ -> models/groundwater_lstm.onnx
+    python -m groundwater_lstm.export path/to/models
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+from .model import MODEL_FILENAME, SCALERS_FILENAME
+
+ONNX_FILENAME = 'groundwater_lstm.onnx'
+INPUT_NAME = 'sequence'
+DEFAULT_OPSET = 13
+
+
+def load_scaler_arrays(scalers_path):
+    """Feature names plus per-feature and target (scale, min) from scalers.json"""
+    with open(scalers_path, encoding='utf-8') as f:
+        artifacts = json.load(f)
+    scalers = artifacts['scalers']
+    names = artifacts['feature_names']
+    return {
+        'sequence_length': int(artifacts['sequence_length']),
+        'feature_names': names,
+        'feature_scale': np.array([scalers[n]['scale'] for n in names], dtype=np.float32),
+        'feature_min': np.array([scalers[n]['min'] for n in names], dtype=np.float32),
+        'target_scale': float(scalers[artifacts['target']]['scale']),
+        'target_min': float(scalers[artifacts['target']]['min']),
+    }
+
+
+def build_inference_model(model, scaling):
+    """Wrap a trained Keras model so it maps raw features to meters"""
+    import tensorflow as tf
+
+    n_features = len(scaling['feature_names'])
+    inputs = tf.keras.Input(shape=(scaling['sequence_length'], n_features), name=INPUT_NAME, dtype='float32')
+    # scaled = value * scale + min  (MinMaxScaler.transform)
+    scaled = tf.keras.layers.Rescaling(
+        scale=scaling['feature_scale'], offset=scaling['feature_min'], name='feature_scaling'
+    )(inputs)
+    prediction = model(scaled, training=False)
+    # value = (scaled - min) / scale  (MinMaxScaler.inverse_transform)
+    level = tf.keras.layers.Rescaling(
+        scale=1.0 / scaling['target_scale'],
+        offset=-scaling['target_min'] / scaling['target_scale'],
+        name='target_unscaling'
+    )(prediction)
+    return tf.keras.Model(inputs, level, name='groundwater_lstm_inference')
+
+
+def export_onnx(model_dir='models', output_path=None, opset=DEFAULT_OPSET):
+    """Write the scaler-folded model as ONNX next to the Keras artifacts"""
+    import tensorflow as tf
+    import tf2onnx
+
+    scaling = load_scaler_arrays(os.path.join(model_dir, SCALERS_FILENAME))
+    model = tf.keras.models.load_model(os.path.join(model_dir, MODEL_FILENAME), compile=False)
+    wrapped = build_inference_model(model, scaling)
+
+    output_path = output_path or os.path.join(model_dir, ONNX_FILENAME)
+    signature = (tf.TensorSpec(
+        (None, scaling['sequence_length'], len(scaling['feature_names'])), tf.float32, name=INPUT_NAME
+    ),)
+    tf2onnx.convert.from_keras(wrapped, input_signature=signature, opset=opset, output_path=output_path)
+    print(f"✅ ONNX model written to {output_path} ({os.path.getsize(output_path) / 1024:.1f} KB)")
+    return output_path
+
+
+if __name__ == '__main__':
+    export_onnx(sys.argv[1] if len(sys.argv) > 1 else 'models')
@@ -0,0 +1,933 @@
+"""
+HaryanaGroundwaterLSTM - single LSTM model for all Haryana monitoring wells.
+
+Extracted from the training notebook so it can be imported by scripts and by
+the export tooling. `save_artifacts` writes the model together with its fitted
+scalers (as JSON) for the backend's on-demand inference endpoint.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+from sklearn.preprocessing import MinMaxScaler, LabelEncoder
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+import tensorflow as tf
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization
+from tensorflow.keras.optimizers import Adam
+from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau, ModelCheckpoint
+import warnings
+warnings.filterwarnings('ignore')
+
+from .pipeline.feature_store import FEATURE_GROUPS, FeatureStore
+from .predictions import PREDICTIONS_FILENAME, prediction_rows
+from .sequence_store import write_sequence_store
+from .sequences import build_sequences, gather_windows, sequence_plan, split_bounds, target_dates
+
+MODEL_FILENAME = 'best_groundwater_model.h5'
+SCALERS_FILENAME = 'scalers.json'
+TARGET_COLUMN = 'WL (in mbgl)'
+
+
+class HaryanaGroundwaterLSTM:
+    def __init__(self, sequence_length=6, lstm_units=64, dropout_rate=0.3, sequence_store_dir='sequence_store'):
+        """
+        LSTM model specifically designed for Haryana groundwater level prediction
+        
+        Parameters:
+        - sequence_length: Number of time steps to look back (since data is 5 months/year, 6 is reasonable)
+        - lstm_units: Number of LSTM units
+        - dropout_rate: Dropout rate for regularization
+        - sequence_store_dir: Directory for the memory-mapped float32 sequence tensors
+          (None keeps them in RAM)
+        """
+        self.sequence_length = sequence_length
+        self.lstm_units = lstm_units
+        self.dropout_rate = dropout_rate
+        self.model = None
+        self.scalers = {}
+        self.label_encoders = {}
+        self.feature_names = None
+        self.location_info = None
+        self.df_original = None
+        self.sequence_store_dir = sequence_store_dir
+        self.sequence_store = None
+        self.date_train = self.date_val = self.date_test = None
+        
+        print("=" * 80)
+        print("HARYANA GROUNDWATER LSTM MODEL ARCHITECTURE")
+        print("=" * 80)
+        print("🔧 MODEL TYPE: Single Model for All Stations (NOT Station-Wise)")
+        print("📍 SPATIAL APPROACH: Learns patterns across all wells simultaneously")
+        print("⏰ TEMPORAL APPROACH: Maintains time sequence continuity per station")
+        print("🎯 PREDICTION: Uses 6 consecutive time steps to predict next water level")
+        print("=" * 80)
+        
+    def analyze_dataset(self, df):
+        """Analyze the dataset structure and characteristics"""
+        print("=" * 60)
+        print("HARYANA GROUNDWATER DATASET ANALYSIS")
+        print("=" * 60)
+        
+        print(f"Dataset Shape: {df.shape}")
+        print(f"Date Range: {df['date'].min()} to {df['date'].max()}")
+        print(f"Unique Locations: {df[['LATITUDE', 'LONGITUDE']].drop_duplicates().shape[0]}")
+        print(f"Unique Districts: {df['DISTRICT'].nunique()}")
+        print(f"Unique Blocks: {df['BLOCK'].nunique()}")
+        
+        # Analyze target variable
+        print(f"\nGroundwater Level (WL) Statistics:")
+        print(df['WL (in mbgl)'].describe())
+        
+        # Check for missing values
+        print(f"\nMissing Values:")
+        missing_counts = df.isnull().sum()
+        if missing_counts.sum() > 0:
+            print(missing_counts[missing_counts > 0])
+        else:
+            print("No missing values found!")
+        
+        # Analyze temporal distribution
+        df['year'] = pd.to_datetime(df['date']).dt.year
+        df['month'] = pd.to_datetime(df['date']).dt.month
+        print(f"\nTemporal Distribution:")
+        print("Months available:", sorted(df['month'].unique()))
+        print("Years covered:", df['year'].min(), "to", df['year'].max())
+        
+        return df
+    
+    def load_features(self, store_root='feature_store', dataset='groundwater_features', filters=None):
+        """Load only the columns prepare_features uses from the Parquet feature store
+        
+        `filters` (e.g. `[('year', '>=', 2000)]`) skips whole partitions and row groups.
+        """
+        store = FeatureStore(store_root)
+        return store.load(dataset, feature_groups=FEATURE_GROUPS, filters=filters)
+    
+    def prepare_features(self, df):
+        """Prepare and select relevant features for the model"""
+        df = df.copy()
+        
+        # Ensure date is datetime
+        df['date'] = pd.to_datetime(df['date'])
+        
+        # Create location identifiers
+        df['location_id'] = df.groupby(['LATITUDE', 'LONGITUDE']).ngroup()
+        
+        # Feature groups (shared with the feature store's column pruning)
+        rainfall_features = FEATURE_GROUPS['rainfall']
+        
+        # Select key temperature features (surface and boundary layer are most relevant for groundwater)
+        temperature_features = FEATURE_GROUPS['temperature']
+        
+        # Geographic features
+        geographic_features = FEATURE_GROUPS['geographic']
+        
+        # Temporal features
+        df['month_sin'] = np.sin(2 * np.pi * df['month'] / 12)
+        df['month_cos'] = np.cos(2 * np.pi * df['month'] / 12)
+        df['year_normalized'] = (pd.to_datetime(df['date']).dt.year - 1990) / 30  # Normalize years 1990-2020
+        
+        temporal_features = ['month_sin', 'month_cos', 'year_normalized']
+        
+        # Combine all features
+        all_features = rainfall_features + temperature_features + geographic_features + temporal_features
+        
+        # Check which features exist in the dataset
+        available_features = [f for f in all_features if f in df.columns]
+        print(f"Using {len(available_features)} features out of {len(all_features)} planned features")
+        
+        self.feature_names = available_features
+        return df[['date', 'WL (in mbgl)', 'location_id'] + available_features]
+    
+    def create_sequences_by_location(self, df, target_column='WL (in mbgl)'):
+        """Create sequences grouped by location to maintain temporal continuity"""
+        # Sort once and gather every window from one strided view (see sequences.py)
+        return build_sequences(df, self.feature_names, target_column, self.sequence_length)
+    
+    def prepare_data(self, df, test_size=0.2, validation_size=0.1):
+        """Prepare data for LSTM training with proper temporal splitting"""
+        print("Preparing data for LSTM...")
+        
+        # Analyze and prepare features
+        df = self.analyze_dataset(df)
+        self.df_original = df
+        df = self.prepare_features(df)
+        
+        # Handle missing values
+        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].mean())
+        
+        # Scale features
+        for col in self.feature_names:
+            if col in df.columns:
+                scaler = MinMaxScaler()
+                df[col] = scaler.fit_transform(df[col].values.reshape(-1, 1)).flatten()
+                self.scalers[col] = scaler
+        
+        # Scale target variable
+        target_scaler = MinMaxScaler()
+        df['WL (in mbgl)'] = target_scaler.fit_transform(df['WL (in mbgl)'].values.reshape(-1, 1)).flatten()
+        self.scalers['WL (in mbgl)'] = target_scaler
+        
+        # Create sequences
+        if self.sequence_store_dir:
+            # Written once to float32 memory-mapped files; the splits are views into them
+            self.sequence_store = write_sequence_store(
+                self.sequence_store_dir, df, self.feature_names, 'WL (in mbgl)', self.sequence_length,
+                test_size=test_size, validation_size=validation_size
+            )
+            self.X_train, self.y_train, self.location_train = self.sequence_store.split('train')
+            self.X_val, self.y_val, self.location_val = self.sequence_store.split('val')
+            self.X_test, self.y_test, self.location_test = self.sequence_store.split('test')
+            self.date_train, self.date_val, self.date_test = (
+                self.sequence_store.split_dates(name) for name in ('train', 'val', 'test'))
+            
+            print(f"Created {self.sequence_store.manifest['n_sequences']} sequences from {df['location_id'].nunique()} locations")
+            print(f"Sequence store: {self.sequence_store_dir} (shape {self.sequence_store.X.shape}, float32, memory-mapped)")
+        else:
+            # As create_sequences_by_location, keeping the date each window predicts
+            windows, starts, y, location_ids = sequence_plan(
+                df, self.feature_names, 'WL (in mbgl)', self.sequence_length)
+            X = gather_windows(windows, starts)
+            dates = target_dates(df, starts, self.sequence_length)
+            
+            print(f"Created {len(X)} sequences from {df['location_id'].nunique()} locations")
+            print(f"Sequence shape: {X.shape}")
+            
+            # Split data temporally (to avoid data leakage), keeping sequence order
+            bounds = split_bounds(len(X), test_size, validation_size)
+            self.X_train, self.y_train, self.location_train = (
+                a[slice(*bounds['train'])] for a in (X, y, location_ids))
+            self.X_val, self.y_val, self.location_val = (
+                a[slice(*bounds['val'])] for a in (X, y, location_ids))
+            self.X_test, self.y_test, self.location_test = (
+                a[slice(*bounds['test'])] for a in (X, y, location_ids))
+            self.date_train, self.date_val, self.date_test = (
+                dates[slice(*bounds[name])] for name in ('train', 'val', 'test'))
+        
+        print(f"Training: {self.X_train.shape[0]} sequences")
+        print(f"Validation: {self.X_val.shape[0]} sequences")
+        print(f"Testing: {self.X_test.shape[0]} sequences")
+        
+        return self.X_train, self.X_val, self.X_test, self.y_train, self.y_val, self.y_test
+    
+    def build_model(self):
+        """Build LSTM model architecture optimized for groundwater prediction"""
+        input_shape = (self.X_train.shape[1], self.X_train.shape[2])
+        
+        self.model = Sequential([
+            # First LSTM layer
+            LSTM(self.lstm_units, return_sequences=True, input_shape=input_shape),
+            BatchNormalization(),
+            Dropout(self.dropout_rate),
+            
+            # Second LSTM layer
+            LSTM(self.lstm_units // 2, return_sequences=True),
+            BatchNormalization(),
+            Dropout(self.dropout_rate),
+            
+            # Third LSTM layer
+            LSTM(self.lstm_units // 4, return_sequences=False),
+            BatchNormalization(),
+            Dropout(self.dropout_rate),
+            
+            # Dense layers
+            Dense(32, activation='relu'),
+            BatchNormalization(),
+            Dropout(self.dropout_rate / 2),
+            
+            Dense(16, activation='relu'),
+            Dropout(self.dropout_rate / 2),
+            
+            # Output layer
+            Dense(1, activation='linear')
+        ])
+        
+        # Compile model
+        self.model.compile(
+            optimizer=Adam(learning_rate=0.001),
+            loss='mse',
+            metrics=['mae']
+        )
+        
+        print("Model Architecture:")
+        self.model.summary()
+        
+        return self.model
+    
+    def train_model(self, epochs=100, batch_size=64, patience=20):
+        """Train the LSTM model"""
+        if self.model is None:
+            self.build_model()
+        
+        # Callbacks
+        callbacks = [
+            EarlyStopping(
+                monitor='val_loss', 
+                patience=patience, 
+                restore_best_weights=True,
+                verbose=1
+            ),
+            ReduceLROnPlateau(
+                monitor='val_loss', 
+                factor=0.5, 
+                patience=patience//2, 
+                min_lr=0.00001,
+                verbose=1
+            ),
+            ModelCheckpoint(
+                'best_groundwater_model.h5',
+                monitor='val_loss',
+                save_best_only=True,
+                verbose=0
+            )
+        ]
+        
+        # Train model
+        print("Training LSTM model...")
+        if self.sequence_store is not None:
+            # Stream shuffled batches from the memory-mapped store; memory follows batch_size
+            history = self.model.fit(
+                self.sequence_store.dataset('train', batch_size, shuffle=True),
+                validation_data=self.sequence_store.dataset('val', batch_size),
+                epochs=epochs,
+                callbacks=callbacks,
+                verbose=1
+            )
+        else:
+            history = self.model.fit(
+                self.X_train, self.y_train,
+                validation_data=(self.X_val, self.y_val),
+                epochs=epochs,
+                batch_size=batch_size,
+                callbacks=callbacks,
+                verbose=1
+            )
+        
+        return history
+    
+    def _predict_split(self, split, X, batch_size=1024):
+        """Predict one split, streaming from the sequence store when there is one"""
+        if self.sequence_store is not None:
+            return self.model.predict(self.sequence_store.dataset(split, batch_size), verbose=0)
+        return self.model.predict(X, verbose=0)
+    
+    def evaluate_model(self):
+        """Evaluate model performance"""
+        # Make predictions
+        train_pred = self._predict_split('train', self.X_train)
+        val_pred = self._predict_split('val', self.X_val)
+        test_pred = self._predict_split('test', self.X_test)
+        
+        # Inverse transform predictions
+        target_scaler = self.scalers['WL (in mbgl)']
+        
+        train_pred_actual = target_scaler.inverse_transform(train_pred)
+        val_pred_actual = target_scaler.inverse_transform(val_pred.reshape(-1, 1))
+        test_pred_actual = target_scaler.inverse_transform(test_pred.reshape(-1, 1))
+        
+        train_actual = target_scaler.inverse_transform(self.y_train.reshape(-1, 1))
+        val_actual = target_scaler.inverse_transform(self.y_val.reshape(-1, 1))
+        test_actual = target_scaler.inverse_transform(self.y_test.reshape(-1, 1))
+        
+        # Calculate metrics
+        def calculate_metrics(actual, predicted):
+            rmse = np.sqrt(mean_squared_error(actual, predicted))
+            mae = mean_absolute_error(actual, predicted)
+            r2 = r2_score(actual, predicted)
+            return rmse, mae, r2
+        
+        train_rmse, train_mae, train_r2 = calculate_metrics(train_actual, train_pred_actual)
+        val_rmse, val_mae, val_r2 = calculate_metrics(val_actual, val_pred_actual)
+        test_rmse, test_mae, test_r2 = calculate_metrics(test_actual, test_pred_actual)
+        
+        print("\n" + "="*60)
+        print("MODEL PERFORMANCE EVALUATION")
+        print("="*60)
+        print(f"Training   - RMSE: {train_rmse:.4f} m, MAE: {train_mae:.4f} m, R²: {train_r2:.4f}")
+        print(f"Validation - RMSE: {val_rmse:.4f} m, MAE: {val_mae:.4f} m, R²: {val_r2:.4f}")
+        print(f"Testing    - RMSE: {test_rmse:.4f} m, MAE: {test_mae:.4f} m, R²: {test_r2:.4f}")
+        
+        return {
+            'train': {'actual': train_actual.flatten(), 'predicted': train_pred_actual.flatten()},
+            'val': {'actual': val_actual.flatten(), 'predicted': val_pred_actual.flatten()},
+            'test': {'actual': test_actual.flatten(), 'predicted': test_pred_actual.flatten()},
+            'metrics': {
+                'train_rmse': train_rmse, 'val_rmse': val_rmse, 'test_rmse': test_rmse,
+                'train_mae': train_mae, 'val_mae': val_mae, 'test_mae': test_mae,
+                'train_r2': train_r2, 'val_r2': val_r2, 'test_r2': test_r2
+            }
+        }
+    
+    def save_artifacts(self, output_dir='models'):
+        """Save the trained model and fitted scalers for the backend inference service"""
+        os.makedirs(output_dir, exist_ok=True)
+        self.model.save(os.path.join(output_dir, MODEL_FILENAME))
+        
+        # MinMaxScaler parameters as plain numbers so the backend does not need sklearn:
+        # scaled = value * scale + min
+        scalers = {}
+        for name, scaler in self.scalers.items():
+            scalers[name] = {
+                'data_min': float(scaler.data_min_[0]),
+                'data_max': float(scaler.data_max_[0]),
+                'scale': float(scaler.scale_[0]),
+                'min': float(scaler.min_[0])
+            }
+        artifacts = {
+            'sequence_length': self.sequence_length,
+            'feature_names': list(self.feature_names),
+            'target': TARGET_COLUMN,
+            'scalers': scalers
+        }
+        with open(os.path.join(output_dir, SCALERS_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(artifacts, f, indent=2)
+        
+        print(f"✅ Model and scalers saved to {output_dir}/")
+    
+    def export_predictions(self, results, output_dir=os.path.join('data', 'predictions')):
+        """Write the test-split predictions the backend serves (test_predictions_detailed.csv)
+        
+        Each row carries the date of the reading it predicts, so the dashboard
+        forecast can show real months instead of sampled rows.
+        """
+        if self.date_test is None:
+            raise ValueError("No target dates for the test split; run prepare_data first")
+        
+        # Location metadata by the location_id assigned in prepare_features
+        df = self.df_original
+        columns = [c for c in ['STATE', 'DISTRICT', 'BLOCK', 'VILLAGE', 'LATITUDE', 'LONGITUDE'] if c in df.columns]
+        locations = df[columns].groupby(df.groupby(['LATITUDE', 'LONGITUDE']).ngroup()).first()
+        meta = locations.reindex(np.asarray(self.location_test)).reset_index(drop=True)
+        meta['location_id'] = np.asarray(self.location_test)
+        meta['date'] = np.asarray(self.date_test)
+        meta[TARGET_COLUMN] = results['test']['actual']
+        rows = prediction_rows(meta, results['test']['predicted'])
+        
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, PREDICTIONS_FILENAME)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        rows.to_csv(tmp_path, index=False)
+        # Replaced in one step; the backend picks the new file up on its next data poll
+        os.replace(tmp_path, path)
+        
+        print(f"✅ {len(rows)} test predictions ({rows['date'].min()} to {rows['date'].max()}) saved to {path}")
+        return rows
+    
+    def plot_results(self, results, history=None):
+        """Create comprehensive visualization of results with line plots"""
+        # Create multiple figure windows for better visualization
+        
+        # Figure 1: Training History and Overall Performance
+        fig1 = plt.figure(figsize=(15, 10))
+        
+        if history is not None:
+            # Plot 1: Training Loss
+            plt.subplot(2, 3, 1)
+            plt.plot(history.history['loss'], label='Training Loss', linewidth=2)
+            plt.plot(history.history['val_loss'], label='Validation Loss', linewidth=2)
+            plt.title('Model Loss During Training', fontsize=12, fontweight='bold')
+            plt.xlabel('Epoch')
+            plt.ylabel('Loss (MSE)')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+            
+            # Plot 2: Training MAE
+            plt.subplot(2, 3, 2)
+            plt.plot(history.history['mae'], label='Training MAE', linewidth=2)
+            plt.plot(history.history['val_mae'], label='Validation MAE', linewidth=2)
+            plt.title('Model MAE During Training', fontsize=12, fontweight='bold')
+            plt.xlabel('Epoch')
+            plt.ylabel('MAE (meters)')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+        
+        # Plot 3: Predicted vs Actual Scatter (Test Set)
+        plt.subplot(2, 3, 3)
+        plt.scatter(results['test']['actual'], results['test']['predicted'], 
+                   alpha=0.6, s=10, color='steelblue', edgecolors='navy', linewidth=0.5)
+        min_val = min(results['test']['actual'].min(), results['test']['predicted'].min())
+        max_val = max(results['test']['actual'].max(), results['test']['predicted'].max())
+        plt.plot([min_val, max_val], [min_val, max_val], 'r--', lw=2, label='Perfect Prediction')
+        plt.xlabel('Actual Water Level (m)')
+        plt.ylabel('Predicted Water Level (m)')
+        plt.title('Test Set: Predicted vs Actual', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 4: Model Performance Metrics
+        plt.subplot(2, 3, 4)
+        metrics_data = {
+            'RMSE': [results['metrics']['train_rmse'], results['metrics']['val_rmse'], results['metrics']['test_rmse']],
+            'MAE': [results['metrics']['train_mae'], results['metrics']['val_mae'], results['metrics']['test_mae']],
+        }
+        x = ['Train', 'Validation', 'Test']
+        
+        plt.plot(x, metrics_data['RMSE'], 'o-', linewidth=2, markersize=8, label='RMSE (m)', color='red')
+        plt.plot(x, metrics_data['MAE'], 's-', linewidth=2, markersize=8, label='MAE (m)', color='blue')
+        plt.xlabel('Dataset')
+        plt.ylabel('Error (meters)')
+        plt.title('Model Error Metrics', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 5: R² Values
+        plt.subplot(2, 3, 5)
+        r2_values = [results['metrics']['train_r2'], results['metrics']['val_r2'], results['metrics']['test_r2']]
+        plt.bar(x, r2_values, alpha=0.7, color=['skyblue', 'lightgreen', 'coral'])
+        plt.ylim(0, 1)
+        plt.xlabel('Dataset')
+        plt.ylabel('R² Score')
+        plt.title('Model R² Performance', fontsize=12, fontweight='bold')
+        for i, v in enumerate(r2_values):
+            plt.text(i, v + 0.01, f'{v:.3f}', ha='center', fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 6: Error Distribution
+        plt.subplot(2, 3, 6)
+        errors = results['test']['predicted'] - results['test']['actual']
+        plt.hist(errors, bins=50, alpha=0.7, edgecolor='black', color='lightcoral')
+        plt.axvline(np.mean(errors), color='red', linestyle='--', linewidth=2, 
+                   label=f'Mean Error: {np.mean(errors):.3f}m')
+        plt.axvline(0, color='green', linestyle='-', linewidth=2, label='Zero Error')
+        plt.xlabel('Prediction Error (m)')
+        plt.ylabel('Frequency')
+        plt.title('Distribution of Prediction Errors', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.show()
+        
+        # Figure 2: Time Series Analysis
+        self.plot_time_series_analysis(results)
+        
+        # Figure 3: Seasonal Performance Analysis (NEW!)
+        # The notebook version read the global `df`; keep the frame passed to prepare_data instead
+        self.plot_seasonal_performance(results, self.df_original)
+    
+    def plot_time_series_analysis(self, results):
+        """Create detailed time series plots"""
+        fig2 = plt.figure(figsize=(18, 12))
+        
+        # Plot 1: Overall Time Series (Test Set)
+        plt.subplot(3, 2, 1)
+        n_samples = min(2000, len(results['test']['actual']))
+        indices = np.arange(n_samples)
+        
+        plt.plot(indices, results['test']['actual'][:n_samples], 
+                label='Actual', alpha=0.8, linewidth=1.5, color='navy')
+        plt.plot(indices, results['test']['predicted'][:n_samples], 
+                label='Predicted', alpha=0.8, linewidth=1.5, color='red')
+        plt.xlabel('Sample Index')
+        plt.ylabel('Water Level (m)')
+        plt.title('Test Set: Time Series Comparison (First 2000 samples)', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 2: Zoomed Time Series (First 200 samples for detail)
+        plt.subplot(3, 2, 2)
+        n_zoom = min(200, len(results['test']['actual']))
+        indices_zoom = np.arange(n_zoom)
+        
+        plt.plot(indices_zoom, results['test']['actual'][:n_zoom], 
+                'o-', label='Actual', alpha=0.8, linewidth=2, markersize=4, color='navy')
+        plt.plot(indices_zoom, results['test']['predicted'][:n_zoom], 
+                's-', label='Predicted', alpha=0.8, linewidth=2, markersize=4, color='red')
+        plt.xlabel('Sample Index')
+        plt.ylabel('Water Level (m)')
+        plt.title('Detailed View: First 200 Test Samples', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 3: Error over Time
+        plt.subplot(3, 2, 3)
+        errors = results['test']['predicted'] - results['test']['actual']
+        plt.plot(indices[:n_samples], errors[:n_samples], 
+                alpha=0.7, linewidth=1, color='purple')
+        plt.axhline(0, color='red', linestyle='--', linewidth=2)
+        plt.axhline(np.mean(errors), color='orange', linestyle='--', linewidth=2, 
+                   label=f'Mean Error: {np.mean(errors):.3f}m')
+        plt.xlabel('Sample Index')
+        plt.ylabel('Prediction Error (m)')
+        plt.title('Prediction Error Over Time', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 4: Absolute Error over Time
+        plt.subplot(3, 2, 4)
+        abs_errors = np.abs(errors)
+        plt.plot(indices[:n_samples], abs_errors[:n_samples], 
+                alpha=0.7, linewidth=1, color='green')
+        plt.axhline(np.mean(abs_errors), color='red', linestyle='--', linewidth=2,
+                   label=f'Mean Abs Error: {np.mean(abs_errors):.3f}m')
+        plt.xlabel('Sample Index')
+        plt.ylabel('Absolute Error (m)')
+        plt.title('Absolute Prediction Error Over Time', fontsize=12, fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 5: Cumulative Error
+        plt.subplot(3, 2, 5)
+        cumulative_error = np.cumsum(errors[:n_samples])
+        plt.plot(indices[:n_samples], cumulative_error, 
+                linewidth=2, color='brown')
+        plt.axhline(0, color='red', linestyle='--', linewidth=2)
+        plt.xlabel('Sample Index')
+        plt.ylabel('Cumulative Error (m)')
+        plt.title('Cumulative Prediction Error', fontsize=12, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 6: Error vs Actual Values
+        plt.subplot(3, 2, 6)
+        plt.scatter(results['test']['actual'], errors, alpha=0.6, s=10, color='purple')
+        plt.axhline(0, color='red', linestyle='--', linewidth=2)
+        plt.xlabel('Actual Water Level (m)')
+        plt.ylabel('Prediction Error (m)')
+        plt.title('Error vs Actual Water Level', fontsize=12, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.show()
+    
+    def plot_seasonal_performance(self, results, df_original=None):
+        """Plot seasonal performance analysis focusing on seasonal transitions"""
+        if df_original is None:
+            print("⚠️  Need original dataframe to analyze seasonal patterns properly")
+            return
+            
+        fig = plt.figure(figsize=(20, 12))
+        
+        # Prepare seasonal data
+        df_seasonal = df_original.copy()
+        df_seasonal['date'] = pd.to_datetime(df_seasonal['date'])
+        df_seasonal['month'] = df_seasonal['date'].dt.month
+        df_seasonal['year'] = df_seasonal['date'].dt.year
+        
+        # Create location mapping
+        df_seasonal['location_id'] = df_seasonal.groupby(['LATITUDE', 'LONGITUDE']).ngroup()
+        
+        # Get test predictions with location info
+        if hasattr(self, 'location_test'):
+            test_results_df = pd.DataFrame({
+                'actual': results['test']['actual'],
+                'predicted': results['test']['predicted'],
+                'location_id': self.location_test
+            })
+            
+            # Calculate performance by location
+            location_performance = []
+            for loc_id in np.unique(self.location_test):
+                loc_mask = test_results_df['location_id'] == loc_id
+                if np.sum(loc_mask) > 5:  # Minimum data points
+                    loc_data = test_results_df[loc_mask]
+                    loc_rmse = np.sqrt(np.mean((loc_data['actual'] - loc_data['predicted'])**2))
+                    loc_r2 = 1 - np.sum((loc_data['actual'] - loc_data['predicted'])**2) / \
+                             np.sum((loc_data['actual'] - np.mean(loc_data['actual']))**2)
+                    
+                    # Get location info
+                    loc_info = df_seasonal[df_seasonal['location_id'] == loc_id].iloc[0]
+                    
+                    location_performance.append({
+                        'location_id': loc_id,
+                        'rmse': loc_rmse,
+                        'r2': loc_r2,
+                        'n_samples': np.sum(loc_mask),
+                        'district': loc_info['DISTRICT'],
+                        'block': loc_info['BLOCK'],
+                        'village': loc_info['VILLAGE'],
+                        'lat': loc_info['LATITUDE'],
+                        'lon': loc_info['LONGITUDE']
+                    })
+            
+            # Sort by R² performance (best performing first)
+            location_performance = sorted(location_performance, key=lambda x: x['r2'], reverse=True)
+            
+            # Plot top 6 best performing stations with seasonal focus
+            print("🏆 TOP PERFORMING STATIONS (by R² score):")
+            for i, loc_perf in enumerate(location_performance[:6]):
+                print(f"{i+1}. Location {loc_perf['location_id']}: {loc_perf['village']}, {loc_perf['district']} "
+                      f"(R²: {loc_perf['r2']:.3f}, RMSE: {loc_perf['rmse']:.3f}m)")
+        
+        # Plot 1-6: Best performing stations with seasonal analysis
+        for i in range(min(6, len(location_performance))):
+            plt.subplot(2, 3, i+1)
+            
+            loc_perf = location_performance[i]
+            loc_id = loc_perf['location_id']
+            
+            # Get original data for this location for seasonal analysis
+            loc_original = df_seasonal[df_seasonal['location_id'] == loc_id].sort_values('date')
+            
+            # Get test predictions for this location
+            loc_test_mask = test_results_df['location_id'] == loc_id
+            loc_test_data = test_results_df[loc_test_mask]
+            
+            if len(loc_test_data) > 3 and len(loc_original) > 10:
+                # Create seasonal pattern analysis
+                
+                # Group by month to show seasonal patterns
+                seasonal_actual = []
+                seasonal_predicted = []
+                months = []
+                
+                # If we can match predictions back to months, do seasonal analysis
+                # For now, show time series with seasonal markers
+                
+                indices = np.arange(len(loc_test_data))
+                actual_vals = loc_test_data['actual'].values
+                pred_vals = loc_test_data['predicted'].values
+                
+                # Plot time series
+                plt.plot(indices, actual_vals, 'o-', label='Actual', 
+                        linewidth=2, markersize=4, alpha=0.8, color='navy')
+                plt.plot(indices, pred_vals, 's-', label='Predicted', 
+                        linewidth=2, markersize=4, alpha=0.8, color='red')
+                
+                # Add seasonal background shading (approximate)
+                for j in range(0, len(indices), 5):  # Every 5 points (assuming ~1 year cycle)
+                    if j + 2 < len(indices):  # Monsoon period
+                        plt.axvspan(j, j+2, alpha=0.1, color='blue', label='Monsoon' if j == 0 else "")
+                
+                plt.title(f'🏆 Rank #{i+1}: {loc_perf["village"]}\n'
+                         f'{loc_perf["district"]} District\n'
+                         f'R²: {loc_perf["r2"]:.3f}, RMSE: {loc_perf["rmse"]:.2f}m', 
+                         fontsize=10, fontweight='bold')
+                plt.xlabel('Time Sequence')
+                plt.ylabel('Water Level (m below ground)')
+                plt.legend(fontsize=8)
+                plt.grid(True, alpha=0.3)
+                
+                # Add seasonal trend analysis
+                if len(actual_vals) >= 5:
+                    # Simple seasonal detection: check if there are cyclical patterns
+                    seasonal_range_actual = np.max(actual_vals) - np.min(actual_vals)
+                    seasonal_range_pred = np.max(pred_vals) - np.min(pred_vals)
+                    
+                    plt.text(0.02, 0.98, f'Seasonal Range:\nActual: {seasonal_range_actual:.1f}m\nPred: {seasonal_range_pred:.1f}m', 
+                            transform=plt.gca().transAxes, fontsize=8, verticalalignment='top',
+                            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        
+        plt.tight_layout()
+        plt.show()
+        
+        # Second figure: Seasonal transition analysis
+        self.plot_seasonal_transitions(df_seasonal, results)
+    
+    def plot_seasonal_transitions(self, df_seasonal, results):
+        """Analyze specific seasonal transitions like Jan->Nov"""
+        fig = plt.figure(figsize=(18, 10))
+        
+        print("\n" + "="*60)
+        print("🌊 SEASONAL TRANSITION ANALYSIS")
+        print("="*60)
+        
+        # Define seasonal months mapping
+        season_months = {
+            'Winter (Jan)': 1,
+            'Pre-Summer (Apr)': 4, 
+            'Summer (May)': 5,
+            'Monsoon (Aug)': 8,
+            'Post-Monsoon (Nov)': 11
+        }
+        
+        # Analyze transitions in original data
+        transitions = {}
+        for year in range(1990, 2021):
+            year_data = df_seasonal[df_seasonal['year'] == year]
+            
+            # Group by location and analyze seasonal progression
+            for loc_id in year_data['location_id'].unique():
+                loc_year_data = year_data[year_data['location_id'] == loc_id].sort_values('month')
+                
+                if len(loc_year_data) >= 3:  # Need at least 3 seasonal points
+                    wl_values = loc_year_data['WL (in mbgl)'].values
+                    months = loc_year_data['month'].values
+                    
+                    # Calculate key transitions
+                    if 1 in months and 11 in months:  # Jan to Nov (pre to post monsoon)
+                        jan_idx = np.where(months == 1)[0]
+                        nov_idx = np.where(months == 11)[0]
+                        if len(jan_idx) > 0 and len(nov_idx) > 0:
+                            jan_wl = wl_values[jan_idx[0]]
+                            nov_wl = wl_values[nov_idx[0]]
+                            recharge = jan_wl - nov_wl  # Positive = water level rose (good)
+                            
+                            key = f"{loc_id}_{year}"
+                            transitions[key] = {
+                                'location_id': loc_id,
+                                'year': year,
+                                'jan_wl': jan_wl,
+                                'nov_wl': nov_wl,
+                                'monsoon_recharge': recharge
+                            }
+        
+        # Plot 1: Monsoon Recharge Analysis
+        plt.subplot(2, 3, 1)
+        if transitions:
+            recharge_values = [t['monsoon_recharge'] for t in transitions.values()]
+            plt.hist(recharge_values, bins=30, alpha=0.7, color='lightblue', edgecolor='navy')
+            plt.axvline(np.mean(recharge_values), color='red', linestyle='--', linewidth=2,
+                       label=f'Mean Recharge: {np.mean(recharge_values):.1f}m')
+            plt.axvline(0, color='black', linestyle='-', linewidth=1, label='No Change')
+            plt.xlabel('Monsoon Recharge (Jan→Nov, meters)')
+            plt.ylabel('Frequency')
+            plt.title('🌧️ Monsoon Recharge Distribution\n(Positive = Water Level Rise)', fontweight='bold')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+        
+        # Plot 2: Best vs Worst Recharge Locations
+        plt.subplot(2, 3, 2)
+        if transitions:
+            # Calculate average recharge by location
+            loc_recharge = {}
+            for trans in transitions.values():
+                loc_id = trans['location_id']
+                if loc_id not in loc_recharge:
+                    loc_recharge[loc_id] = []
+                loc_recharge[loc_id].append(trans['monsoon_recharge'])
+            
+            # Get average recharge per location
+            avg_recharge = {loc: np.mean(recharge_list) for loc, recharge_list in loc_recharge.items() 
+                           if len(recharge_list) >= 3}
+            
+            if avg_recharge:
+                sorted_locations = sorted(avg_recharge.items(), key=lambda x: x[1], reverse=True)
+                
+                # Plot top 10 and bottom 10
+                top_10 = sorted_locations[:10]
+                bottom_10 = sorted_locations[-10:] if len(sorted_locations) > 10 else []
+                
+                top_locs, top_vals = zip(*top_10)
+                x_pos = np.arange(len(top_locs))
+                
+                bars = plt.bar(x_pos, top_vals, alpha=0.7, 
+                              color=['green' if v > 0 else 'red' for v in top_vals])
+                plt.axhline(0, color='black', linestyle='-', linewidth=1)
+                plt.xlabel('Location ID')
+                plt.ylabel('Average Monsoon Recharge (m)')
+                plt.title('🏆 Top 10 Locations by Monsoon Recharge', fontweight='bold')
+                plt.xticks(x_pos, [f'L{int(l)}' for l in top_locs], rotation=45)
+                plt.grid(True, alpha=0.3)
+        
+        # Plot 3: Seasonal Pattern by Month
+        plt.subplot(2, 3, 3)
+        monthly_avg = df_seasonal.groupby('month')['WL (in mbgl)'].agg(['mean', 'std']).reset_index()
+        monthly_avg = monthly_avg[monthly_avg['month'].isin([1, 4, 5, 8, 11])]  # Only our months
+        
+        month_names = {1: 'Jan', 4: 'Apr', 5: 'May', 8: 'Aug', 11: 'Nov'}
+        monthly_avg['month_name'] = monthly_avg['month'].map(month_names)
+        
+        plt.errorbar(monthly_avg['month_name'], monthly_avg['mean'], 
+                    yerr=monthly_avg['std'], fmt='o-', linewidth=3, markersize=8,
+                    capsize=5, capthick=2, color='darkblue')
+        plt.ylabel('Average Water Level (m below ground)')
+        plt.xlabel('Season')
+        plt.title('📅 Seasonal Water Level Pattern\n(All Wells Average)', fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        
+        # Highlight monsoon effect
+        plt.axvspan(1.5, 3.5, alpha=0.2, color='red', label='Dry Season')
+        plt.axvspan(3.5, 4.5, alpha=0.2, color='blue', label='Monsoon Season')
+        plt.legend()
+        
+        # Plot 4: Year-over-Year Trend
+        plt.subplot(2, 3, 4)
+        yearly_avg = df_seasonal.groupby('year')['WL (in mbgl)'].mean().reset_index()
+        plt.plot(yearly_avg['year'], yearly_avg['WL (in mbgl)'], 'o-', linewidth=2, markersize=4)
+        
+        # Add trend line
+        z = np.polyfit(yearly_avg['year'], yearly_avg['WL (in mbgl)'], 1)
+        p = np.poly1d(z)
+        plt.plot(yearly_avg['year'], p(yearly_avg['year']), "--", color='red', linewidth=2,
+                label=f'Trend: {z[0]:.3f}m/year')
+        
+        plt.xlabel('Year')
+        plt.ylabel('Average Water Level (m)')
+        plt.title('📈 30-Year Groundwater Trend\n(1990-2020)', fontweight='bold')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        
+        # Plot 5: District-wise Performance
+        plt.subplot(2, 3, 5)
+        district_avg = df_seasonal.groupby('DISTRICT')['WL (in mbgl)'].agg(['mean', 'count']).reset_index()
+        district_avg = district_avg[district_avg['count'] >= 50]  # Filter districts with enough data
+        
+        if len(district_avg) > 0:
+            district_avg_sorted = district_avg.sort_values('mean')
+            plt.barh(range(len(district_avg_sorted)), district_avg_sorted['mean'], alpha=0.7, color='lightcoral')
+            plt.yticks(range(len(district_avg_sorted)), district_avg_sorted['DISTRICT'])
+            plt.xlabel('Average Water Level (m below ground)')
+            plt.title('🏘️ District-wise Average\nWater Levels', fontweight='bold')
+            plt.grid(True, alpha=0.3)
+        
+        # Plot 6: Model Performance Summary
+        plt.subplot(2, 3, 6)
+        performance_summary = [
+            results['metrics']['test_rmse'],
+            results['metrics']['test_mae'], 
+            results['metrics']['test_r2']
+        ]
+        metrics_names = ['RMSE (m)', 'MAE (m)', 'R² Score']
+        colors = ['red', 'orange', 'green']
+        
+        bars = plt.bar(metrics_names, performance_summary, alpha=0.7, color=colors)
+        plt.title('📊 Overall Model Performance\n(Test Set)', fontweight='bold')
+        plt.ylabel('Metric Value')
+        
+        # Add value labels on bars
+        for bar, val in zip(bars, performance_summary):
+            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01, 
+                    f'{val:.3f}', ha='center', va='bottom', fontweight='bold')
+        
+        plt.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.show()
+        
+        # Print seasonal insights
+        if transitions:
+            print(f"📋 SEASONAL INSIGHTS:")
+            print(f"   • Total seasonal transitions analyzed: {len(transitions)}")
+            print(f"   • Average monsoon recharge: {np.mean(recharge_values):.2f}m")
+            print(f"   • Best recharging locations: {len([r for r in recharge_values if r > 2])} locations gain >2m")
+            print(f"   • Poorly recharging locations: {len([r for r in recharge_values if r < 0])} locations lose water")
+            print(f"   • Seasonal variability: {np.std(recharge_values):.2f}m standard deviation")
+        
+        return transitions
+
+# Usage example
+if __name__ == "__main__":
+    # Load your dataset
+    print("Loading Haryana Groundwater Dataset...")
+    df = pd.read_csv('groundwater_final_with_multilevel_temp_lags.csv')
+    
+    # Initialize model
+    model = HaryanaGroundwaterLSTM(
+        sequence_length=6,    # 6 time steps lookback
+        lstm_units=64,        # Model complexity
+        dropout_rate=0.3      # Regularization
+    )
+    
+    # Prepare data (includes analysis + preprocessing)
+    X_train, X_val, X_test, y_train, y_val, y_test = model.prepare_data(df)
+    
+    # Train model
+    print("Training model...")
+    history = model.train_model(epochs=100, batch_size=64)
+    
+    # Evaluate and visualize
+    print("Evaluating model...")
+    results = model.evaluate_model()
+    model.plot_results(results, history)
+    
+    # Save model + scalers for the backend (/api/forecast/infer)
+    model.save_artifacts('models')
+    
+    print("\nModel training and evaluation complete!")
+    print("Check the plots above for detailed performance analysis.")
@@ -0,0 +1,129 @@
+"""
+Single-scan daily and monthly aggregation of hourly gridded series.
+
+The notebook reduced the hourly IMDAA table with several pandas passes
+(`groupby(...).resample('1D')`, `groupby(dt.date, lat, lon)`, a second daily
+sum over the already-daily frame, then a monthly groupby), converting the
+time column with `pd.to_datetime` before each one. Here every row is turned
+into two integer codes once - a grid-cell code (sorted by latitude, then
+longitude) and a day number - and daily totals come from a single
+`np.bincount` over `day * n_cells + cell`. Monthly totals are folded out of
+the (much smaller) daily result with another bincount, which equals summing
+the hourly rows directly.
+
+Output layout and order match the pandas groupbys they replace: one row per
+(day, cell) / (year, month, cell) that has at least one input row, NaN
+inputs skipped.
+"""
+import numpy as np
+import pandas as pd
+
+# Above this many (bucket x cell) slots the dense bincount is replaced by a sort
+DENSE_LIMIT = 50_000_000
+AGGREGATIONS = ('sum', 'mean')
+
+
+def _cell_codes(lat, lon):
+    """Compact cell code per row, ordered by (lat, lon), plus the cell coordinates"""
+    lat_codes, lat_values = pd.factorize(lat, sort=True)
+    lon_codes, lon_values = pd.factorize(lon, sort=True)
+    if (lat_codes < 0).any() or (lon_codes < 0).any():
+        raise ValueError("Latitude/longitude must not contain missing values")
+    flat = lat_codes.astype(np.int64) * len(lon_values) + lon_codes
+    n_slots = len(lat_values) * len(lon_values)
+    if n_slots <= DENSE_LIMIT:
+        # Compact the lat x lon box to the occupied cells without sorting the rows
+        occupied = np.bincount(flat, minlength=n_slots) > 0
+        cells = np.flatnonzero(occupied)
+        codes = (np.cumsum(occupied) - 1)[flat]
+    else:
+        cells, codes = np.unique(flat, return_inverse=True)
+    return codes, np.asarray(lat_values)[cells // len(lon_values)], np.asarray(lon_values)[cells % len(lon_values)]
+
+
+def _segment_sums(keys, n_keys, columns):
+    """Sorted keys that occur, and the per-key sum of each weight column"""
+    if n_keys <= DENSE_LIMIT:
+        present = np.flatnonzero(np.bincount(keys, minlength=n_keys))
+        return present, [np.bincount(keys, weights=column, minlength=n_keys)[present] for column in columns]
+    # Sparse fallback: one sort, then segment sums with reduceat
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    return sorted_keys[starts], [np.add.reduceat(column[order], starts) for column in columns]
+
+
+def _finish(sums, counts, how):
+    if how == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    return sums
+
+
+def aggregate_daily_monthly(df, value_column, time_column='time', lat_column='latitude', lon_column='longitude',
+                            output_column=None, how='sum'):
+    """Daily and monthly per-cell aggregates of an hourly (time, lat, lon, value) table
+
+    Returns (daily, monthly):
+        daily:   date, lat, lon, value   - one row per cell-day with data
+        monthly: year, month, lat, lon, value
+    `how` is 'sum' (totals, as used for rainfall) or 'mean'. The monthly mean is
+    taken over the underlying hourly values.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation {how!r}; use one of {AGGREGATIONS}")
+    output_column = output_column or value_column
+
+    times = df[time_column]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times)
+    # Day number since the epoch; NaT rows are dropped, as groupby does
+    days = times.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    has_time = ~np.isnat(days)
+    day_numbers = days.astype(np.int64)
+
+    cells, cell_lat, cell_lon = _cell_codes(df[lat_column].to_numpy(), df[lon_column].to_numpy())
+    values = df[value_column].to_numpy(dtype=np.float64)
+    if not has_time.all():
+        cells, day_numbers, values = cells[has_time], day_numbers[has_time], values[has_time]
+    n_cells = len(cell_lat)
+
+    if len(values) == 0:
+        daily = pd.DataFrame({'date': pd.to_datetime([]), lat_column: [], lon_column: [], output_column: []})
+        monthly = pd.DataFrame({'year': [], 'month': [], lat_column: [], lon_column: [], output_column: []})
+        return daily, monthly
+
+    first_day = day_numbers.min()
+    n_days = int(day_numbers.max() - first_day) + 1
+    valid = ~np.isnan(values)
+    day_keys, (day_sums, day_counts) = _segment_sums(
+        (day_numbers - first_day) * n_cells + cells, n_days * n_cells,
+        [np.where(valid, values, 0.0), valid.astype(np.float64)]
+    )
+    day_index, day_cell = np.divmod(day_keys, n_cells)
+    dates = (first_day + day_index).astype('datetime64[D]')
+
+    daily = pd.DataFrame({
+        'date': dates.astype('datetime64[ns]'),
+        lat_column: cell_lat[day_cell],
+        lon_column: cell_lon[day_cell],
+        output_column: _finish(day_sums, day_counts, how),
+    })
+
+    # Months from the daily buckets: sums and counts add up exactly
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    first_month = months.min()
+    n_months = int(months.max() - first_month) + 1
+    month_keys, (month_sums, month_counts) = _segment_sums(
+        (months - first_month) * n_cells + day_cell, n_months * n_cells, [day_sums, day_counts]
+    )
+    month_index, month_cell = np.divmod(month_keys, n_cells)
+    month_numbers = first_month + month_index
+    monthly = pd.DataFrame({
+        'year': (month_numbers // 12 + 1970).astype(np.int32),
+        'month': (month_numbers % 12 + 1).astype(np.int32),
+        lat_column: cell_lat[month_cell],
+        lon_column: cell_lon[month_cell],
+        output_column: _finish(month_sums, month_counts, how),
+    })
+    return daily, monthly
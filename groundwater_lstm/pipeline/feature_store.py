@@ -0,0 +1,234 @@
+"""
+Versioned Parquet feature store for the engineered groundwater tables.
+
+The notebook rebuilt every intermediate (`temperature_at_well_locations.csv`,
+the temperature lags, `groundwater_final_with_multilevel_temp_lags.csv`) as a
+CSV on every run, and training then parsed the whole final CSV again. Here
+each stage's output is written once as a Parquet dataset, hive-partitioned
+by district (`DISTRICT=...` directories) with a `year` column and rows sorted
+by date inside each file, and a `manifest.json` at the store root records for every dataset its version,
+row count, columns and an input fingerprint:
+
+- the SHA-256 of each input file (re-hashed only when its size or mtime
+  changed),
+- the fingerprints of the upstream datasets it was built from,
+- the stage parameters.
+
+`FeatureStore.stage` returns the stored table when the fingerprint is
+unchanged and only runs the computation otherwise. `load` reads just the
+requested columns (or feature groups, as used by
+`HaryanaGroundwaterLSTM.prepare_features`) and passes row filters down to
+Parquet, so whole districts are skipped by their directory name and row
+groups (years) by their min/max statistics. Year is deliberately not a
+directory level: at a few hundred rows per district and year, one file per
+pair made loads slower than parsing the CSV. Rows come back in the order they were
+written.
+
+Each version is written to its own directory and the manifest is replaced
+atomically, so readers never see a half-written dataset.
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .hashing import file_sha256
+
+FORMAT_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+ROW_COLUMN = '_row'
+PARTITION_COLUMNS = ('DISTRICT',)
+ROW_GROUP_ROWS = 50000
+KEEP_VERSIONS = 2
+
+# Feature groups of HaryanaGroundwaterLSTM.prepare_features
+FEATURE_GROUPS = {
+    'rainfall': [
+        'rainfall', 'rainfall_current_apcp', 'rainfall_lag_1', 'rainfall_lag_2',
+        'rainfall_lag_3', 'rainfall_lag_4', 'rainfall_lag_5', 'rainfall_lag_6',
+        'lag_3month_avg', 'lag_3month_sum', 'lag_6month_avg', 'lag_6month_sum'
+    ],
+    # Surface and boundary layer are most relevant for groundwater
+    'temperature': [
+        'tmean_surface_K_surface_current', 'tmean_surface_K_surface_lag_1', 'tmean_surface_K_surface_lag_2',
+        'tmax_surface_K_surface_current', 'tmax_surface_K_surface_lag_1', 'tmax_surface_K_surface_lag_2',
+        'tmin_surface_K_surface_current', 'tmin_surface_K_surface_lag_1', 'tmin_surface_K_surface_lag_2',
+        'tmean_boundary_layer_K_boundary_layer_current', 'tmean_boundary_layer_K_boundary_layer_lag_1',
+        'tmean_boundary_layer_K_boundary_layer_lag_2'
+    ],
+    'geographic': ['LATITUDE', 'LONGITUDE'],
+}
+# Identifiers, date and target that training reads besides the features
+BASE_COLUMNS = ['date', 'WL (in mbgl)', 'DISTRICT', 'BLOCK', 'VILLAGE', 'LATITUDE', 'LONGITUDE']
+
+
+class FeatureStore:
+    """Parquet datasets plus a manifest of their versions and input fingerprints"""
+
+    def __init__(self, root='feature_store'):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, MANIFEST_FILENAME)
+        self.manifest = {'format_version': FORMAT_VERSION, 'datasets': {}, 'file_hashes': {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            if self.manifest.get('format_version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported feature store version in {root}")
+
+    def __contains__(self, name):
+        return name in self.manifest['datasets']
+
+    def info(self, name):
+        return self.manifest['datasets'][name]
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _file_hash(self, path):
+        """SHA-256 of an input file, reused from the manifest while size and mtime are unchanged"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.manifest['file_hashes'].get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        digest = file_sha256(path)
+        self.manifest['file_hashes'][key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        return digest
+
+    def fingerprint(self, inputs=(), depends_on=(), params=None):
+        """Hash of the input files' contents, the upstream datasets' fingerprints and the parameters"""
+        description = {
+            'inputs': {os.path.basename(path): self._file_hash(path) for path in inputs},
+            'depends_on': {name: self.info(name)['fingerprint'] for name in depends_on},
+            'params': params or {},
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_current(self, name, fingerprint):
+        """Whether `name` was built from exactly these inputs and its files are still there"""
+        entry = self.manifest['datasets'].get(name)
+        return (entry is not None and entry['fingerprint'] == fingerprint
+                and os.path.isdir(os.path.join(self.root, entry['path'])))
+
+    def write(self, name, df, fingerprint, partition_by=PARTITION_COLUMNS, date_column='date'):
+        """Write `df` as the next version of `name` and record it in the manifest"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        previous = self.manifest['datasets'].get(name)
+        version = previous['version'] + 1 if previous else 1
+        relative = os.path.join(name, f"v{version}")
+        directory = os.path.join(self.root, relative)
+
+        frame = df.reset_index(drop=True)
+        frame[ROW_COLUMN] = np.arange(len(frame), dtype=np.int64)
+        has_date = date_column in frame.columns
+        if has_date and 'year' not in frame.columns:
+            frame['year'] = pd.to_datetime(frame[date_column]).dt.year.astype(np.int32)
+        partition_by = [column for column in partition_by if column in frame.columns]
+        # Sorted by date inside each partition so date/year filters can skip row groups
+        sort_columns = partition_by + ([date_column] if has_date else [])
+        if sort_columns:
+            frame = frame.sort_values(sort_columns, kind='stable')
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        partition_types = {}
+        for column in partition_by:
+            field_type = table.schema.field(column).type
+            partition_types[column] = str(field_type.value_type if pa.types.is_dictionary(field_type) else field_type)
+
+        tmp_dir = f"{directory}.tmp-{os.getpid()}"
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        ds.write_dataset(
+            table, tmp_dir, format='parquet', partitioning=_partitioning(partition_types),
+            max_rows_per_group=ROW_GROUP_ROWS, min_rows_per_group=min(ROW_GROUP_ROWS, max(len(frame), 1)),
+            basename_template='part-{i}.parquet',
+        )
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.rename(tmp_dir, directory)
+
+        self.manifest['datasets'][name] = {
+            'version': version,
+            'path': relative,
+            'fingerprint': fingerprint,
+            'partition_by': partition_types,
+            'columns': list(df.columns),
+            'rows': len(frame),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._save_manifest()
+
+        for old in range(version - KEEP_VERSIONS, 0, -1):
+            old_dir = os.path.join(self.root, name, f"v{old}")
+            if not os.path.exists(old_dir):
+                break
+            shutil.rmtree(old_dir, ignore_errors=True)
+        print(f"💾 {name} v{version}: {len(frame):,} rows → {directory}")
+
+    def load(self, name, columns=None, feature_groups=None, filters=None):
+        """Read `name`, optionally only some columns / feature groups and rows
+
+        `feature_groups` selects `BASE_COLUMNS` plus the columns of those
+        `FEATURE_GROUPS` (missing ones are skipped). `filters` uses the
+        pyarrow/`pd.read_parquet` form, e.g. `[('DISTRICT', '=', 'Hisar'),
+        ('year', '>=', 2010)]`; partitions and row groups that cannot match are
+        not read.
+        """
+        import pyarrow.parquet as pq
+
+        entry = self.info(name)
+        # A `year` column added at write time can be filtered on but is not returned
+        stored = entry['columns']
+        if feature_groups is not None:
+            wanted = BASE_COLUMNS + [column for group in feature_groups for column in FEATURE_GROUPS[group]]
+            columns = list(dict.fromkeys(wanted if columns is None else list(columns) + wanted))
+        if columns is not None:
+            columns = [column for column in dict.fromkeys(columns) if column in stored]
+
+        directory = os.path.join(self.root, entry['path'])
+        table = pq.read_table(
+            directory, columns=None if columns is None else columns + [ROW_COLUMN],
+            filters=filters, partitioning=_partitioning(entry['partition_by']),
+        )
+        df = table.to_pandas()
+        # Back to the written row order
+        df = df.sort_values(ROW_COLUMN, kind='stable').drop(columns=ROW_COLUMN).reset_index(drop=True)
+        return df[columns if columns is not None else stored]
+
+    def stage(self, name, compute, inputs=(), depends_on=(), params=None, partition_by=PARTITION_COLUMNS,
+              date_column='date'):
+        """Output of one pipeline stage, recomputed only when its inputs changed
+
+        `compute()` returns the stage's DataFrame. `inputs` are file paths and
+        `depends_on` names of datasets in this store that the stage reads.
+        """
+        fingerprint = self.fingerprint(inputs, depends_on, params)
+        if self.is_current(name, fingerprint):
+            print(f"⏭️  {name}: inputs unchanged, loading v{self.info(name)['version']} from the feature store")
+            self._save_manifest()
+            return self.load(name)
+        print(f"🔄 {name}: inputs changed or not built yet, computing")
+        df = compute()
+        self.write(name, df, fingerprint, partition_by, date_column)
+        return df
+
+
+def _partitioning(partition_types):
+    """Hive partitioning with the columns' stored types, so they read back as plain columns"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if not partition_types:
+        return None
+    schema = pa.schema([(column, pa.type_for_alias(type_name)) for column, type_name in partition_types.items()])
+    return ds.partitioning(schema, flavor='hive')
@@ -0,0 +1,21 @@
+"""Content hashes used to decide whether pipeline outputs are still valid"""
+import hashlib
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_sha256(df):
+    """SHA-256 of a DataFrame's values and column names, for tables built in memory"""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
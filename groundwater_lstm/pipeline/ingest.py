@@ -0,0 +1,495 @@
+"""
+Incremental ingestion of a new monitoring round (e.g. the November readings).
+
+Adding a round used to mean rerunning the whole notebook: PDF extraction,
+rainfall and temperature merges, lags, scaling and sequence building. Here
+only the new readings are processed, against state cached from the last full
+run:
+
+- Weather: the monthly rainfall grid (`rainfall_monthly`) and the
+  temperature lag table (`temperature_lags`) from the feature store. Each
+  reading is mapped to its nearest rainfall cell with one KD-tree query, and
+  the rainfall lags / 3- and 6-month windows are computed by the shared lag
+  engine only for the affected cells and the months just before the round.
+  Temperature lags are looked up on (well, month) keys. `ingest init`
+  recomputes the rainfall columns of the training table with the engine and
+  records per column how often they agree; a round is only fed to the model
+  when every rainfall feature it uses was reproduced.
+- History: `ingest_state/` keeps, per location, the last `sequence_length`
+  model-ready rows, the location IDs used in training, the feature means used
+  to fill gaps, and the feature order of the trained model.
+- Sequences: each new reading becomes the target of one window over its
+  location's stored rows. Only those windows are built and appended to
+  `ingest_state/windows/`, and they run through the same model artifacts as
+  `/api/forecast/infer` (the ONNX graph when present, else Keras).
+- Predictions: one row per predicted reading, with its date, is appended
+  to `data/predictions/test_predictions_detailed.csv`.
+
+Readings that are not later than their location's stored history are
+skipped, so rerunning a round does not duplicate rows.
+
+Usage (from the repository root):
+    python -m groundwater_lstm.pipeline.ingest init --store feature_store --model-dir models
+    python -m groundwater_lstm.pipeline.ingest add data/new_readings_2024_11.csv \\
+        --store feature_store --model-dir models --predictions-dir data/predictions
+"""
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..predictions import PREDICTIONS_FILENAME, prediction_rows
+from ..sequences import gather_windows, sequence_plan
+from .feature_store import FEATURE_GROUPS, FeatureStore
+from .keys import join_on_keys, quantize_coordinates, year_month_code, year_month_from_parts
+from .lag_features import rainfall_lag_engine
+from .spatial_join import GridIndex
+from .temperature import merge_temperature_lags
+
+STATE_DIR = 'ingest_state'
+MANIFEST_FILENAME = 'manifest.json'
+HISTORY_FILENAME = 'history.parquet'
+LOCATIONS_FILENAME = 'locations.csv'
+WINDOWS_DIRNAME = 'windows'
+FEATURES_DATASET = 'groundwater_features'
+RAINFALL_DATASET = 'rainfall_monthly'
+TEMPERATURE_DATASET = 'temperature_lags'
+INGESTED_DATASET = 'ingested_readings'
+
+TARGET_COLUMN = 'WL (in mbgl)'
+SEQUENCE_LENGTH = 6
+TEMPORAL_FEATURES = ['month_sin', 'month_cos', 'year_normalized']
+ID_COLUMNS = ['STATE', 'DISTRICT', 'BLOCK', 'VILLAGE', 'LATITUDE', 'LONGITUDE']
+RAINFALL_MAX_LAG = 6
+RAINFALL_WINDOWS = (3, 6)
+# Share of training rows on which the lag engine must reproduce each rainfall column
+RAINFALL_AGREEMENT = 0.99
+DEFAULT_STATE = 'Haryana'
+
+
+def model_feature_names(columns):
+    """Feature order of HaryanaGroundwaterLSTM.prepare_features for a table with `columns`"""
+    planned = (FEATURE_GROUPS['rainfall'] + FEATURE_GROUPS['temperature'] + FEATURE_GROUPS['geographic']
+               + TEMPORAL_FEATURES)
+    available = set(columns) | set(TEMPORAL_FEATURES)
+    return [name for name in planned if name in available]
+
+
+def add_temporal_features(df):
+    """month_sin / month_cos / year_normalized, as prepare_features computes them"""
+    dates = pd.to_datetime(df['date'])
+    return df.assign(
+        month_sin=np.sin(2 * np.pi * dates.dt.month / 12),
+        month_cos=np.cos(2 * np.pi * dates.dt.month / 12),
+        year_normalized=(dates.dt.year - 1990) / 30,  # Normalize years 1990-2020
+    )
+
+
+def _write_json(path, payload):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _write_frame(path, df):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if path.endswith('.parquet'):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _tail_rows(df, n_rows):
+    """Last `n_rows` rows (by date) of every location"""
+    ordered = df.sort_values(['location_id', 'date'], kind='stable')
+    return ordered.groupby('location_id', sort=False).tail(n_rows).reset_index(drop=True)
+
+
+def _location_keys(lat, lon):
+    lat_q, lon_q, _ = quantize_coordinates(lat, lon)
+    return [lat_q, lon_q]
+
+
+class IngestState:
+    """Per-location history, location IDs and fill values cached from the last full run"""
+
+    def __init__(self, directory=STATE_DIR):
+        self.directory = directory
+        manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No ingest state in {directory}; run `ingest init` after a full pipeline run")
+        with open(manifest_path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.feature_names = self.manifest['feature_names']
+        self.sequence_length = self.manifest['sequence_length']
+        self.fill_values = pd.Series(self.manifest['fill_values'], dtype=np.float64)
+        self.rainfall_verification = self.manifest.get('rainfall_verification') or {}
+        self.history = pd.read_parquet(os.path.join(directory, HISTORY_FILENAME))
+        self.locations = pd.read_csv(os.path.join(directory, LOCATIONS_FILENAME))
+
+    @classmethod
+    def create(cls, features, directory=STATE_DIR, feature_names=None, sequence_length=SEQUENCE_LENGTH,
+               rainfall_monthly=None):
+        """Build the state from the full engineered table (the `groundwater_features` dataset)
+
+        With the cached rainfall grid (`rainfall_monthly`), the rainfall lag
+        engine is checked against the table's rainfall columns first.
+        """
+        verification = None
+        if rainfall_monthly is not None:
+            verification = verify_rainfall_features(features, rainfall_monthly)
+        df = add_temporal_features(features)
+        df['date'] = pd.to_datetime(df['date'])
+        # Same IDs as prepare_features: groupby over sorted (LATITUDE, LONGITUDE)
+        df['location_id'] = df.groupby(['LATITUDE', 'LONGITUDE']).ngroup()
+        feature_names = list(feature_names or model_feature_names(df.columns))
+        # prepare_data fills gaps with the column means of the full table
+        fill_values = df[feature_names].mean()
+        df[feature_names] = df[feature_names].fillna(fill_values)
+        if 'STATE' not in df.columns:
+            df['STATE'] = DEFAULT_STATE
+
+        locations = df.drop_duplicates('location_id')[['location_id', 'LATITUDE', 'LONGITUDE']]
+        columns = ['location_id', 'date'] + ID_COLUMNS + feature_names + [TARGET_COLUMN]
+        history = _tail_rows(df[list(dict.fromkeys(columns))], sequence_length)
+
+        os.makedirs(os.path.join(directory, WINDOWS_DIRNAME), exist_ok=True)
+        _write_frame(os.path.join(directory, HISTORY_FILENAME), history)
+        _write_frame(os.path.join(directory, LOCATIONS_FILENAME), locations.sort_values('location_id'))
+        _write_json(os.path.join(directory, MANIFEST_FILENAME), {
+            'sequence_length': sequence_length,
+            'feature_names': feature_names,
+            'fill_values': {name: float(value) for name, value in fill_values.items()},
+            'last_date': str(df['date'].max().date()),
+            'rainfall_verification': verification,
+            'rounds': [],
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        })
+        print(f"✅ Ingest state: {len(locations)} locations, {len(history):,} history rows → {directory}")
+        return cls(directory)
+
+    def location_ids(self, readings):
+        """Training location ID per reading; new wells get IDs after the existing ones"""
+        found = join_on_keys(
+            readings[[]], self.locations, _location_keys(readings['LATITUDE'], readings['LONGITUDE']),
+            _location_keys(self.locations['LATITUDE'], self.locations['LONGITUDE']), columns=['location_id']
+        )['location_id']
+        if found.notna().all():
+            return found.astype(np.int64).to_numpy()
+        unseen = readings.loc[found.isna(), ['LATITUDE', 'LONGITUDE']].drop_duplicates()
+        start = int(self.locations['location_id'].max()) + 1 if len(self.locations) else 0
+        added = unseen.assign(location_id=np.arange(start, start + len(unseen)))
+        self.locations = pd.concat([self.locations, added[['location_id', 'LATITUDE', 'LONGITUDE']]],
+                                   ignore_index=True)
+        print(f"🆕 {len(added)} new well locations (no history yet)")
+        return self.location_ids(readings)
+
+    def save(self, history, round_info):
+        self.history = history
+        self.manifest['rounds'].append(round_info)
+        self.manifest['last_date'] = max(self.manifest['last_date'], round_info['last_date'])
+        _write_frame(os.path.join(self.directory, HISTORY_FILENAME), history)
+        _write_frame(os.path.join(self.directory, LOCATIONS_FILENAME), self.locations)
+        _write_json(os.path.join(self.directory, MANIFEST_FILENAME), self.manifest)
+
+
+def rainfall_features(readings, monthly, max_lag=RAINFALL_MAX_LAG, windows=RAINFALL_WINDOWS):
+    """Rainfall of each reading's nearest grid cell for its month, with lags and window stats
+
+    `monthly` is the cached cell table (year, month, latitude, longitude,
+    rainfall). Lags are taken over the cell's monthly series, so only the
+    affected cells and the months up to the longest lag before the round are
+    processed.
+    """
+    grid = GridIndex(monthly['latitude'], monthly['longitude'])
+    cells, _ = grid.query(readings['LATITUDE'], readings['LONGITUDE'])
+    reading_months = year_month_code(readings['date'])
+
+    engine = rainfall_lag_engine(group_columns=['cell'], order_column='year_month', max_lag=max_lag, windows=windows)
+    months = year_month_from_parts(monthly['year'], monthly['month'])
+    wanted = (np.isin(grid.cell_of_row, cells[cells >= 0])
+              & (months >= reading_months.min() - engine.history) & (months <= reading_months.max()))
+    series = pd.DataFrame({
+        'cell': grid.cell_of_row[wanted],
+        'year_month': months[wanted],
+        'rainfall': monthly['rainfall'].to_numpy()[wanted],
+    })
+    lagged = engine.fit_transform(series)
+
+    missing = ~np.isin(reading_months, series['year_month'].unique())
+    if missing.any():
+        print(f"⚠️ Rainfall cache has no data for {missing.sum()} readings' months; refresh {RAINFALL_DATASET}")
+
+    features = join_on_keys(readings[[]], lagged, [cells, reading_months], ['cell', 'year_month'],
+                            columns=['rainfall'] + engine.feature_columns)
+    features.insert(1, 'rainfall_current_apcp', features['rainfall'])
+    return features
+
+
+def verify_rainfall_features(features, monthly, rtol=1e-3, atol=1e-3):
+    """Share of training rows on which `rainfall_features` reproduces each rainfall column
+
+    The training table's rainfall columns come from the notebook's merge of
+    `groundwater_with_rainfall_lags.csv`; new rounds get theirs from the lag
+    engine. Both are compared on every training row (equal within tolerance,
+    or both missing).
+    """
+    readings = features[['date', 'LATITUDE', 'LONGITUDE']].reset_index(drop=True)
+    readings['date'] = pd.to_datetime(readings['date'])
+    computed = rainfall_features(readings, monthly)
+    agreement = {}
+    for name in computed.columns.intersection(features.columns):
+        expected = pd.to_numeric(features[name], errors='coerce').to_numpy(dtype=np.float64)
+        got = computed[name].to_numpy(dtype=np.float64)
+        same = np.isclose(got, expected, rtol=rtol, atol=atol) | (np.isnan(got) & np.isnan(expected))
+        agreement[name] = float(same.mean()) if len(same) else 0.0
+    for name, share in agreement.items():
+        flag = '✅' if share >= RAINFALL_AGREEMENT else '⚠️'
+        print(f"{flag} Rainfall engine vs training column {name}: {share:.1%} of rows agree")
+    return agreement
+
+
+def _unverified_rainfall(state):
+    """Rainfall features of the model the lag engine was not shown to reproduce"""
+    return [name for name in state.feature_names if name in FEATURE_GROUPS['rainfall']
+            and state.rainfall_verification.get(name, 0.0) < RAINFALL_AGREEMENT]
+
+
+def build_round_features(readings, store, feature_names):
+    """Model features for the new readings from the cached weather tables"""
+    readings = readings.reset_index(drop=True)
+    readings['date'] = pd.to_datetime(readings['date'])
+    # Only the years the round's lags reach back to are read from the rainfall cache
+    lookback = readings['date'].min() - pd.DateOffset(months=max((RAINFALL_MAX_LAG,) + RAINFALL_WINDOWS))
+    monthly = store.load(RAINFALL_DATASET, filters=[('year', '>=', lookback.year),
+                                                    ('year', '<=', readings['date'].max().year)])
+    features = pd.concat([readings, rainfall_features(readings, monthly)], axis=1)
+
+    years = sorted(set(readings['date'].dt.year))
+    temperature = store.load(TEMPERATURE_DATASET, filters=[('year', 'in', years)])
+    temperature_columns = [name for name in feature_names if name in FEATURE_GROUPS['temperature']]
+    if temperature_columns:
+        merged = merge_temperature_lags(features, temperature)
+        features = merged[list(features.columns) + [c for c in temperature_columns if c in merged.columns]]
+    return add_temporal_features(features)
+
+
+def _check_temperature_coverage(features, feature_names, refuse):
+    """Warn about (or, with `refuse`, reject) readings without a temperature lag row
+
+    Those readings would otherwise get the training means for every
+    temperature feature.
+    """
+    columns = [name for name in feature_names if name in FEATURE_GROUPS['temperature']]
+    if not columns:
+        return
+    present = [name for name in columns if name in features.columns]
+    found = features[present].notna().any(axis=1) if present else pd.Series(False, index=features.index)
+    if found.all():
+        return
+    months = sorted(pd.to_datetime(features.loc[~found, 'date']).dt.strftime('%Y-%m').unique())
+    message = (f"{(~found).sum()} of {len(features)} readings have no {TEMPERATURE_DATASET} row "
+               f"({found.mean():.1%} coverage; months {', '.join(months)}); refresh {TEMPERATURE_DATASET}")
+    if refuse:
+        raise ValueError(message + " or pass --allow-missing-temperature to fill them with training means")
+    print(f"⚠️ {message}; filling with training means")
+
+
+def _read_readings(path):
+    readings = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+    if 'date' not in readings.columns and {'year', 'month'} <= set(readings.columns):
+        readings['date'] = pd.to_datetime(readings[['year', 'month']].assign(day=1))
+    if 'STATE' not in readings.columns:
+        readings['STATE'] = DEFAULT_STATE
+    return readings
+
+
+class ModelPredictor:
+    """Batch inference with the artifacts served by /api/forecast/infer"""
+
+    def __init__(self, model_dir):
+        with open(os.path.join(model_dir, 'scalers.json'), encoding='utf-8') as f:
+            artifacts = json.load(f)
+        self.feature_names = list(artifacts['feature_names'])
+        self.sequence_length = int(artifacts['sequence_length'])
+        scalers = artifacts['scalers']
+        self.feature_scale = np.array([scalers[n]['scale'] for n in self.feature_names], dtype=np.float32)
+        self.feature_min = np.array([scalers[n]['min'] for n in self.feature_names], dtype=np.float32)
+        self.target_scale = float(scalers[artifacts['target']]['scale'])
+        self.target_min = float(scalers[artifacts['target']]['min'])
+        self._predict = self._load_onnx(model_dir) or self._load_keras(model_dir)
+
+    def _load_onnx(self, model_dir):
+        path = os.path.join(model_dir, 'groundwater_lstm.onnx')
+        if not os.path.exists(path):
+            return None
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return None
+        session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        input_name = session.get_inputs()[0].name
+        # Scalers are folded into the graph: raw features in, meters out
+        return lambda inputs: session.run(None, {input_name: inputs})[0].reshape(-1)
+
+    def _load_keras(self, model_dir):
+        import tensorflow as tf
+
+        model = tf.keras.models.load_model(os.path.join(model_dir, 'best_groundwater_model.h5'), compile=False)
+
+        def predict(inputs):
+            scaled = model.predict_on_batch(inputs * self.feature_scale + self.feature_min)
+            return (np.asarray(scaled, dtype=np.float64).reshape(-1) - self.target_min) / self.target_scale
+        return predict
+
+    def predict(self, X, batch_size=1024):
+        return np.concatenate([self._predict(X[i:i + batch_size]) for i in range(0, len(X), batch_size)]
+                              or [np.empty(0)])
+
+
+def ingest_round(readings_path, store_root='feature_store', state_dir=STATE_DIR, model_dir='models',
+                 predictions_dir=os.path.join('data', 'predictions'), allow_unverified_rainfall=False,
+                 allow_missing_temperature=False):
+    """Process one round of new readings against the cached state; returns the new prediction rows
+
+    Predicting refuses rainfall features the lag engine was not verified to
+    reproduce at `ingest init` unless `allow_unverified_rainfall` is set, and
+    readings without temperature lags unless `allow_missing_temperature` is.
+    """
+    started = datetime.now()
+    store = FeatureStore(store_root)
+    state = IngestState(state_dir)
+    feature_names = state.feature_names
+
+    unverified = _unverified_rainfall(state)
+    if unverified:
+        if state.rainfall_verification:
+            message = (f"Rainfall lag engine reproduces {unverified} on fewer than {RAINFALL_AGREEMENT:.0%} "
+                       f"of training rows; align its lags/windows with the training features")
+        else:
+            message = (f"Rainfall lag engine was never verified; rerun `ingest init` with {RAINFALL_DATASET} "
+                       f"in the store")
+        if model_dir and not allow_unverified_rainfall:
+            raise ValueError(message)
+        print(f"⚠️ {message}")
+
+    readings = _read_readings(readings_path)
+    readings = readings.dropna(subset=['date', 'LATITUDE', 'LONGITUDE', TARGET_COLUMN]).reset_index(drop=True)
+    readings['date'] = pd.to_datetime(readings['date'])
+    readings['location_id'] = state.location_ids(readings)
+
+    # Only readings later than their location's stored history
+    last_seen = state.history.groupby('location_id')['date'].max()
+    previous = readings['location_id'].map(last_seen)
+    fresh = previous.isna() | (readings['date'] > previous)
+    if not fresh.all():
+        print(f"⏭️  Skipping {(~fresh).sum()} readings already in the history")
+    readings = readings[fresh.to_numpy()].reset_index(drop=True)
+    print(f"📥 {len(readings)} new readings from {readings['location_id'].nunique()} locations")
+    if readings.empty:
+        return pd.DataFrame()
+
+    features = build_round_features(readings, store, feature_names)
+    _check_temperature_coverage(features, feature_names, refuse=bool(model_dir) and not allow_missing_temperature)
+    features[feature_names] = features[feature_names].fillna(state.fill_values[feature_names])
+
+    # Stored tails of the affected locations plus the new rows
+    columns = list(state.history.columns)
+    affected = state.history[state.history['location_id'].isin(readings['location_id'])]
+    combined = pd.concat([affected, features[columns]], ignore_index=True)
+    combined['_new'] = np.r_[np.zeros(len(affected)), np.ones(len(features))]
+    combined['_row'] = np.arange(len(combined), dtype=np.float64)
+
+    # Windows whose target is a new reading; '_row' as target recovers which one
+    windows, starts, target_rows, _ = sequence_plan(combined, feature_names, '_row', state.sequence_length)
+    target_rows = target_rows.astype(np.int64)
+    keep = combined['_new'].to_numpy()[target_rows] == 1
+    X = gather_windows(windows, starts[keep])
+    meta = combined.iloc[target_rows[keep]].reset_index(drop=True)
+    print(f"🧩 {len(X)} new sequences")
+
+    stamp = started.strftime('%Y%m%dT%H%M%S')
+    window_path = os.path.join(state_dir, WINDOWS_DIRNAME, f"round_{stamp}.npz")
+    np.savez(window_path, X=X, y=meta[TARGET_COLUMN].to_numpy(np.float32),
+             location_ids=meta['location_id'].to_numpy(), dates=meta['date'].astype(str).to_numpy())
+
+    new_rows = pd.DataFrame()
+    if model_dir and len(X):
+        predictor = ModelPredictor(model_dir)
+        if predictor.feature_names != feature_names:
+            raise ValueError("Model feature order differs from the ingest state; rerun `ingest init`")
+        predicted = predictor.predict(X)
+        predictions_path = os.path.join(predictions_dir, PREDICTIONS_FILENAME)
+        existing = pd.read_csv(predictions_path) if os.path.exists(predictions_path) else pd.DataFrame()
+        start_id = int(existing['prediction_id'].max()) + 1 if len(existing) else 0
+        new_rows = prediction_rows(meta, predicted, start_id)
+        _write_frame(predictions_path, pd.concat([existing, new_rows], ignore_index=True))
+        print(f"📝 {len(new_rows)} prediction rows appended to {predictions_path}")
+
+    # Round history for retraining, and the new per-location tails
+    ingested = features.drop(columns=['location_id'])
+    if INGESTED_DATASET in store:
+        ingested = pd.concat([store.load(INGESTED_DATASET), ingested], ignore_index=True)
+    store.write(INGESTED_DATASET, ingested, store.fingerprint(params={'rounds': len(state.manifest['rounds']) + 1}))
+    history = pd.concat([state.history, features[columns]], ignore_index=True)
+    state.save(_tail_rows(history, state.sequence_length), {
+        'source': os.path.basename(readings_path),
+        'readings': len(readings),
+        'sequences': int(len(X)),
+        'last_date': str(readings['date'].max().date()),
+        'windows': os.path.basename(window_path),
+        'ingested_at': started.isoformat(timespec='seconds'),
+    })
+    print(f"✅ Round ingested in {(datetime.now() - started).total_seconds():.1f} s")
+    return new_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental ingestion of new water-level readings")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    init = commands.add_parser('init', help="Cache per-location history from the full feature table")
+    init.add_argument('--store', default='feature_store')
+    init.add_argument('--state-dir', default=STATE_DIR)
+    init.add_argument('--model-dir', default='models', help="Take the feature order from scalers.json here")
+
+    add = commands.add_parser('add', help="Ingest one round of new readings (CSV or Parquet)")
+    add.add_argument('readings')
+    add.add_argument('--store', default='feature_store')
+    add.add_argument('--state-dir', default=STATE_DIR)
+    add.add_argument('--model-dir', default='models')
+    add.add_argument('--predictions-dir', default=os.path.join('data', 'predictions'))
+    add.add_argument('--no-predict', action='store_true', help="Build features and sequences only")
+    add.add_argument('--allow-unverified-rainfall', action='store_true',
+                     help="Predict even if the rainfall lag engine did not match the training columns")
+    add.add_argument('--allow-missing-temperature', action='store_true',
+                     help="Predict readings without temperature lags using the training means")
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        feature_names = sequence_length = None
+        scalers_path = os.path.join(args.model_dir, 'scalers.json')
+        if os.path.exists(scalers_path):
+            with open(scalers_path, encoding='utf-8') as f:
+                artifacts = json.load(f)
+            feature_names, sequence_length = artifacts['feature_names'], artifacts['sequence_length']
+        if os.path.exists(args.state_dir):
+            shutil.rmtree(args.state_dir)
+        store = FeatureStore(args.store)
+        rainfall_monthly = store.load(RAINFALL_DATASET) if RAINFALL_DATASET in store else None
+        IngestState.create(store.load(FEATURES_DATASET), args.state_dir, feature_names,
+                           sequence_length or SEQUENCE_LENGTH, rainfall_monthly=rainfall_monthly)
+    else:
+        ingest_round(args.readings, args.store, args.state_dir, None if args.no_predict else args.model_dir,
+                     args.predictions_dir, allow_unverified_rainfall=args.allow_unverified_rainfall,
+                     allow_missing_temperature=args.allow_missing_temperature)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Compact integer join keys for wells, grid cells and months.
+
+The notebook merged tables on `LATITUDE.round(4)` / `LONGITUDE.round(4)` and
+on `'YYYY-MM'` strings. Float keys are slow to hash, and rounding can turn
+two representations of the same coordinate into different keys. Here
+coordinates are quantized once to integers at the same 4-decimal resolution,
+each distinct location gets a stable int32 well ID from a `WellRegistry`, and
+months become int32 codes (`year * 12 + month - 1`). `join_on_keys` then does
+a left join on those integers through a single int64 index lookup instead of
+a multi-column object merge.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+COORDINATE_DECIMALS = 4
+KEY_BITS = 32
+
+
+def year_month_code(values):
+    """int32 month code (year * 12 + month - 1) from datetimes, 'YYYY-MM[-DD]' strings or Periods; -1 if missing"""
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.PeriodDtype):
+        values = values.dt.to_timestamp()
+    elif not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors='coerce')
+    stamps = values.to_numpy(dtype='datetime64[ns]').astype('datetime64[M]')
+    # datetime64[M] counts months from 1970-01
+    codes = stamps.astype(np.int64) + 1970 * 12
+    codes[np.isnat(stamps)] = -1
+    return codes.astype(np.int32)
+
+
+def year_month_from_parts(year, month):
+    """int32 month code from separate year and month columns"""
+    return (np.asarray(year, dtype=np.int64) * 12 + np.asarray(month, dtype=np.int64) - 1).astype(np.int32)
+
+
+def quantize_coordinates(lat, lon, decimals=COORDINATE_DECIMALS):
+    """Coordinates as integers at `decimals` resolution (the old `.round(4)` keys, exactly)"""
+    scale = 10 ** decimals
+    lat = np.round(np.asarray(lat, dtype=np.float64), decimals)
+    lon = np.round(np.asarray(lon, dtype=np.float64), decimals)
+    missing = np.isnan(lat) | np.isnan(lon)
+    lat_q = np.where(missing, 0, np.rint(lat * scale)).astype(np.int64)
+    lon_q = np.where(missing, 0, np.rint(lon * scale)).astype(np.int64)
+    return lat_q, lon_q, missing
+
+
+class WellRegistry:
+    """Stable int32 well IDs for quantized (lat, lon) locations
+
+    IDs are handed out in coordinate order the first time a location is seen
+    and never change afterwards; with `path`, the table is loaded from and
+    saved to CSV so IDs survive between runs.
+    """
+
+    def __init__(self, path=None, decimals=COORDINATE_DECIMALS):
+        self.path = path
+        self.decimals = decimals
+        self.table = pd.DataFrame({'well_id': pd.Series(dtype=np.int32),
+                                   'lat_key': pd.Series(dtype=np.int64),
+                                   'lon_key': pd.Series(dtype=np.int64)})
+        if path and os.path.exists(path):
+            self.table = pd.read_csv(path, dtype={'well_id': np.int32, 'lat_key': np.int64, 'lon_key': np.int64})
+        self._index = None
+
+    def __len__(self):
+        return len(self.table)
+
+    def _lookup(self):
+        if self._index is None:
+            self._index = pd.Index(_pair_key(self.table['lat_key'].to_numpy(), self.table['lon_key'].to_numpy()))
+        return self._index
+
+    def assign(self, lat, lon):
+        """int32 well ID per row (-1 where a coordinate is missing), registering new locations"""
+        lat_q, lon_q, missing = quantize_coordinates(lat, lon, self.decimals)
+        keys = _pair_key(lat_q, lon_q)
+        ids = self._lookup().get_indexer(keys)
+
+        unseen = (ids < 0) & ~missing
+        if unseen.any():
+            new_keys, first = np.unique(keys[unseen], return_index=True)
+            start = len(self.table)
+            added = pd.DataFrame({
+                'well_id': np.arange(start, start + len(new_keys), dtype=np.int32),
+                'lat_key': lat_q[unseen][first],
+                'lon_key': lon_q[unseen][first],
+            })
+            self.table = pd.concat([self.table, added], ignore_index=True)
+            self._index = None
+            ids = self._lookup().get_indexer(keys)
+
+        ids = self.table['well_id'].to_numpy()[ids].astype(np.int32)
+        ids[missing] = -1
+        return ids
+
+    def save(self, path=None):
+        path = path or self.path
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        self.table.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+
+def _pair_key(high, low):
+    """Two integer codes packed into one int64"""
+    high = np.asarray(high, dtype=np.int64)
+    low = np.asarray(low, dtype=np.int64)
+    return (high << KEY_BITS) | (low & ((1 << KEY_BITS) - 1))
+
+
+def _key_arrays(frame, keys):
+    return [frame[key].to_numpy() if isinstance(key, str) else np.asarray(key) for key in keys]
+
+
+def join_on_keys(left, right, left_on, right_on=None, columns=None):
+    """Left join of `right[columns]` onto `left` on two integer keys
+
+    Equivalent to `left.merge(right[columns + keys], left_on=..., right_on=...,
+    how='left')` without the right keys. Each key is a column name or an array
+    of codes aligned with its frame, so keys need not be added as columns.
+    When the right keys are unique (the usual lookup case) this is one int64
+    index lookup and a take of just the matched rows, keeping left's index
+    and order; duplicate right keys fall back to a merge on the packed key.
+    """
+    right_on = right_on if right_on is not None else left_on
+    if len(left_on) != 2 or len(right_on) != 2:
+        raise ValueError("join_on_keys expects exactly two integer keys per side")
+    if columns is None:
+        columns = [column for column in right.columns if column not in right_on]
+
+    left_key = _pair_key(*_key_arrays(left, left_on))
+    right_key = _pair_key(*_key_arrays(right, right_on))
+    right_index = pd.Index(right_key)
+
+    if right_index.is_unique:
+        indexer = right_index.get_indexer(left_key)
+        found = indexer >= 0
+        positions = [right.columns.get_loc(column) for column in columns]
+        looked_up = right.iloc[np.where(found, indexer, 0), positions].set_axis(left.index)
+        if not found.all():
+            looked_up = looked_up.where(np.broadcast_to(found[:, None], looked_up.shape))
+        return pd.concat([left, looked_up], axis=1)
+
+    keyed_left = left.assign(_join_key=left_key)
+    keyed_right = right[columns].assign(_join_key=right_key)
+    return keyed_left.merge(keyed_right, on='_join_key', how='left').drop(columns='_join_key')
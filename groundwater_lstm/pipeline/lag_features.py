@@ -0,0 +1,215 @@
+"""
+Lag and rolling-window features over per-location monthly series.
+
+The temperature lag builder ran one `groupby(['well_lat', 'well_lon'])
+.shift(lag)` per variable and lag (12 x 6 = 72 groupby passes) and inserted
+the results one column at a time; the rainfall lags (`rainfall_lag_k`,
+`lag_3month_sum`, ...) were built separately. Here the rows are sorted once
+by (group, order) so every group is a contiguous block, and all value columns
+are shifted together as one 2-D array: lag k of row i is row i - k when both
+rows belong to the same group. Rolling sums/means come from per-column
+cumulative sums over the same blocks. All new columns are attached in a
+single concat.
+
+`LagFeatureEngine` keeps the last rows of every group after a run, so new
+months can be appended without recomputing the history: `append()` only
+processes the stored tails plus the new rows.
+
+Rolling windows cover the `window` rows *before* the current one (lags
+1..window) and, like `rolling(window)`, are NaN unless all of them are present.
+"""
+import numpy as np
+import pandas as pd
+
+STATS = ('sum', 'avg')
+
+
+def _group_codes(df, group_columns):
+    """Integer group code per row (-1 where a key is missing, as groupby drops those)"""
+    codes = None
+    for column in group_columns:
+        column_codes, uniques = pd.factorize(df[column])
+        if codes is None:
+            codes = column_codes.astype(np.int64)
+            missing = column_codes < 0
+        else:
+            codes = codes * max(len(uniques), 1) + column_codes
+            missing |= column_codes < 0
+    return np.where(missing, -1, codes)
+
+
+def _shift_into(out, values, codes, lag):
+    """Write `values` shifted down by `lag` rows within group blocks into `out` (NaN across boundaries)"""
+    n = len(values)
+    out[:min(lag, n)] = np.nan
+    if lag >= n:
+        return
+    out[lag:] = values[:-lag]
+    crossing = np.ones(n, dtype=bool)
+    crossing[lag:] = (codes[lag:] != codes[:-lag]) | (codes[lag:] < 0)
+    np.copyto(out, np.nan, where=crossing[:, None])
+
+
+def _rolling(values, codes, window):
+    """(sum, mean) of the `window` rows before each row in its block; NaN unless all are present"""
+    n = len(values)
+    filled = np.where(np.isnan(values), 0.0, values)
+    present = (~np.isnan(values)).astype(np.int64)
+    # Prefix sums with a leading zero row: sum of rows [a, b) = cs[b] - cs[a]
+    value_cs = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(filled, axis=0)])
+    count_cs = np.vstack([np.zeros((1, values.shape[1]), dtype=np.int64), np.cumsum(present, axis=0)])
+
+    sums = np.full(values.shape, np.nan)
+    if window < n:
+        end = np.arange(window, n)
+        start = end - window
+        total = value_cs[end] - value_cs[start]
+        complete = (count_cs[end] - count_cs[start]) == window
+        same_group = (codes[start] == codes[end])[:, None]
+        sums[window:] = np.where(complete & same_group, total, np.nan)
+    sums[codes < 0] = np.nan
+    return sums, sums / window
+
+
+class LagFeatureEngine:
+    """Lags and preceding-window rolling stats for several columns, with incremental append
+
+    Output columns are named with `lag_name` / `rolling_name` templates, which
+    receive `column`, `lag`, `window` and `stat` ('sum' or 'avg').
+    `current_name`, when set, adds an unshifted copy of each column.
+    """
+
+    def __init__(self, group_columns, order_column, value_columns, lags=range(1, 7), windows=(),
+                 stats=STATS, lag_name='{column}_lag_{lag}', rolling_name='{column}_{window}month_{stat}',
+                 current_name=None):
+        unknown = set(stats) - set(STATS)
+        if unknown:
+            raise ValueError(f"Unsupported rolling stats {sorted(unknown)}; use {STATS}")
+        self.group_columns = list(group_columns)
+        self.order_column = order_column
+        self.value_columns = list(value_columns)
+        self.lags = list(lags)
+        self.windows = list(windows)
+        self.stats = list(stats)
+        self.lag_name = lag_name
+        self.rolling_name = rolling_name
+        self.current_name = current_name
+        self.history = max(self.lags + self.windows + [0])
+        self.tail = None
+
+    @property
+    def feature_columns(self):
+        names = []
+        for column in self.value_columns:
+            if self.current_name:
+                names.append(self.current_name.format(column=column))
+            names.extend(self.lag_name.format(column=column, lag=lag) for lag in self.lags)
+        for window in self.windows:
+            for column in self.value_columns:
+                names.extend(self.rolling_name.format(column=column, window=window, stat=stat) for stat in self.stats)
+        return names
+
+    def _compute(self, df):
+        """Feature arrays for `df`, in df's row order"""
+        codes = _group_codes(df, self.group_columns)
+        # One stable sort; rows already in (group, order) order stay put
+        order = np.lexsort((df[self.order_column].to_numpy(), codes))
+        codes_sorted = codes[order]
+        values = np.asfortranarray(df[self.value_columns].to_numpy(dtype=np.float64)[order])
+
+        # One column-major matrix: each feature is a contiguous column, and the
+        # frame built from it is a single block
+        names = self.feature_columns
+        matrix = np.empty((len(df), len(names)), dtype=np.float64, order='F')
+        # Columns go variable by variable ([current], lag 1..n); the columns of one
+        # lag across all variables are a strided view, filled by one 2-D shift
+        per_column = len(self.lags) + (1 if self.current_name else 0)
+        n_values = len(self.value_columns)
+        if self.current_name:
+            matrix[:, 0:per_column * n_values:per_column] = values
+        for i, lag in enumerate(self.lags, start=1 if self.current_name else 0):
+            _shift_into(matrix[:, i:per_column * n_values:per_column], values, codes_sorted, lag)
+        position = per_column * n_values
+        for window in self.windows:
+            sums, means = _rolling(values, codes_sorted, window)
+            by_stat = {'sum': sums, 'avg': means}
+            for j in range(len(self.value_columns)):
+                for stat in self.stats:
+                    matrix[:, position] = by_stat[stat][:, j]
+                    position += 1
+
+        # Back to the caller's row order (nothing to do when it was already sorted)
+        if not np.array_equal(order, np.arange(len(order))):
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            matrix = np.asfortranarray(matrix[inverse])
+        return pd.DataFrame(matrix, columns=names, index=df.index), codes, order
+
+    def _remember_tail(self, df, codes, order):
+        """Keep the last `history` rows of each group for later appends"""
+        if not self.history:
+            self.tail = df.iloc[:0][self.group_columns + [self.order_column] + self.value_columns]
+            return
+        codes_sorted = codes[order]
+        # Rank from the end of each block: rows with rank < history are kept
+        block_end = np.r_[codes_sorted[1:] != codes_sorted[:-1], True]
+        end_positions = np.flatnonzero(block_end)
+        block_index = np.cumsum(np.r_[0, block_end[:-1]])
+        from_end = end_positions[block_index] - np.arange(len(order))
+        keep = order[(from_end < self.history) & (codes_sorted >= 0)]
+        columns = self.group_columns + [self.order_column] + self.value_columns
+        self.tail = df.iloc[np.sort(keep)][columns].reset_index(drop=True)
+
+    def fit_transform(self, df):
+        """Features for the full history; returns `df` with the feature columns attached"""
+        features, codes, order = self._compute(df)
+        self._remember_tail(df, codes, order)
+        return pd.concat([df, features], axis=1)
+
+    def append(self, new_rows):
+        """Features for rows that extend the stored history, without recomputing it
+
+        Each new row must come after its group's stored rows in `order_column`.
+        """
+        if self.tail is None:
+            return self.fit_transform(new_rows)
+        columns = self.group_columns + [self.order_column] + self.value_columns
+        if len(self.tail):
+            last = self.tail.groupby(self.group_columns, sort=False)[self.order_column].max()
+            first_new = new_rows.groupby(self.group_columns, sort=False)[self.order_column].min()
+            overlap = first_new.to_frame('first').join(last.rename('last'), how='inner')
+            if (overlap['first'] <= overlap['last']).any():
+                raise ValueError("Appended rows must be later than the stored history of their group")
+
+        n_tail = len(self.tail)
+        combined = pd.concat([self.tail, new_rows[columns]], ignore_index=True)
+        features, codes, order = self._compute(combined)
+        self._remember_tail(combined, codes, order)
+        new_features = features.iloc[n_tail:].set_axis(new_rows.index)
+        return pd.concat([new_rows, new_features], axis=1)
+
+    def save_state(self, path):
+        """Persist the per-group tails so a later run can `append`"""
+        pd.to_pickle(self.tail, path)
+
+    def load_state(self, path):
+        self.tail = pd.read_pickle(path)
+        return self
+
+
+def rainfall_lag_engine(group_columns=('LATITUDE', 'LONGITUDE'), order_column='date',
+                          value_column='rainfall', max_lag=6, windows=(3, 6)):
+    """Engine for `rainfall_lag_1..max_lag` and `lag_{w}month_sum` / `lag_{w}month_avg`"""
+    return LagFeatureEngine(
+        group_columns, order_column, [value_column], lags=range(1, max_lag + 1), windows=windows,
+        lag_name='{column}_lag_{lag}', rolling_name='lag_{window}month_{stat}'
+    )
+
+
+def temperature_lag_engine(temp_columns, group_columns=('well_lat', 'well_lon'), order_column='time_dt',
+                             max_lag=6):
+    """Engine for `{var}_current` and `{var}_lag_1..max_lag` of each temperature variable"""
+    return LagFeatureEngine(
+        group_columns, order_column, temp_columns, lags=range(1, max_lag + 1),
+        lag_name='{column}_lag_{lag}', current_name='{column}_current'
+    )
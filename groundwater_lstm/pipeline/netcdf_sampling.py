@@ -0,0 +1,203 @@
+"""
+Sample gridded NetCDF variables at well locations without flattening the grid.
+
+The notebook turned every national IMDAA / PERSIANN / IMD grid into a
+DataFrame with `to_dataframe().reset_index()` and wrote it to a multi-GB CSV
+only to read it back and keep the few cells around Haryana's wells. Here the
+files are opened lazily with dask chunks, the nearest grid index of every well
+is computed once from the 1-D coordinate axes, and only the distinct cells
+that some well maps to are pulled with one pointwise (vectorized) `isel`.
+Values are materialized one time block at a time, so memory is bounded by
+`time_block x cells` however long the record is.
+
+`sample_grid_cells` returns the same long layout `to_dataframe()` produced
+(time, grid latitude, grid longitude, variables), restricted to the sampled
+cells, so downstream grid-cell code keeps working. `sample_at_wells` expands
+the cells to one row per (time, well).
+
+Fill values are only masked when asked for (`fill_values=`), per dataset:
+PERSIANN marks missing cells with -99 / -9999, while IMDAA APCP and the IMD
+grids are used as they are.
+"""
+import glob
+
+import numpy as np
+import pandas as pd
+
+LAT_NAMES = ('lat', 'latitude', 'LATITUDE', 'y')
+LON_NAMES = ('lon', 'longitude', 'LONGITUDE', 'x')
+TIME_NAMES = ('time', 'TIME', 't')
+DEFAULT_TIME_CHUNK = 366
+# Missing-data markers of the PERSIANN files (the values the notebook replaced with NA)
+PERSIANN_FILL_VALUES = (-99, -9999)
+
+
+def open_grid(paths, time_chunk=DEFAULT_TIME_CHUNK, **kwargs):
+    """Open one or more NetCDF files lazily, chunked along time"""
+    import xarray as xr
+
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths)) if any(ch in paths for ch in '*?[') else [paths]
+    if len(paths) == 1:
+        ds = xr.open_dataset(paths[0], chunks={}, **kwargs)
+    else:
+        ds = xr.open_mfdataset(paths, chunks={}, combine='by_coords', **kwargs)
+    # The time axis is named `time` in IMDAA / PERSIANN and `TIME` in the IMD grids
+    return ds.chunk({_coordinate_name(ds, TIME_NAMES): time_chunk})
+
+
+def _coordinate_name(ds, candidates):
+    for name in candidates:
+        if name in ds.coords or name in ds.dims:
+            return name
+    raise ValueError(f"None of the coordinates {candidates} found in dataset")
+
+
+def nearest_index(axis, values):
+    """Index of the nearest point on a 1-D, monotonic coordinate axis for each value"""
+    axis = np.asarray(axis, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if len(axis) == 1:
+        return np.zeros(len(values), dtype=np.int64)
+    descending = axis[0] > axis[-1]
+    ordered = axis[::-1] if descending else axis
+    pos = np.clip(np.searchsorted(ordered, values), 1, len(ordered) - 1)
+    left, right = ordered[pos - 1], ordered[pos]
+    index = np.where(values - left <= right - values, pos - 1, pos)
+    return len(ordered) - 1 - index if descending else index
+
+
+def map_points_to_cells(ds, lat, lon, max_distance=None):
+    """Nearest (lat_index, lon_index) per point, plus each point's distinct-cell number
+
+    Returns (cell_lat_index, cell_lon_index, point_cell) where the first two list
+    the distinct cells and `point_cell[i]` is the position of point i's cell
+    (-1 when it is farther than `max_distance` degrees along either axis).
+    """
+    lat_name = _coordinate_name(ds, LAT_NAMES)
+    lon_name = _coordinate_name(ds, LON_NAMES)
+    lat_axis = ds[lat_name].values
+    lon_axis = ds[lon_name].values
+    if lat_axis.ndim != 1 or lon_axis.ndim != 1:
+        raise ValueError("Only regular (1-D latitude/longitude) grids are supported")
+
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    lat_index = nearest_index(lat_axis, lat)
+    lon_index = nearest_index(lon_axis, lon)
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    if max_distance is not None:
+        valid &= (np.abs(lat_axis[lat_index] - lat) <= max_distance) & (np.abs(lon_axis[lon_index] - lon) <= max_distance)
+
+    flat = lat_index.astype(np.int64) * len(lon_axis) + lon_index
+    cells, point_cell = np.unique(flat[valid], return_inverse=True)
+    mapping = np.full(len(lat), -1, dtype=np.int64)
+    mapping[valid] = point_cell
+    return cells // len(lon_axis), cells % len(lon_axis), mapping
+
+
+def _time_variables(ds, variables):
+    """Requested variables, or every data variable with a time axis (skips e.g. `crs`)"""
+    if variables is not None:
+        return list(variables)
+    time_name = _coordinate_name(ds, TIME_NAMES)
+    return [name for name, var in ds.data_vars.items() if time_name in var.dims]
+
+
+def _iter_cell_blocks(ds, variables, cell_lat_index, cell_lon_index, time_block, fill_values):
+    """Yield (times, {variable: (time, cell) array}) blocks"""
+    import xarray as xr
+
+    lat_name = _coordinate_name(ds, LAT_NAMES)
+    lon_name = _coordinate_name(ds, LON_NAMES)
+    time_name = _coordinate_name(ds, TIME_NAMES)
+    # Pointwise selection: one entry per distinct cell instead of the lat x lon box
+    points = {
+        lat_name: xr.DataArray(cell_lat_index, dims='cell'),
+        lon_name: xr.DataArray(cell_lon_index, dims='cell'),
+    }
+    sampled = ds[list(variables)].isel(points)
+    n_times = sampled.sizes[time_name]
+    for start in range(0, n_times, time_block):
+        block = sampled.isel({time_name: slice(start, start + time_block)}).compute()
+        arrays = {}
+        for name in variables:
+            values = block[name].transpose(time_name, 'cell').values.astype(np.float64)
+            if fill_values:
+                values[np.isin(values, fill_values)] = np.nan
+            arrays[name] = values
+        yield block[time_name].values, arrays
+
+
+def sample_grid_cells(ds, variables, lat, lon, max_distance=None, time_block=DEFAULT_TIME_CHUNK,
+                      fill_values=None):
+    """Long (time, latitude, longitude, variables...) frame for the cells nearest the given points
+
+    Values equal to one of `fill_values` (e.g. `PERSIANN_FILL_VALUES`) become NaN.
+    """
+    variables = _time_variables(ds, variables)
+    lat_name = _coordinate_name(ds, LAT_NAMES)
+    lon_name = _coordinate_name(ds, LON_NAMES)
+    time_name = _coordinate_name(ds, TIME_NAMES)
+    cell_lat_index, cell_lon_index, _ = map_points_to_cells(ds, lat, lon, max_distance)
+    cell_lat = ds[lat_name].values[cell_lat_index]
+    cell_lon = ds[lon_name].values[cell_lon_index]
+    n_cells = len(cell_lat_index)
+
+    frames = []
+    for times, arrays in _iter_cell_blocks(ds, variables, cell_lat_index, cell_lon_index, time_block, fill_values):
+        frame = {
+            time_name: np.repeat(times, n_cells),
+            lat_name: np.tile(cell_lat, len(times)),
+            lon_name: np.tile(cell_lon, len(times)),
+        }
+        for name, values in arrays.items():
+            frame[name] = values.reshape(-1)
+        frames.append(pd.DataFrame(frame))
+    if not frames:
+        return pd.DataFrame(columns=[time_name, lat_name, lon_name] + list(variables))
+    return pd.concat(frames, ignore_index=True)
+
+
+def sample_at_wells(ds, variables, wells, lat_column='LATITUDE', lon_column='LONGITUDE', id_column=None,
+                    max_distance=None, time_block=DEFAULT_TIME_CHUNK, fill_values=None):
+    """Long (time, well, variables...) frame: each well gets its nearest cell's series
+
+    Wells are identified by `id_column` when given, otherwise by their
+    coordinates. Grid coordinates of the matched cell are included as
+    `grid_lat` / `grid_lon`. Wells outside `max_distance` are dropped.
+    `variables=None` samples every data variable with a time axis, and
+    values equal to one of `fill_values` become NaN.
+    """
+    variables = _time_variables(ds, variables)
+    lat_name = _coordinate_name(ds, LAT_NAMES)
+    lon_name = _coordinate_name(ds, LON_NAMES)
+    time_name = _coordinate_name(ds, TIME_NAMES)
+    key_columns = [id_column] if id_column else [lat_column, lon_column]
+    wells = wells.drop_duplicates(subset=key_columns).reset_index(drop=True)
+    cell_lat_index, cell_lon_index, well_cell = map_points_to_cells(
+        ds, wells[lat_column], wells[lon_column], max_distance
+    )
+    matched = well_cell >= 0
+    wells = wells[matched].reset_index(drop=True)
+    well_cell = well_cell[matched]
+    n_wells = len(wells)
+
+    well_keys = {column: wells[column].to_numpy() for column in key_columns}
+    grid_lat = ds[lat_name].values[cell_lat_index][well_cell]
+    grid_lon = ds[lon_name].values[cell_lon_index][well_cell]
+
+    frames = []
+    for times, arrays in _iter_cell_blocks(ds, variables, cell_lat_index, cell_lon_index, time_block, fill_values):
+        frame = {time_name: np.repeat(times, n_wells)}
+        for column, values in well_keys.items():
+            frame[column] = np.tile(values, len(times))
+        frame['grid_lat'] = np.tile(grid_lat, len(times))
+        frame['grid_lon'] = np.tile(grid_lon, len(times))
+        for name, values in arrays.items():
+            # Gather each well's cell column for the whole block at once
+            frame[name] = values[:, well_cell].reshape(-1)
+        frames.append(pd.DataFrame(frame))
+    if not frames:
+        return pd.DataFrame(columns=[time_name] + key_columns + ['grid_lat', 'grid_lon'] + list(variables))
+    return pd.concat(frames, ignore_index=True)
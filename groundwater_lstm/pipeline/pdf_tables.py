@@ -0,0 +1,386 @@
+"""
+Parallel, resumable table extraction from the CGWB water-level PDF.
+
+Replaces notebook cells 5-6 (fixed 20-page chunks through joblib, then an
+in-memory `pd.concat` of every chunk CSV):
+
+- Scheduling: page ranges are carved from the pages still to do only when a
+  worker becomes free, so fast workers simply take more ranges and nobody
+  idles behind a slow fixed batch. Range size adapts to the measured seconds
+  per page (aiming at `target_chunk_seconds`), and shrinks towards the end so
+  the tail is spread over all workers.
+- Failures: a failing range is split in half and retried, isolating bad
+  pages; a single page that still fails is recorded as failed. A worker
+  process dying (e.g. killed for memory) breaks the whole pool instead: the
+  pool is recreated and the ranges that were in flight are requeued as they
+  were, up to `max_pool_restarts` times.
+- Manifest: a SQLite database next to the chunk CSVs records every range with
+  its status, row count and the SHA-256 of its CSV. Reruns only extract pages
+  not covered by a finished range whose CSV still matches its hash. A changed
+  PDF invalidates the manifest.
+- Merge: chunk CSVs are streamed into the combined CSV in page order, a block
+  at a time, with their columns aligned to the union of all chunk headers
+  (what `pd.concat` produced) - memory does not grow with the PDF.
+
+Usage (from the repository root):
+    python -m groundwater_lstm.pipeline.pdf_tables data/january_wl_1994-2024-compressed.pdf \\
+        --output data/all_tables_combined.csv --workers 8
+"""
+import argparse
+import math
+import os
+import re
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import pandas as pd
+
+from .hashing import file_sha256
+
+MANIFEST_FILENAME = 'manifest.sqlite'
+CHUNK_PATTERN = re.compile(r'^tables_(\d+)_(\d+)\.csv$')
+MERGE_BLOCK_ROWS = 50000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    start_page INTEGER NOT NULL,
+    end_page   INTEGER NOT NULL,
+    status     TEXT NOT NULL,        -- done | empty | failed
+    n_tables   INTEGER,
+    n_rows     INTEGER,
+    file       TEXT,
+    sha256     TEXT,
+    seconds    REAL,
+    error      TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (start_page, end_page)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def chunk_filename(start, end):
+    return f"tables_{start}_{end}.csv"
+
+
+def count_pages(pdf_path):
+    """Number of pages in a PDF (camelot already depends on pypdf)"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_range(pdf_path, start, end, output_dir, flavor='stream'):
+    """Extract the tables of one page range into its chunk CSV (runs in a worker process)"""
+    import camelot
+
+    started = time.perf_counter()
+    tables = camelot.read_pdf(pdf_path, pages=f"{start}-{end}", flavor=flavor)
+    result = {'n_tables': tables.n, 'n_rows': 0, 'file': None, 'sha256': None}
+    if tables.n > 0:
+        combined = pd.concat([t.df for t in tables], ignore_index=True)
+        path = os.path.join(output_dir, chunk_filename(start, end))
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        combined.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        result.update(n_rows=len(combined), file=os.path.basename(path), sha256=file_sha256(path))
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+class ExtractionManifest:
+    """Page-range status and content hashes of one extraction run"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def reset(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks")
+
+    def record(self, start, end, status, n_tables=None, n_rows=None, file=None, sha256=None,
+               seconds=None, error=None):
+        with self.conn:
+            # A range that succeeds after splitting replaces the failure of its parent
+            self.conn.execute(
+                "DELETE FROM chunks WHERE status = 'failed' AND start_page <= ? AND end_page >= ?",
+                (end, start)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (start, end, status, n_tables, n_rows, file, sha256, seconds, error,
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+
+    def finished(self):
+        """Finished ranges as dicts, in page order"""
+        cursor = self.conn.execute(
+            "SELECT start_page, end_page, status, n_rows, file, sha256 FROM chunks "
+            "WHERE status IN ('done', 'empty') ORDER BY start_page"
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def forget(self, start, end):
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE start_page = ? AND end_page = ?", (start, end))
+
+
+def _adopt_legacy_chunks(manifest, output_dir):
+    """Register chunk CSVs written by the old notebook loop (it resumed on file existence)"""
+    for filename in sorted(os.listdir(output_dir)):
+        match = CHUNK_PATTERN.match(filename)
+        if match:
+            start, end = int(match.group(1)), int(match.group(2))
+            manifest.record(start, end, 'done', file=filename, sha256=file_sha256(os.path.join(output_dir, filename)))
+
+
+def _verified_ranges(manifest, output_dir):
+    """Finished ranges whose CSV still exists with the recorded hash; stale ones are forgotten"""
+    valid = []
+    for chunk in manifest.finished():
+        if chunk['file'] is not None:
+            path = os.path.join(output_dir, chunk['file'])
+            if not os.path.exists(path) or file_sha256(path) != chunk['sha256']:
+                manifest.forget(chunk['start_page'], chunk['end_page'])
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+        valid.append((chunk['start_page'], chunk['end_page']))
+    return valid
+
+
+def _missing_ranges(covered, total_pages):
+    """Page intervals in 1..total_pages not covered by `covered`"""
+    missing = []
+    next_page = 1
+    for start, end in sorted(covered):
+        if start > next_page:
+            missing.append((next_page, start - 1))
+        next_page = max(next_page, end + 1)
+    if next_page <= total_pages:
+        missing.append((next_page, total_pages))
+    return missing
+
+
+class _RangeScheduler:
+    """Carves page ranges off the pending intervals, sized from the observed speed"""
+
+    def __init__(self, pending, workers, initial_chunk_size, min_chunk_size, max_chunk_size, target_chunk_seconds):
+        self.pending = deque(pending)
+        self.workers = workers
+        self.initial_chunk_size = initial_chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_chunk_seconds = target_chunk_seconds
+        self.seconds_per_page = None
+
+    def remaining_pages(self):
+        return sum(end - start + 1 for start, end in self.pending)
+
+    def observe(self, pages, seconds):
+        rate = seconds / pages
+        # Moving average so one odd range does not swing the size
+        self.seconds_per_page = rate if self.seconds_per_page is None else 0.7 * self.seconds_per_page + 0.3 * rate
+
+    def chunk_size(self):
+        if self.seconds_per_page:
+            size = int(self.target_chunk_seconds / self.seconds_per_page)
+        else:
+            size = self.initial_chunk_size
+        # Guided scheduling: never take more than a share of what is left, so the
+        # last ranges are small and finish together
+        share = math.ceil(self.remaining_pages() / (2 * self.workers))
+        return max(self.min_chunk_size, min(size, share, self.max_chunk_size))
+
+    def push_front(self, start, end):
+        self.pending.appendleft((start, end))
+
+    def next_range(self):
+        start, end = self.pending[0]
+        stop = min(end, start + self.chunk_size() - 1)
+        if stop == end:
+            self.pending.popleft()
+        else:
+            self.pending[0] = (stop + 1, end)
+        return start, stop
+
+
+def extract_tables(pdf_path, output_dir='chunks', total_pages=None, workers=None, flavor='stream',
+                   initial_chunk_size=20, min_chunk_size=1, max_chunk_size=100, target_chunk_seconds=30.0,
+                   manifest_path=None, max_pool_restarts=3):
+    """Extract every PDF page not yet covered by the manifest; returns run metrics"""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = ExtractionManifest(manifest_path or os.path.join(output_dir, MANIFEST_FILENAME))
+    workers = workers or os.cpu_count() or 1
+    total_pages = total_pages or count_pages(pdf_path)
+
+    try:
+        pdf_hash = file_sha256(pdf_path)
+        if manifest.get_meta('pdf_sha256') not in (None, pdf_hash) or manifest.get_meta('flavor') not in (None, flavor):
+            print("⚠️ PDF or extraction settings changed, starting a fresh manifest")
+            manifest.reset()
+        elif manifest.get_meta('pdf_sha256') is None:
+            _adopt_legacy_chunks(manifest, output_dir)
+        manifest.set_meta('pdf_sha256', pdf_hash)
+        manifest.set_meta('flavor', flavor)
+
+        pending = _missing_ranges(_verified_ranges(manifest, output_dir), total_pages)
+        scheduler = _RangeScheduler(pending, workers, initial_chunk_size, min_chunk_size,
+                                    max_chunk_size, target_chunk_seconds)
+        todo_pages = scheduler.remaining_pages()
+        print(f"📊 {total_pages} pages, {total_pages - todo_pages} already extracted, {todo_pages} to do "
+              f"on {workers} workers")
+
+        metrics = {'pages_total': total_pages, 'pages_skipped': total_pages - todo_pages, 'pages_extracted': 0,
+                   'pages_failed': 0, 'chunks_done': 0, 'chunks_empty': 0, 'chunks_retried': 0,
+                   'pool_restarts': 0, 'failures': []}
+        started = time.perf_counter()
+        pool = ProcessPoolExecutor(max_workers=workers)
+        running = {}
+        try:
+            while scheduler.pending or running:
+                # Keep every worker busy; ranges are sized at hand-out time
+                while scheduler.pending and len(running) < workers:
+                    start, end = scheduler.next_range()
+                    future = pool.submit(extract_range, pdf_path, start, end, output_dir, flavor)
+                    running[future] = (start, end)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                pool_broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+                if pool_broken:
+                    # A dead worker takes every in-flight range down with it
+                    done, _ = wait(running)
+                requeued = []
+                for future in done:
+                    start, end = running.pop(future)
+                    pages = end - start + 1
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        # Not the range's fault: run it again on the new pool
+                        requeued.append((start, end))
+                        continue
+                    except Exception as e:
+                        if pages > 1:
+                            middle = (start + end) // 2
+                            scheduler.push_front(middle + 1, end)
+                            scheduler.push_front(start, middle)
+                            metrics['chunks_retried'] += 1
+                            print(f"🔁 Pages {start}-{end} failed ({e}), retrying as {start}-{middle} and {middle + 1}-{end}")
+                        else:
+                            manifest.record(start, end, 'failed', error=str(e))
+                            metrics['pages_failed'] += 1
+                            metrics['failures'].append({'pages': f"{start}-{end}", 'error': str(e)})
+                            print(f"❌ Page {start} failed: {e}")
+                        continue
+
+                    scheduler.observe(pages, result['seconds'])
+                    status = 'done' if result['file'] else 'empty'
+                    manifest.record(start, end, status, **result)
+                    metrics['pages_extracted'] += pages
+                    metrics['chunks_done' if status == 'done' else 'chunks_empty'] += 1
+                    elapsed = time.perf_counter() - started
+                    print(f"✅ Pages {start}-{end}: {result['n_tables']} tables, {result['n_rows']} rows "
+                          f"({metrics['pages_extracted']}/{todo_pages}, {metrics['pages_extracted'] / elapsed:.2f} pages/s)")
+
+                if pool_broken:
+                    metrics['pool_restarts'] += 1
+                    if metrics['pool_restarts'] > max_pool_restarts:
+                        raise RuntimeError(f"Worker processes died {metrics['pool_restarts']} times; "
+                                           f"pages {sorted(requeued)} were in flight")
+                    for start, end in sorted(requeued, reverse=True):
+                        scheduler.push_front(start, end)
+                    print(f"💥 A worker process died, restarting the pool and requeuing {len(requeued)} ranges")
+                    pool.shutdown(wait=True)
+                    pool = ProcessPoolExecutor(max_workers=workers)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        metrics['seconds'] = time.perf_counter() - started
+        metrics['pages_per_second'] = metrics['pages_extracted'] / metrics['seconds'] if metrics['seconds'] else 0.0
+        print(f"📈 Extracted {metrics['pages_extracted']} pages in {metrics['seconds']:.1f}s "
+              f"({metrics['pages_per_second']:.2f} pages/s), {metrics['pages_failed']} failed pages, "
+              f"{metrics['chunks_retried']} split retries")
+        return metrics
+    finally:
+        manifest.close()
+
+
+def merge_chunks(output_dir='chunks', output_file='all_tables_combined.csv', manifest_path=None,
+                 block_rows=MERGE_BLOCK_ROWS):
+    """Stream finished chunk CSVs, in page order, into one combined CSV"""
+    manifest = ExtractionManifest(manifest_path or os.path.join(output_dir, MANIFEST_FILENAME))
+    try:
+        chunks = [c for c in manifest.finished() if c['file'] is not None]
+    finally:
+        manifest.close()
+
+    paths = []
+    columns = []
+    seen = set()
+    for chunk in chunks:
+        path = os.path.join(output_dir, chunk['file'])
+        if file_sha256(path) != chunk['sha256']:
+            raise ValueError(f"{chunk['file']} does not match its manifest hash; rerun extract_tables")
+        paths.append(path)
+        # Union of headers in order of appearance, as pd.concat aligned them
+        for column in pd.read_csv(path, nrows=0).columns:
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+
+    tmp_file = f"{output_file}.tmp-{os.getpid()}"
+    n_rows = 0
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        for path in paths:
+            # Cells stay text so nothing is reformatted on the way through
+            for block in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=block_rows):
+                block.reindex(columns=columns).to_csv(out, index=False, header=False)
+                n_rows += len(block)
+    os.replace(tmp_file, output_file)
+
+    print(f"✅ Merged {len(paths)} chunk CSVs ({n_rows} rows, {len(columns)} columns) into {output_file}")
+    return {'files': len(paths), 'rows': n_rows, 'columns': len(columns)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract water-level tables from the CGWB PDF")
+    parser.add_argument('pdf_path')
+    parser.add_argument('--output', default='all_tables_combined.csv', help="Combined CSV to write")
+    parser.add_argument('--chunks-dir', default='chunks', help="Directory for chunk CSVs and the manifest")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--pages', type=int, default=None, help="Page count (read from the PDF by default)")
+    parser.add_argument('--target-seconds', type=float, default=30.0, help="Target duration of one range")
+    args = parser.parse_args()
+
+    extract_tables(args.pdf_path, args.chunks_dir, total_pages=args.pages, workers=args.workers,
+                   target_chunk_seconds=args.target_seconds)
+    merge_chunks(args.chunks_dir, args.output)
+
+
+if __name__ == '__main__':
+    main()
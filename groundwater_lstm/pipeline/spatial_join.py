@@ -0,0 +1,102 @@
+"""
+Nearest-grid-cell join of point observations against a gridded daily series.
+
+Notebook cell 32 looped over every groundwater `Date` and called
+`gpd.sjoin_nearest` with that day's rainfall points, rebuilding a spatial
+index per day. The rainfall grid does not move, so here one KD-tree is built
+over the distinct grid coordinates, every distinct well location is mapped to
+its nearest cell once, and the time dimension is attached with a hash join on
+(cell_id, date).
+
+Like the per-day loop, point rows keep their columns, grid columns that share
+a name get `_left` / `_right` suffixes, wells farther than `max_distance` get
+NaN grid values, and dates with no grid rows at all are dropped. Unlike
+`sjoin_nearest`, equidistant cells do not duplicate a row: the KD-tree's
+nearest cell is used. The grid is assumed static - a cell missing on a date
+yields NaN rather than falling back to the next-nearest cell.
+"""
+import numpy as np
+import pandas as pd
+
+DATE_KEY = '_join_date'
+CELL_KEY = 'cell_id'
+
+
+class GridIndex:
+    """KD-tree over the distinct (lat, lon) points of a grid, in degrees"""
+
+    def __init__(self, lat, lon):
+        from scipy.spatial import cKDTree
+
+        codes, uniques = pd.factorize(
+            pd.MultiIndex.from_arrays([np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)])
+        )
+        self.cell_of_row = codes
+        self.lat = uniques.get_level_values(0).to_numpy()
+        self.lon = uniques.get_level_values(1).to_numpy()
+        # (lon, lat) order matches the x/y planar distance sjoin_nearest uses on EPSG:4326
+        self._tree = cKDTree(np.column_stack([self.lon, self.lat]))
+
+    def __len__(self):
+        return len(self.lat)
+
+    def query(self, lat, lon, max_distance=None):
+        """(cell_id, distance) of the nearest cell per point; -1 / NaN beyond `max_distance`"""
+        points = np.column_stack([np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)])
+        cells = np.full(len(points), -1, dtype=np.int64)
+        distances = np.full(len(points), np.nan)
+        finite = np.isfinite(points).all(axis=1)
+        if not finite.any() or not len(self):
+            return cells, distances
+
+        bound = np.inf if max_distance is None else max_distance
+        found_dist, found_cell = self._tree.query(points[finite], distance_upper_bound=bound)
+        hit = np.isfinite(found_dist)
+        index = np.flatnonzero(finite)[hit]
+        cells[index] = found_cell[hit]
+        distances[index] = found_dist[hit]
+        return cells, distances
+
+
+def join_nearest_by_date(points, grid, lat_column='Latitude', lon_column='Longitude', date_column='Date',
+                         grid_lat_column=None, grid_lon_column=None, grid_date_column=None,
+                         max_distance=None, distance_column='distance', suffixes=('_left', '_right')):
+    """Attach each point row to the same-date row of its nearest grid cell
+
+    One tree query per distinct point location plus one (cell_id, date) merge;
+    returns a plain DataFrame in the order of `points`.
+    """
+    grid_lat_column = grid_lat_column or lat_column
+    grid_lon_column = grid_lon_column or lon_column
+    grid_date_column = grid_date_column or date_column
+
+    index = GridIndex(grid[grid_lat_column], grid[grid_lon_column])
+
+    # Distinct well locations are queried once, however many dates they have
+    locations = pd.MultiIndex.from_arrays([points[lat_column].to_numpy(dtype=float),
+                                           points[lon_column].to_numpy(dtype=float)])
+    location_codes, unique_locations = pd.factorize(locations)
+    cells, distances = index.query(
+        unique_locations.get_level_values(0), unique_locations.get_level_values(1), max_distance
+    )
+    point_cells = np.where(location_codes >= 0, cells[location_codes], -1)
+    point_distances = np.where(location_codes >= 0, distances[location_codes], np.nan)
+
+    # The per-day loop skipped dates without any grid rows
+    grid_dates = grid[grid_date_column]
+    keep = points[date_column].isin(grid_dates).to_numpy()
+
+    left = points.loc[keep].copy()
+    left[CELL_KEY] = point_cells[keep]
+    left[DATE_KEY] = left[date_column]
+    if distance_column:
+        left[distance_column] = point_distances[keep]
+    right = grid.copy()
+    right[CELL_KEY] = index.cell_of_row
+    right[DATE_KEY] = grid_dates
+
+    merged = left.merge(right, on=[CELL_KEY, DATE_KEY], how='left', suffixes=suffixes, sort=False)
+    # Wells beyond max_distance carry no cell
+    merged[CELL_KEY] = merged[CELL_KEY].where(merged[CELL_KEY] >= 0)
+    return merged.drop(columns=[DATE_KEY])
+
@@ -0,0 +1,168 @@
+"""
+Single-pass multi-state partitioning of the combined water-level extract.
+
+Replaces notebook cell 15, which scanned every cell of every row with a
+row-wise `apply(... str.contains("Haryana") ...)`. Here the extract is read
+in blocks and only the state column is tested: each block's state values are
+factorized, the (few) distinct values are matched against the requested
+states once, and the codes map every row to its state in one vectorized step.
+Rows are appended to one output per state (CSV or Parquet) as blocks stream
+through, so the national table is read once and never held in memory.
+
+Cells are kept as text, exactly as extracted, for the cleaning steps that
+follow.
+
+Usage (from the repository root):
+    python -m groundwater_lstm.pipeline.state_partition data/all_tables_combined.csv \\
+        Haryana Punjab Rajasthan --output-dir data/states --format parquet
+"""
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+BLOCK_ROWS = 200000
+FORMATS = ('csv', 'parquet')
+
+
+def state_slug(state):
+    return re.sub(r'[^a-z0-9]+', '_', state.strip().lower()).strip('_')
+
+
+def _match_states(values, states):
+    """State label (or None) for each distinct cell value, case-insensitive substring match"""
+    lowered = [(state, state.lower()) for state in states]
+    labels = []
+    for value in values:
+        text = str(value).lower()
+        labels.append(next((state for state, key in lowered if key in text), None))
+    return labels
+
+
+def _label_rows(column, states):
+    """Vectorized: state index per row (-1 for rows of other states)"""
+    codes, uniques = pd.factorize(column)
+    labels = _match_states(uniques, states)
+    lookup = np.array([states.index(label) if label is not None else -1 for label in labels] + [-1])
+    # factorize uses -1 for missing values, which lands on the trailing -1
+    return lookup[codes]
+
+
+def detect_state_column(block, states):
+    """Column whose values match the requested states most often (first column on a tie)
+
+    Raises ValueError when no value in the block names any of the states.
+    """
+    best, best_hits = None, 0
+    for column in block.columns:
+        hits = int((_label_rows(block[column], states) >= 0).sum())
+        if hits > best_hits:
+            best, best_hits = column, hits
+    if best is None:
+        raise ValueError(f"No column of the block mentions any of {states}")
+    return best
+
+
+class _StateWriter:
+    """Appends blocks of one state to its CSV or Parquet file"""
+
+    def __init__(self, path, file_format):
+        self.path = path
+        self.format = file_format
+        self.tmp_path = f"{path}.tmp-{os.getpid()}"
+        self.rows = 0
+        self._writer = None
+        self._file = None
+
+    def write(self, block):
+        if self.format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            self._writer.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.tmp_path, 'w', newline='', encoding='utf-8')
+                block.iloc[:0].to_csv(self._file, index=False)
+            block.to_csv(self._file, index=False, header=False)
+        self.rows += len(block)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.replace(self.tmp_path, self.path)
+
+
+def partition_states(input_csv, states, output_dir='.', file_format='csv', state_column=None,
+                     block_rows=BLOCK_ROWS):
+    """Split a national extract into one file per state in a single pass
+
+    `state_column` defaults to the column that matches the requested states
+    most often in the first block where any of them appears (blocks before
+    it hold no rows of those states). Raises ValueError if no column ever
+    matches, or if an explicit `state_column` is not in the header.
+    Returns {state: {'path', 'rows'}}.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported format {file_format!r}; use one of {FORMATS}")
+    states = list(states)
+    os.makedirs(output_dir, exist_ok=True)
+    extension = 'parquet' if file_format == 'parquet' else 'csv'
+    writers = {
+        state: _StateWriter(os.path.join(output_dir, f"{state_slug(state)}_data.{extension}"), file_format)
+        for state in states
+    }
+
+    total_rows = 0
+    try:
+        blocks = pd.read_csv(input_csv, dtype=str, keep_default_na=False, chunksize=block_rows)
+        for block in blocks:
+            if state_column is None:
+                try:
+                    state_column = detect_state_column(block, states)
+                except ValueError:
+                    total_rows += len(block)
+                    continue
+                print(f"📊 Matching states on column {state_column!r}")
+            elif state_column not in block.columns:
+                raise ValueError(f"Column {state_column!r} not in {input_csv}: {list(block.columns)}")
+            labels = _label_rows(block[state_column], states)
+            for index in np.unique(labels[labels >= 0]):
+                writers[states[index]].write(block[labels == index])
+            total_rows += len(block)
+        if state_column is None:
+            raise ValueError(f"No column of {input_csv} mentions any of {states}; pass state_column "
+                             f"(--state-column) explicitly")
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    result = {}
+    for state, writer in writers.items():
+        result[state] = {'path': writer.path if writer.rows else None, 'rows': writer.rows}
+        print(f"✅ {state}: {writer.rows} rows" + (f" → {writer.path}" if writer.rows else ""))
+    print(f"📈 Scanned {total_rows} rows once for {len(states)} states")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partition the combined water-level extract by state")
+    parser.add_argument('input_csv')
+    parser.add_argument('states', nargs='+')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--state-column', default=None)
+    args = parser.parse_args()
+    partition_states(args.input_csv, args.states, args.output_dir, args.format, args.state_column)
+
+
+if __name__ == '__main__':
+    main()
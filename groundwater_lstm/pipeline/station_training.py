@@ -0,0 +1,256 @@
+"""
+Parallel, resumable per-station Random Forest training.
+
+`build_simple_station_models` (notebook cell 103) looped over
+`groupby(['DISTRICT', 'VILLAGE'])` and fitted one small forest per station,
+one after another. Here the feature and target columns are copied once into
+a float64 block in shared memory, ordered so every station is a contiguous
+row range. Worker processes attach to that block when they start, so each
+task is just (row range, test size) - the frame is never pickled per worker.
+Stations are fitted across a process pool, and every finished station is
+appended to the results CSV straight away.
+
+Every result row carries a fingerprint of the run: a hash of the input rows,
+the feature list, the target and the fit settings. With `resume=True` a rerun
+skips the stations already in the results CSV with the same fingerprint, so an
+interrupted run continues where it stopped. Rows from a run with other inputs
+or parameters are dropped and refitted rather than returned as stale metrics.
+Without `resume` the CSV is started afresh. When all stations are done the CSV
+is rewritten in groupby order, so the final file does not depend on
+completion order. Each fit uses the same seeds and the same row order as the
+serial loop, so the metrics match it exactly.
+"""
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .hashing import frame_sha256
+
+TARGET_COLUMN = 'WL (in mbgl)'
+RESULT_COLUMNS = ['records', 'train_r2', 'test_r2', 'test_rmse', 'test_mae', 'test_samples',
+                  'top_feature', 'top_importance']
+STATION_MODEL_PARAMS = dict(n_estimators=50, max_depth=6, min_samples_split=5, min_samples_leaf=3, random_state=42)
+SPLIT_SEED = 42
+
+# Worker-side view of the shared block, set up once per process
+_worker = {}
+
+
+def station_test_size(n_records):
+    """Hold-out fraction used by the station models"""
+    return 0.3 if n_records < 50 else 0.25
+
+
+def _attach(name, shape, feature_names, model_params, keep_predictions):
+    # Pool workers share the parent's resource tracker, which unlinks the segment once
+    block = shared_memory.SharedMemory(name=name)
+    _worker.update(
+        block=block,
+        data=np.ndarray(shape, dtype=np.float64, buffer=block.buf),
+        feature_names=feature_names,
+        model_params=model_params,
+        keep_predictions=keep_predictions,
+    )
+
+
+def _fit_rows(start, stop, test_size):
+    """Fit one station on rows [start, stop) of the shared block"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    from sklearn.model_selection import train_test_split
+
+    rows = _worker['data'][start:stop]
+    X, y = rows[:, :-1], rows[:, -1]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=SPLIT_SEED)
+
+    rf = RandomForestRegressor(n_jobs=1, **_worker['model_params'])
+    rf.fit(X_train, y_train)
+    y_pred_test = rf.predict(X_test)
+    y_pred_train = rf.predict(X_train)
+
+    importances = rf.feature_importances_
+    top = int(np.argmax(importances))
+    result = {
+        'records': stop - start,
+        'train_r2': r2_score(y_train, y_pred_train),
+        'test_r2': r2_score(y_test, y_pred_test),
+        'test_rmse': np.sqrt(mean_squared_error(y_test, y_pred_test)),
+        'test_mae': mean_absolute_error(y_test, y_pred_test),
+        'test_samples': len(y_test),
+        'top_feature': _worker['feature_names'][top],
+        'top_importance': importances[top],
+    }
+    predictions = (y_test, y_pred_test) if _worker['keep_predictions'] else None
+    return result, predictions
+
+
+def _fit_task(task):
+    index, start, stop, test_size = task
+    try:
+        return index, *_fit_rows(start, stop, test_size), None
+    except Exception as exc:  # a failing station is skipped, as in the serial loop
+        return index, None, None, repr(exc)
+
+
+def _station_blocks(df, feature_names, target, group_columns, min_records, groups):
+    """Clean rows ordered by station plus (keys, start, stop) of each station with enough data"""
+    group_codes = df.groupby(group_columns, sort=True).ngroup().to_numpy()
+    values = df[feature_names + [target]].to_numpy(dtype=np.float64)
+    keep = (group_codes >= 0) & ~np.isnan(values).any(axis=1)
+    if groups is not None:
+        wanted = pd.MultiIndex.from_frame(df[group_columns]).isin(
+            pd.MultiIndex.from_tuples([g if isinstance(g, tuple) else (g,) for g in groups])
+        )
+        keep &= wanted
+
+    rows = np.flatnonzero(keep)
+    # Stable: within a station, rows stay in file order (same split as the loop)
+    rows = rows[np.argsort(group_codes[rows], kind='stable')]
+    codes = group_codes[rows]
+    boundaries = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True]) if len(rows) else np.array([0])
+
+    stations = []
+    for start, stop in zip(boundaries[:-1], boundaries[1:]):
+        if stop - start >= min_records:
+            keys = tuple(df[column].iloc[rows[start]] for column in group_columns)
+            stations.append((keys, int(start), int(stop)))
+    return values[rows], stations
+
+
+def _station_id(keys):
+    return '-'.join(str(key) for key in keys)
+
+
+def run_fingerprint(df, feature_names, target, group_columns, min_records, model_params, test_size):
+    """Hash of what the station metrics depend on: input rows, features, target and fit settings"""
+    settings = {
+        'features': list(feature_names),
+        'target': target,
+        'group_columns': list(group_columns),
+        'min_records': min_records,
+        'model_params': model_params,
+        'split_seed': SPLIT_SEED,
+        'test_size': f"{test_size.__module__}.{test_size.__qualname__}" if callable(test_size) else test_size,
+    }
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode())
+    digest.update(frame_sha256(df[list(group_columns) + list(feature_names) + [target]]).encode())
+    return digest.hexdigest()[:16]
+
+
+def _completed_stations(results_csv, fingerprint):
+    """Stations already in `results_csv` for this fingerprint; rows of other runs are removed"""
+    if not os.path.exists(results_csv):
+        return set()
+    existing = pd.read_csv(results_csv, dtype={'station_id': str})
+    if 'fingerprint' in existing.columns:
+        current = (existing['fingerprint'].astype(str) == fingerprint).to_numpy()
+    else:
+        current = np.zeros(len(existing), dtype=bool)
+    if not current.all():
+        print(f"♻️  {(~current).sum()} rows of {results_csv} come from other inputs or parameters; refitting them")
+        if current.any():
+            tmp_path = f"{results_csv}.tmp-{os.getpid()}"
+            existing[current].to_csv(tmp_path, index=False)
+            os.replace(tmp_path, results_csv)
+        else:
+            os.remove(results_csv)
+    return set(existing.loc[current, 'station_id'])
+
+
+def train_station_models(df, feature_names, target=TARGET_COLUMN, group_columns=('DISTRICT', 'VILLAGE'),
+                         min_records=20, model_params=None, test_size=station_test_size, results_csv=None,
+                         resume=False, max_workers=None, groups=None, keep_predictions=False):
+    """Fit one Random Forest per station in parallel
+
+    `test_size` is a fraction or a function of the station's clean row count.
+    `groups` optionally restricts training to those key tuples. With
+    `results_csv`, finished stations are appended as they complete; with
+    `resume` as well, stations already in the file for the same
+    `run_fingerprint` are skipped, otherwise the file is started afresh.
+    Returns (results, predictions) where results holds one row per station
+    in groupby order (key columns lowercased, plus `station_id` and
+    `fingerprint`) and predictions maps station_id to
+    (y_test, y_pred) when `keep_predictions` is set.
+    """
+    group_columns = list(group_columns)
+    feature_names = list(feature_names)
+    model_params = dict(STATION_MODEL_PARAMS if model_params is None else model_params)
+    key_names = [column.lower() for column in group_columns]
+    columns = key_names + ['station_id'] + RESULT_COLUMNS + ['fingerprint']
+    fingerprint = run_fingerprint(df, feature_names, target, group_columns, min_records, model_params, test_size)
+
+    data, stations = _station_blocks(df, feature_names, target, group_columns, min_records, groups)
+    if results_csv and not resume and os.path.exists(results_csv):
+        os.remove(results_csv)
+    done = _completed_stations(results_csv, fingerprint) if results_csv else set()
+    pending = [i for i, (keys, _, _) in enumerate(stations) if _station_id(keys) not in done]
+    print(f"🏭 {len(stations)} stations with ≥{min_records} clean records; "
+          f"{len(stations) - len(pending)} already done, {len(pending)} to fit")
+
+    tasks = [
+        (i, stations[i][1], stations[i][2],
+         test_size(stations[i][2] - stations[i][1]) if callable(test_size) else test_size)
+        for i in pending
+    ]
+    rows = []
+    predictions = {}
+    failures = 0
+
+    out_file = writer = None
+    if results_csv:
+        new_file = not os.path.exists(results_csv)
+        out_file = open(results_csv, 'a', newline='', encoding='utf-8')
+        writer = csv.DictWriter(out_file, fieldnames=columns)
+        if new_file:
+            writer.writeheader()
+
+    block = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    try:
+        np.ndarray(data.shape, dtype=np.float64, buffer=block.buf)[:] = data
+        initargs = (block.name, data.shape, feature_names, model_params, keep_predictions)
+        max_workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach, initargs=initargs) as pool:
+            # Largest stations first keeps the pool busy at the tail of the run
+            ordered = sorted(tasks, key=lambda task: task[2] - task[1], reverse=True)
+            futures = [pool.submit(_fit_task, task) for task in ordered]
+            for future in as_completed(futures):
+                index, result, station_predictions, error = future.result()
+                if result is None:
+                    failures += 1
+                    continue
+                keys = stations[index][0]
+                row = dict(zip(key_names, keys), station_id=_station_id(keys), **result, fingerprint=fingerprint)
+                rows.append(row)
+                if writer:
+                    writer.writerow(row)
+                    out_file.flush()
+                if station_predictions is not None:
+                    predictions[row['station_id']] = station_predictions
+    finally:
+        block.close()
+        block.unlink()
+        if out_file:
+            out_file.close()
+
+    # With a results CSV, earlier runs' stations are part of the result too
+    results = (pd.read_csv(results_csv, dtype={'station_id': str, 'fingerprint': str}) if results_csv
+               else pd.DataFrame(rows, columns=columns))
+
+    # Groupby order, independent of completion order
+    order = {_station_id(keys): i for i, (keys, _, _) in enumerate(stations)}
+    results = (results.assign(_order=results['station_id'].astype(str).map(order))
+               .sort_values('_order', kind='stable').drop(columns='_order').reset_index(drop=True))
+    if results_csv:
+        tmp_path = f"{results_csv}.tmp-{os.getpid()}"
+        results.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, results_csv)
+
+    print(f"✅ Fitted {len(tasks) - failures} stations on {max_workers} workers"
+          + (f" ({failures} failed)" if failures else ""))
+    return results, predictions
@@ -0,0 +1,224 @@
+"""
+Temperature series at well locations from the combined IMDAA table.
+
+The notebook's `extract_temperature_at_wells` (cell 98) found each well's
+nearest grid point with a KD-tree, then looped over the wells with
+`iterrows()` and filtered the whole IMDAA table with a float-equality mask per
+well before one big `pd.concat` - O(wells x rows). Here every IMDAA row gets
+an integer grid-cell code once (`pd.factorize` over the coordinate pairs, in
+the same first-appearance order the KD-tree is built from), the rows are
+grouped by cell with one stable argsort, and the output is a single
+fancy-indexed gather: each well takes the row range of its cell.
+
+The returned frames are the same as the notebook's: IMDAA rows of each well's
+cell in well order (rows in file order within a cell), with `well_lat`,
+`well_lon` and `distance_km` appended, plus the well-to-grid mapping.
+
+`create_temperature_lags` builds the `{variable}_current` / `{variable}_lag_k`
+features of the multi-level table with the shared lag engine
+(`lag_features.temperature_lag_engine`), and `merge_temperature_lags` attaches
+them to the groundwater rows on integer (well_id, year-month) keys.
+"""
+import numpy as np
+import pandas as pd
+
+from .keys import WellRegistry, join_on_keys, year_month_code
+from .lag_features import temperature_lag_engine
+
+KM_PER_DEGREE = 111
+OUTPUT_FILE = 'temperature_at_well_locations.csv'
+
+
+def _cell_codes(lat, lon):
+    """Grid-cell code per row and the distinct (lat, lon) cells, in first-appearance order"""
+    lat_codes, lat_values = pd.factorize(np.asarray(lat))
+    lon_codes, lon_values = pd.factorize(np.asarray(lon))
+    # Pair codes as one integer instead of factorizing tuples
+    flat = np.where((lat_codes < 0) | (lon_codes < 0), -1, lat_codes.astype(np.int64) * len(lon_values) + lon_codes)
+    codes, cells = pd.factorize(flat, use_na_sentinel=False)
+    if (flat < 0).any():
+        # Rows with missing coordinates belong to no cell
+        missing = int(np.flatnonzero(cells < 0)[0])
+        cells = np.delete(cells, missing)
+        codes = np.where(codes == missing, -1, codes - (codes > missing))
+    return codes, np.asarray(lat_values)[cells // len(lon_values)], np.asarray(lon_values)[cells % len(lon_values)]
+
+
+def _rows_by_cell(codes, n_cells):
+    """Row numbers grouped by cell (file order within a cell) and each cell's [start, stop) offsets"""
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    offsets = np.zeros(n_cells + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[codes >= 0], minlength=n_cells), out=offsets[1:])
+    return order, offsets
+
+
+def _gather_ranges(order, offsets, cells):
+    """Concatenation of `order[offsets[c]:offsets[c + 1]]` for each c in `cells`, without a loop"""
+    starts = offsets[cells]
+    counts = offsets[cells + 1] - starts
+    total = int(counts.sum())
+    # Position within each range, shifted to that range's start in `order`
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return order[np.arange(total) + shift], counts
+
+
+def extract_temperature_at_wells(imdaa_csv_file, gw_df, output_file=OUTPUT_FILE):
+    """
+    Extract temperature data at well locations from combined IMDAA CSV
+
+    `imdaa_csv_file` may also be an already loaded DataFrame. Returns
+    (all_temp_data, mapping_df); the extracted rows are also written to
+    `output_file` unless it is None.
+    """
+    from scipy.spatial import cKDTree
+
+    print("EXTRACTING TEMPERATURE AT WELL LOCATIONS")
+    print("=" * 45)
+
+    if isinstance(imdaa_csv_file, pd.DataFrame):
+        imdaa_data = imdaa_csv_file
+    else:
+        print("Loading combined IMDAA temperature data...")
+        imdaa_data = pd.read_csv(imdaa_csv_file)
+    print(f"IMDAA data shape: {imdaa_data.shape}")
+    print(f"Time range: {imdaa_data['time'].min()} to {imdaa_data['time'].max()}")
+
+    well_locations = gw_df[['LATITUDE', 'LONGITUDE']].drop_duplicates()
+    print(f"Unique well locations: {len(well_locations)}")
+
+    # Integer cell key per IMDAA row; cells are in drop_duplicates() order
+    codes, grid_lat, grid_lon = _cell_codes(imdaa_data['latitude'], imdaa_data['longitude'])
+    n_cells = len(grid_lat)
+    print(f"IMDAA grid points: {n_cells}")
+
+    print("Finding nearest IMDAA grid points for wells...")
+    well_lat = well_locations['LATITUDE'].to_numpy(dtype=float)
+    well_lon = well_locations['LONGITUDE'].to_numpy(dtype=float)
+    tree = cKDTree(np.column_stack([grid_lat, grid_lon]))
+    distances, indices = tree.query(np.column_stack([well_lat, well_lon]))
+    print(f"Average distance to nearest grid: {distances.mean():.3f}° ({distances.mean() * KM_PER_DEGREE:.1f} km)")
+
+    # Wells with missing coordinates have no nearest cell (index == n_cells)
+    found = indices < n_cells
+    mapping_df = pd.DataFrame({
+        'well_lat': well_lat[found],
+        'well_lon': well_lon[found],
+        'imdaa_lat': grid_lat[indices[found]],
+        'imdaa_lon': grid_lon[indices[found]],
+        'distance_km': distances[found] * KM_PER_DEGREE,
+    })
+
+    print("Extracting temperature time series...")
+    order, offsets = _rows_by_cell(codes, n_cells)
+    rows, counts = _gather_ranges(order, offsets, indices[found])
+    all_temp_data = imdaa_data.iloc[rows].reset_index(drop=True)
+    all_temp_data['well_lat'] = np.repeat(mapping_df['well_lat'].to_numpy(), counts)
+    all_temp_data['well_lon'] = np.repeat(mapping_df['well_lon'].to_numpy(), counts)
+    all_temp_data['distance_km'] = np.repeat(mapping_df['distance_km'].to_numpy(), counts)
+
+    print(f"Extracted temperature data shape: {all_temp_data.shape}")
+    print(f"Time coverage: {all_temp_data['time'].min()} to {all_temp_data['time'].max()}")
+
+    if output_file:
+        all_temp_data.to_csv(output_file, index=False)
+        print(f"Saved to: {output_file}")
+    print("Temperature extraction complete!")
+
+    return all_temp_data, mapping_df
+
+
+# Multi-level columns as pivoted by the pressure-level extraction (double suffix)
+TEMPERATURE_COLUMNS = [
+    f'{stat}_{level}_K_{level}'
+    for stat in ('tmax', 'tmin', 'tmean')
+    for level in ('surface', 'boundary_layer', 'free_atmosphere', 'mid_troposphere')
+]
+
+
+def create_temperature_lags(temp_csv_file, max_lag_months=6, temp_columns=None):
+    """
+    Create temperature lag features (`_current`, `_lag_1..max_lag_months`)
+
+    Same output as the notebook's `create_temperature_lags_correctly_fixed`:
+    rows sorted by (well_lat, well_lon, time) with a `time_dt` column, lags
+    shifted within each well. `temp_csv_file` may also be a loaded DataFrame.
+    """
+    print("CREATING TEMPERATURE LAGS WITH CORRECT COLUMN NAMES")
+    print("=" * 50)
+
+    if isinstance(temp_csv_file, pd.DataFrame):
+        temp_data = temp_csv_file.copy()
+    else:
+        temp_data = pd.read_csv(temp_csv_file)
+    print(f"Temperature data shape: {temp_data.shape}")
+
+    temp_data['time_dt'] = pd.to_datetime(temp_data['time'])
+    temp_data = temp_data.sort_values(['well_lat', 'well_lon', 'time_dt'])
+
+    temp_columns = temp_columns or TEMPERATURE_COLUMNS
+    print(f"Temperature variables to create lags for: {len(temp_columns)}")
+
+    # All variables and lags in one sorted 2-D shift, attached in one concat
+    temp_data = temperature_lag_engine(temp_columns, max_lag=max_lag_months).fit_transform(temp_data)
+
+    print("\nLag coverage check:")
+    for col in [f'{temp_columns[0]}_lag_{lag}' for lag in range(1, min(max_lag_months, 3) + 1)]:
+        coverage = temp_data[col].notna().sum()
+        print(f"  {col}: {coverage:,}/{len(temp_data):,} ({coverage / len(temp_data) * 100:.1f}%)")
+
+    print("\nTemperature lag creation complete!")
+    print(f"Dataset shape: {temp_data.shape}")
+
+    return temp_data
+
+
+def _lag_columns(columns, max_lag_months=6):
+    suffixes = ('_current',) + tuple(f'_lag_{lag}' for lag in range(1, max_lag_months + 1))
+    return [column for column in columns if column.endswith(suffixes)]
+
+
+def merge_temperature_lags(gw_df, temp_with_lags, registry=None, max_lag_months=6):
+    """
+    Merge the temperature lag features onto the groundwater rows
+
+    Same rows and columns as the notebook's `merge_correct_temperature_lags`,
+    which joined on 4-decimal rounded float coordinates and 'YYYY-MM' strings.
+    Both sides get int32 well IDs (from `registry`, a shared `WellRegistry`
+    when given) and int32 month codes instead, and the lags are looked up with
+    one integer-keyed join.
+    """
+    print("\nMERGING TEMPERATURE LAGS WITH GROUNDWATER")
+    print("=" * 45)
+
+    registry = registry or WellRegistry()
+    lag_columns = _lag_columns(temp_with_lags.columns, max_lag_months)
+    print(f"Merging {len(lag_columns)} temperature lag features")
+
+    gw_keys = [
+        registry.assign(gw_df['LATITUDE'], gw_df['LONGITUDE']),
+        year_month_code(gw_df['date']),
+    ]
+    temp_keys = [
+        registry.assign(temp_with_lags['well_lat'], temp_with_lags['well_lon']),
+        year_month_code(temp_with_lags['month_period']),
+    ]
+    merged = join_on_keys(gw_df, temp_with_lags, gw_keys, temp_keys, columns=lag_columns)
+    merged = merged.reset_index(drop=True)
+
+    print("\nMerge complete!")
+    print(f"Final dataset shape: {merged.shape}")
+
+    print("Key feature coverage:")
+    key_features = [
+        'tmax_surface_K_surface_current',
+        'tmax_surface_K_surface_lag_1',
+        'tmax_surface_K_surface_lag_2',
+        'tmax_boundary_layer_K_boundary_layer_lag_1'
+    ]
+    for feature in key_features:
+        if feature in merged.columns:
+            coverage = merged[feature].notna().sum()
+            print(f"  {feature}: {coverage:,}/{len(merged):,} ({coverage / len(merged) * 100:.1f}%)")
+
+    return merged
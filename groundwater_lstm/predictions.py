@@ -0,0 +1,44 @@
+"""
+Rows of `data/predictions/test_predictions_detailed.csv`.
+
+Shared by the training export (`HaryanaGroundwaterLSTM.export_predictions`)
+and incremental ingestion, so both write the same columns. Every row carries
+the `date` of the reading it predicts; the backend aggregates the table by
+district and month for `/api/dashboard/forecast`, and falls back to sampled
+rows for files written before the column existed.
+"""
+import numpy as np
+import pandas as pd
+
+PREDICTIONS_FILENAME = 'test_predictions_detailed.csv'
+TARGET_COLUMN = 'WL (in mbgl)'
+DEFAULT_STATE = 'Haryana'
+
+
+def prediction_rows(meta, predicted, start_id=0):
+    """One detailed prediction row per row of `meta`
+
+    `meta` has the predicted readings' `location_id`, `date`, actual target
+    and DISTRICT / BLOCK / VILLAGE / LATITUDE / LONGITUDE (STATE optional).
+    """
+    actual = meta[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64).reshape(-1)
+    error = predicted - actual
+    state = meta['STATE'].to_numpy() if 'STATE' in meta.columns else np.full(len(meta), DEFAULT_STATE)
+    return pd.DataFrame({
+        'prediction_id': np.arange(start_id, start_id + len(actual)),
+        'location_id': meta['location_id'].to_numpy(),
+        'date': pd.to_datetime(meta['date']).dt.strftime('%Y-%m-%d').to_numpy(),
+        'state': state,
+        'district': meta['DISTRICT'].to_numpy(),
+        'block': meta['BLOCK'].to_numpy(),
+        'village': meta['VILLAGE'].to_numpy(),
+        'latitude': meta['LATITUDE'].to_numpy(),
+        'longitude': meta['LONGITUDE'].to_numpy(),
+        'actual_water_level': actual,
+        'predicted_water_level': predicted,
+        'error': error,
+        'absolute_error': np.abs(error),
+        'squared_error': error ** 2,
+        'accuracy_percentage': 100 - np.abs(error) / actual * 100,
+    })
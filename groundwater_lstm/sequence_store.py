@@ -0,0 +1,132 @@
+"""
+Memory-mapped sequence store for LSTM training.
+
+`write_sequence_store` gathers the training windows straight into float32
+`.npy` files (X, y, location_ids, target dates) plus a `manifest.json` with the split
+boundaries, in fixed-size chunks, so the full (sequences, steps, features)
+tensor never has to exist in RAM. `SequenceStore` maps the files read-only and
+exposes each split as a slice of the mapping, or as a batched `tf.data`
+pipeline that reads one batch at a time and prefetches the next while the
+model trains - peak memory follows the batch size, not the dataset size.
+
+The directory is built next to the target and renamed into place, so a
+half-written store is never picked up.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .sequences import gather_windows, sequence_plan, split_bounds, target_dates
+
+FORMAT_VERSION = 1
+WRITE_CHUNK_SIZE = 8192
+
+
+def write_sequence_store(directory, df, feature_names, target_column, sequence_length,
+                         test_size=0.2, validation_size=0.1, chunk_size=WRITE_CHUNK_SIZE):
+    """Write the sequences of a prepared (scaled) frame and return the opened store"""
+    windows, starts, y, location_ids = sequence_plan(df, feature_names, target_column, sequence_length)
+    n_total = len(starts)
+
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    X = np.lib.format.open_memmap(
+        os.path.join(tmp_dir, 'X.npy'), mode='w+', dtype=np.float32,
+        shape=(n_total, sequence_length, len(feature_names))
+    )
+    for begin in range(0, n_total, chunk_size):
+        end = min(begin + chunk_size, n_total)
+        gather_windows(windows, starts[begin:end], out=X[begin:end])
+    X.flush()
+    del X
+    np.save(os.path.join(tmp_dir, 'y.npy'), y.astype(np.float32))
+    np.save(os.path.join(tmp_dir, 'location_ids.npy'), location_ids)
+    dates = pd.to_datetime(target_dates(df, starts, sequence_length)).to_numpy(dtype='datetime64[D]')
+    np.save(os.path.join(tmp_dir, 'dates.npy'), dates)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'n_sequences': n_total,
+        'sequence_length': sequence_length,
+        'feature_names': list(feature_names),
+        'target': target_column,
+        'splits': {name: list(bounds) for name, bounds in split_bounds(n_total, test_size, validation_size).items()},
+    }
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+
+    old_dir = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.rename(directory, old_dir)
+    os.rename(tmp_dir, directory)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    return SequenceStore(directory)
+
+
+class SequenceStore:
+    """Read-only view over a sequence store directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported sequence store version in {directory}")
+        self.X = np.load(os.path.join(directory, 'X.npy'), mmap_mode='r')
+        self.y = np.load(os.path.join(directory, 'y.npy'), mmap_mode='r')
+        self.location_ids = np.load(os.path.join(directory, 'location_ids.npy'), mmap_mode='r')
+        # Stores written before target dates were kept have no dates.npy
+        dates_path = os.path.join(directory, 'dates.npy')
+        self.dates = np.load(dates_path, mmap_mode='r') if os.path.exists(dates_path) else None
+        self.splits = {name: tuple(bounds) for name, bounds in self.manifest['splits'].items()}
+
+    def split(self, name):
+        """(X, y, location_ids) of one split as slices of the mapping (no copy)"""
+        start, stop = self.splits[name]
+        return self.X[start:stop], self.y[start:stop], self.location_ids[start:stop]
+
+    def split_dates(self, name):
+        """Target date of every sequence of one split, or None for stores without dates"""
+        if self.dates is None:
+            return None
+        start, stop = self.splits[name]
+        return self.dates[start:stop]
+
+    def batches(self, name, batch_size, shuffle=False, seed=None):
+        """Yield (X, y) batches of one split, reading only one batch at a time"""
+        start, stop = self.splits[name]
+        if not shuffle:
+            for begin in range(start, stop, batch_size):
+                end = min(begin + batch_size, stop)
+                yield np.asarray(self.X[begin:end]), np.asarray(self.y[begin:end])
+            return
+        # Same per-epoch sample shuffle as Model.fit on arrays; sorting each
+        # batch's indices keeps the reads in file order
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(np.arange(start, stop))
+        for begin in range(0, len(order), batch_size):
+            index = np.sort(order[begin:begin + batch_size])
+            yield self.X[index], self.y[index]
+
+    def dataset(self, name, batch_size, shuffle=False):
+        """Batched, prefetching tf.data pipeline over one split"""
+        import tensorflow as tf
+
+        _, sequence_length, n_features = self.X.shape
+        signature = (
+            tf.TensorSpec((None, sequence_length, n_features), tf.float32),
+            tf.TensorSpec((None,), tf.float32),
+        )
+        # The generator is re-invoked every epoch, so shuffled epochs differ
+        dataset = tf.data.Dataset.from_generator(
+            lambda: self.batches(name, batch_size, shuffle=shuffle), output_signature=signature
+        )
+        return dataset.prefetch(tf.data.AUTOTUNE)
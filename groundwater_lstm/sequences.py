@@ -0,0 +1,82 @@
+"""
+Sliding-window sequence builder for the LSTM.
+
+The table is sorted once by (location, date). In that order a window that
+starts at row `s` is valid exactly when row `s + sequence_length` (its target)
+belongs to the same location, so all windows come from one strided view
+(`sliding_window_view`) gathered into a single preallocated float32 array -
+no per-location filtering and no Python lists of windows.
+
+Locations keep their order of first appearance in the frame and windows are in
+date order within each location, matching the original per-location loop.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _location_date_order(df, location_column, date_column):
+    codes, locations = pd.factorize(df[location_column], sort=False)
+    dates = df[date_column].to_numpy()
+    # Stable sort by location (first-appearance order), then by date
+    return codes, locations, np.lexsort((dates, codes))
+
+
+def sequence_plan(df, feature_names, target_column, sequence_length, location_column='location_id',
+                  date_column='date'):
+    """Sorted window view plus the start row, target and location of every valid window
+
+    Returns (windows, starts, y, location_ids) where `windows[starts[i]]` is the
+    (sequence_length, n_features) input of sequence i. `windows` is a strided
+    view, so nothing is copied until windows are gathered.
+    """
+    codes, locations, order = _location_date_order(df, location_column, date_column)
+    codes = codes[order]
+    values = df[feature_names].to_numpy(dtype=np.float32)[order]
+    target = df[target_column].to_numpy()[order]
+
+    n_rows, n_features = values.shape
+    if n_rows <= sequence_length:
+        windows = np.empty((0, sequence_length, n_features), dtype=np.float32)
+        return windows, np.empty(0, dtype=np.int64), target[:0], np.asarray(locations)[:0]
+
+    # Window starting at s predicts row s + sequence_length of the same location
+    starts = np.flatnonzero(codes[:-sequence_length] == codes[sequence_length:])
+    windows = sliding_window_view(values, sequence_length, axis=0).transpose(0, 2, 1)
+    return windows, starts, target[starts + sequence_length], np.asarray(locations)[codes[starts]]
+
+
+def target_dates(df, starts, sequence_length, location_column='location_id', date_column='date'):
+    """Date of the target row of each window in `starts` (as returned by `sequence_plan`)"""
+    _, _, order = _location_date_order(df, location_column, date_column)
+    return df[date_column].to_numpy()[order][np.asarray(starts, dtype=np.int64) + sequence_length]
+
+
+def gather_windows(windows, starts, out=None):
+    """Copy the selected windows into `out` (a new float32 array when not given)"""
+    if out is None:
+        out = np.empty((len(starts),) + windows.shape[1:], dtype=np.float32)
+    if len(starts):
+        np.take(windows, starts, axis=0, out=out)
+    return out
+
+
+def build_sequences(df, feature_names, target_column, sequence_length, location_column='location_id',
+                    date_column='date'):
+    """Return (X, y, location_ids) with X of shape (n, sequence_length, n_features) in float32"""
+    windows, starts, y, location_ids = sequence_plan(
+        df, feature_names, target_column, sequence_length, location_column, date_column
+    )
+    return gather_windows(windows, starts), y, location_ids
+
+
+def split_bounds(n_total, test_size=0.2, validation_size=0.1):
+    """(start, stop) of the train/val/test splits, in sequence order"""
+    n_test = int(n_total * test_size)
+    n_val = int(n_total * validation_size)
+    n_train = n_total - n_test - n_val
+    return {
+        'train': (0, n_train),
+        'val': (n_train, n_train + n_val),
+        'test': (n_train + n_val, n_total),
+    }
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from groundwater_lstm.pipeline import aggregation
+
+
+def test_cell_codes_sorted_by_coordinates():
+    codes, cell_lat, cell_lon = aggregation._cell_codes(np.array([29.0, 28.0, 29.0]), np.array([76.0, 77.0, 76.0]))
+
+    np.testing.assert_array_equal(codes, [1, 0, 1])
+    np.testing.assert_array_equal(cell_lat, [28.0, 29.0])
+    np.testing.assert_array_equal(cell_lon, [77.0, 76.0])
+
+
+def test_cell_codes_reject_missing_coordinates():
+    with pytest.raises(ValueError):
+        aggregation._cell_codes(np.array([28.0, np.nan]), np.array([76.0, 77.0]))
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from data_registry import DataRegistry, PinnedDataMiddleware, pinned_data_set
+
+METRICS = "model_performance_metrics.csv"
+_writes = iter(range(1, 10 ** 6))
+
+
+def write_metrics(data_dir, rmse, columns=("dataset", "rmse", "mae", "r2_score", "n_samples")):
+    row = {"dataset": "test", "rmse": rmse, "mae": 1.0, "r2_score": 0.9, "n_samples": 10}
+    path = os.path.join(data_dir, METRICS)
+    pd.DataFrame([{column: row[column] for column in columns}]).to_csv(path, index=False)
+    # A distinct mtime per write, so the (mtime_ns, size) signature changes even on coarse clocks
+    stamp = time.time_ns() + next(_writes) * 10 ** 9
+    os.utime(path, ns=(stamp, stamp))
+
+
+def settle(registry):
+    """Poll until the change has been seen twice, as the watcher does"""
+    return registry.poll() or registry.poll()
+
+
+def test_valid_reload_is_published(tmp_path):
+    write_metrics(tmp_path, 2.0)
+    registry = DataRegistry(str(tmp_path))
+    first = registry.get()
+
+    write_metrics(tmp_path, 3.5)
+    assert settle(registry)
+    assert registry.reload()
+
+    assert registry.current is not first
+    assert registry.current.version != first.version
+    assert registry.current.table(METRICS)["rmse"].tolist() == [3.5]
+    assert registry.last_error is None
+
+
+def test_corrupt_reload_keeps_previous_version(tmp_path):
+    write_metrics(tmp_path, 2.0)
+    registry = DataRegistry(str(tmp_path))
+    good = registry.get()
+
+    write_metrics(tmp_path, 4.0, columns=("dataset", "mae"))
+    assert settle(registry)
+    assert not registry.reload()
+
+    assert registry.current is good
+    assert registry.current.table(METRICS)["rmse"].tolist() == [2.0]
+    assert "rmse" in registry.last_error
+    # The rejected files are not reloaded on every poll
+    assert not settle(registry)
+
+    write_metrics(tmp_path, 5.0)
+    assert settle(registry) and registry.reload()
+    assert registry.current.table(METRICS)["rmse"].tolist() == [5.0]
+
+
+def test_failing_prepare_keeps_previous_version(tmp_path):
+    def prepare(data):
+        if data.table(METRICS)["rmse"].iloc[0] < 0:
+            raise ValueError("negative rmse")
+
+    write_metrics(tmp_path, 2.0)
+    registry = DataRegistry(str(tmp_path), prepare=prepare)
+    good = registry.get()
+
+    write_metrics(tmp_path, -1.0)
+    assert settle(registry)
+    assert not registry.reload()
+
+    assert registry.current is good
+    assert "negative rmse" in registry.last_error
+    assert not settle(registry)
+
+
+def test_first_load_prepare_error_is_raised(tmp_path):
+    write_metrics(tmp_path, 2.0)
+    registry = DataRegistry(str(tmp_path), prepare=lambda data: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        registry.get()
+    assert registry.current is None
+
+
+def test_request_keeps_pinned_version_during_reload(tmp_path):
+    write_metrics(tmp_path, 2.0)
+    registry = DataRegistry(str(tmp_path))
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(pinned_data_set())
+        write_metrics(tmp_path, 3.0)
+        settle(registry) and registry.reload()
+        seen.append(pinned_data_set())
+
+    asyncio.run(PinnedDataMiddleware(app, registry)({"type": "http"}, None, None))
+
+    assert seen[0] is seen[1]
+    assert seen[0].table(METRICS)["rmse"].tolist() == [2.0]
+    assert registry.current.table(METRICS)["rmse"].tolist() == [3.0]
+    assert pinned_data_set() is None
@@ -0,0 +1,72 @@
+import numpy as np
+import orjson
+import pandas as pd
+
+from forecast_cube import ALL_DISTRICTS, ForecastCube
+
+
+def predictions():
+    return pd.DataFrame({
+        'district': ['Hisar', 'Hisar', 'Hisar', 'Sirsa', 'Sirsa', 'Hisar', None],
+        'date': ['2024-01-05', '2024-01-20', '2024-01-28', '2024-01-10', '2024-03-02', '2024-03-15', '2024-03-01'],
+        'actual_water_level': [10.0, 20.0, 30.0, 5.0, 7.0, 12.0, 99.0],
+        'predicted_water_level': [11.0, 19.0, 33.0, 6.0, 8.0, np.nan, 99.0],
+    })
+
+
+def test_monthly_statistics_per_district():
+    cube = ForecastCube(predictions(), version='v1')
+    hisar = cube.row('HISAR')
+
+    january = cube.cell(hisar, 2024, 1)
+    assert january['count'] == 3
+    assert january['historical'] == 20.0
+    assert (january['historicalMin'], january['historicalMax'], january['historicalP50']) == (10.0, 30.0, 20.0)
+    assert january['historicalP10'] == 12.0
+    assert january['predicted'] == 21.0
+    assert january['predictedP90'] == 30.2
+    # Rows without a district or with a missing level are left out; February has no predictions
+    assert cube.cell(hisar, 2024, 3) is None
+    assert cube.cell(hisar, 2024, 2) is None
+
+
+def test_all_district_series():
+    cube = ForecastCube(predictions(), version='v1')
+
+    points = orjson.loads(cube.render(cube.row(None), 12)[0])
+
+    assert [(p['date'], p['count'], p['district']) for p in points] == [
+        ('2024-01', 4, ALL_DISTRICTS), ('2024-03', 1, ALL_DISTRICTS)]
+    assert points[0]['historical'] == 16.25
+    assert points[1]['historical'] == 7.0
+
+
+def test_render_horizon_and_etag():
+    cube = ForecastCube(predictions(), version='v1')
+    sirsa = cube.row('sirsa')
+
+    body, etag = cube.render(sirsa, 1)
+
+    assert [p['month'] for p in orjson.loads(body)] == ['Mar 2024']
+    assert etag == f'"forecast-v1-{sirsa}-1"'
+    assert cube.row('Atlantis') is None
+
+
+def test_undated_predictions_fall_back_to_samples():
+    cube = ForecastCube(predictions().drop(columns='date'), version='v1')
+
+    points = orjson.loads(cube.render(cube.row('Sirsa'), 3)[0])
+
+    assert [p['month'] for p in points] == ['Jan 2024', 'Jan 2024', 'Mar 2024']
+    assert [p['historical'] for p in points] == [5.0, 5.0, 7.0]
+
+
+def test_no_valid_dated_rows_fall_back_to_samples():
+    df = predictions().assign(predicted_water_level=np.nan)
+
+    cube = ForecastCube(df, version='v1')
+
+    assert not cube.dated
+    points = orjson.loads(cube.render(cube.row('Hisar'), 2)[0])
+    assert [p['historical'] for p in points] == [10.0, 12.0]
+    assert cube.cell(cube.row('Hisar'), 2024, 1) is None
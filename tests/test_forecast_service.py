@@ -0,0 +1,93 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from forecast_service import MODEL_FILENAME, SCALERS_FILENAME, ForecastService, MicroBatcher
+
+
+class FakeModel:
+    """Per-row sum of the inputs; fails on batches containing a negative value"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        if (inputs < 0).any():
+            raise RuntimeError("model failed")
+        return inputs.reshape(len(inputs), -1).sum(axis=1)
+
+
+async def submit_all(batcher, sequences):
+    try:
+        return await asyncio.gather(*(batcher.submit(sequence) for sequence in sequences), return_exceptions=True)
+    finally:
+        await batcher.close()
+
+
+def run(model, sequences, **options):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return asyncio.run(submit_all(MicroBatcher(model, executor, **options), sequences))
+
+
+def sequences(n):
+    return [np.full((6, 2), i, dtype=np.float32) for i in range(n)]
+
+
+def test_concurrent_requests_share_one_batch():
+    model = FakeModel()
+
+    results = run(model, sequences(10), max_wait_ms=50)
+
+    assert model.batch_sizes == [10]
+    assert results == [(12.0 * i, 10) for i in range(10)]
+
+
+def test_batches_are_capped():
+    model = FakeModel()
+
+    results = run(model, sequences(10), max_batch_size=4, max_wait_ms=50)
+
+    assert model.batch_sizes == [4, 4, 2]
+    assert [value for value, _ in results] == [12.0 * i for i in range(10)]
+    assert [size for _, size in results] == [4] * 8 + [2] * 2
+
+
+def test_model_error_reaches_every_caller_of_the_batch_only():
+    model = FakeModel()
+    inputs = sequences(6)
+    inputs[1] = -inputs[1] - 1
+
+    results = run(model, inputs, max_batch_size=3, max_wait_ms=50)
+
+    assert model.batch_sizes == [3, 3]
+    assert all(isinstance(result, RuntimeError) for result in results[:3])
+    assert results[3:] == [(12.0 * i, 3) for i in range(3, 6)]
+
+
+def test_service_infer_encodes_steps(tmp_path):
+    (tmp_path / MODEL_FILENAME).write_bytes(b"")
+    (tmp_path / SCALERS_FILENAME).write_text(json.dumps({
+        "sequence_length": 2, "feature_names": ["rainfall", "tmax"], "target": "level",
+        "scalers": {"rainfall": {"scale": 1.0, "min": 0.0}, "tmax": {"scale": 1.0, "min": 0.0},
+                    "level": {"scale": 1.0, "min": 0.0}},
+    }))
+    service = ForecastService(str(tmp_path), max_wait_ms=50)
+    # Stands in for the Keras/ONNX model loaded on first use
+    service._model = FakeModel()
+
+    async def infer():
+        try:
+            return await asyncio.gather(
+                service.infer([{"rainfall": 1.0, "tmax": 2.0}, {"rainfall": 3.0, "tmax": 4.0}]),
+                service.infer([{"rainfall": 0.0, "tmax": 0.5}, {"rainfall": 0.5, "tmax": 0.0}]),
+            )
+        finally:
+            await service.close()
+
+    assert asyncio.run(infer()) == [(10.0, 2), (1.0, 2)]
+    with pytest.raises(ValueError):
+        service.artifacts.encode([{"rainfall": 1.0}])
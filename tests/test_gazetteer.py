@@ -0,0 +1,65 @@
+from gazetteer import Gazetteer
+
+PLACES = [
+    ("Charki Dadri", "district", "Charki Dadri"),
+    ("Hisar", "district", "Hisar"),
+    ("Hansi-I", "block", "Hisar"),
+    ("Sirsa", "district", "Sirsa"),
+    ("Sirsa Road", "village", "Hisar"),
+    ("Ambala", "district", "Ambala"),
+    ("Ambala", "village", "Sirsa"),
+]
+
+
+def names(matches):
+    return [(match.name, match.kind, match.district) for match in matches]
+
+
+def test_spelling_variants_and_aliases():
+    gazetteer = Gazetteer(PLACES)
+
+    assert names([gazetteer.find("Levels in Hissar?")]) == [("Hisar", "district", "Hisar")]
+    assert names([gazetteer.find("what about hansi")]) == [("Hansi-I", "block", "Hisar")]
+    assert names([gazetteer.find("Dadri wells")]) == [("Dadri", "district", "Charki Dadri")]
+
+
+def test_longest_match_wins():
+    gazetteer = Gazetteer(PLACES)
+
+    assert names([gazetteer.find("Wells near Charkhi-Dadri")]) == [("Charki Dadri", "district", "Charki Dadri")]
+    assert names([gazetteer.find("on Sirsa Road")]) == [("Sirsa Road", "village", "Hisar")]
+
+
+def test_district_beats_village_of_same_name():
+    gazetteer = Gazetteer(PLACES)
+
+    assert gazetteer.find("What about Ambala?").kind == "district"
+
+
+def test_whole_words_only_and_fuzzy_fallback():
+    gazetteer = Gazetteer(PLACES)
+
+    assert gazetteer.find("Hisarwala canal") is None
+    found = gazetteer.find("levels in Sirso")
+    assert names([found]) == [("Sirsa", "district", "Sirsa")] and found.fuzzy
+    assert gazetteer.find("levels in Sirso", fuzzy=False) is None
+
+
+def test_find_all_resolves_overlaps():
+    gazetteer = Gazetteer(PLACES)
+
+    # "Dadri" is an alias of Charki Dadri and "Sirsa" a district, but both lie inside longer matches
+    found = gazetteer.find_all("Wells near Charkhi Dadri and on Sirsa Road")
+
+    assert names(found) == [("Charki Dadri", "district", "Charki Dadri"), ("Sirsa Road", "village", "Hisar")]
+
+
+def test_find_all_in_message_order():
+    gazetteer = Gazetteer(PLACES)
+
+    found = gazetteer.find_all("Compare Hissar, Hansi and Dadri")
+
+    assert names(found) == [("Hisar", "district", "Hisar"), ("Hansi-I", "block", "Hisar"),
+                            ("Dadri", "district", "Charki Dadri")]
+    assert not any(match.fuzzy for match in found)
+    assert names(gazetteer.find_all("ambala")) == [("Ambala", "district", "Ambala")]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from groundwater_lstm.pipeline.keys import join_on_keys
+
+
+def test_unique_keys_keep_left_index_and_order():
+    left = pd.DataFrame({'well': [3, 1, 2, 9], 'month': [5, 5, 6, 5], 'level': [1.0, 2.0, 3.0, 4.0]},
+                        index=[10, 11, 12, 13])
+    right = pd.DataFrame({'well': [1, 2, 3], 'month': [5, 6, 5], 'tmax': [30.0, 31.0, 32.0]})
+
+    joined = join_on_keys(left, right, ['well', 'month'], columns=['tmax'])
+
+    assert list(joined.index) == [10, 11, 12, 13]
+    np.testing.assert_array_equal(joined['tmax'].to_numpy(), [32.0, 30.0, 31.0, np.nan])
+
+
+def test_duplicate_right_keys_match_merge():
+    left = pd.DataFrame({'well': [1, 2, 3], 'month': [5, 5, 5], 'level': [1.0, 2.0, 3.0]})
+    right = pd.DataFrame({'well': [1, 1, 2, 4], 'month': [5, 5, 5, 5], 'tmax': [30.0, 30.5, 31.0, 33.0]})
+
+    joined = join_on_keys(left, right, ['well', 'month'], columns=['tmax'])
+    expected = left.merge(right, on=['well', 'month'], how='left')
+
+    # Every left row once per matching right row, unmatched rows kept with NaN
+    pd.testing.assert_frame_equal(joined.reset_index(drop=True), expected)
+
+
+def test_key_arrays_instead_of_columns():
+    left = pd.DataFrame({'level': [1.0, 2.0]})
+    right = pd.DataFrame({'cell': [7, 8], 'year_month': [100, 100], 'rainfall': [12.0, 0.0]})
+
+    joined = join_on_keys(left, right, [np.array([8, 7]), np.array([100, 101])], ['cell', 'year_month'],
+                          columns=['rainfall'])
+
+    np.testing.assert_array_equal(joined['rainfall'].to_numpy(), [0.0, np.nan])
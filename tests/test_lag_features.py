@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from groundwater_lstm.pipeline.lag_features import rainfall_lag_engine, temperature_lag_engine
+
+
+def monthly_series(n_wells=3, n_months=24, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'LATITUDE': np.repeat(np.arange(n_wells) * 0.25 + 28.0, n_months),
+        'LONGITUDE': np.repeat(np.arange(n_wells) * 0.5 + 76.0, n_months),
+        'date': np.tile(pd.date_range('2020-01-01', periods=n_months, freq='MS'), n_wells),
+        'rainfall': rng.gamma(2.0, 20.0, n_wells * n_months),
+    })
+    df.loc[df.sample(frac=0.1, random_state=seed).index, 'rainfall'] = np.nan
+    # Rows arrive shuffled, as they do from a merge
+    return df.sample(frac=1.0, random_state=seed + 1).reset_index(drop=True)
+
+
+def test_append_matches_fit_transform():
+    df = monthly_series()
+    engine = rainfall_lag_engine()
+    expected = engine.fit_transform(df)
+
+    cut = pd.Timestamp('2021-03-01')
+    incremental = rainfall_lag_engine()
+    incremental.fit_transform(df[df['date'] < cut])
+    middle = df[(df['date'] >= cut) & (df['date'] < pd.Timestamp('2021-08-01'))]
+    rest = df[df['date'] >= pd.Timestamp('2021-08-01')]
+    appended = pd.concat([incremental.append(middle), incremental.append(rest)])
+
+    pd.testing.assert_frame_equal(appended.sort_index(), expected.loc[appended.index].sort_index())
+
+
+def test_append_after_saved_state(tmp_path):
+    df = monthly_series(n_wells=2, n_months=12)
+    columns = ['tmax', 'tmin']
+    df = df.assign(tmax=df['rainfall'], tmin=-df['rainfall']).rename(columns={
+        'LATITUDE': 'well_lat', 'LONGITUDE': 'well_lon', 'date': 'time_dt'})
+    expected = temperature_lag_engine(columns).fit_transform(df)
+
+    cut = pd.Timestamp('2020-09-01')
+    engine = temperature_lag_engine(columns)
+    engine.fit_transform(df[df['time_dt'] < cut])
+    engine.save_state(tmp_path / 'tail.pkl')
+    appended = temperature_lag_engine(columns).load_state(tmp_path / 'tail.pkl').append(df[df['time_dt'] >= cut])
+
+    pd.testing.assert_frame_equal(appended, expected.loc[appended.index])
+
+
+def test_append_rejects_rows_inside_history():
+    df = monthly_series(n_wells=1, n_months=12)
+    engine = rainfall_lag_engine()
+    engine.fit_transform(df)
+    with pytest.raises(ValueError):
+        engine.append(df[df['date'] == df['date'].max()])
@@ -0,0 +1,72 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prediction_export import stream_arrow, stream_csv, stream_ndjson
+from prediction_index import PredictionIndex
+
+
+def predictions(n_rows=40, seed=1):
+    rng = np.random.default_rng(seed)
+    actual = rng.gamma(2.0, 5.0, n_rows)
+    predicted = actual + rng.normal(0, 2, n_rows)
+    return pd.DataFrame({
+        'prediction_id': rng.permutation(n_rows),
+        'location_id': rng.integers(0, 5, n_rows),
+        'district': rng.choice(['Hisar', 'Sirsa', 'Ambala'], n_rows),
+        'actual_water_level': actual,
+        'predicted_water_level': predicted,
+        'error': predicted - actual,
+        'absolute_error': np.abs(predicted - actual),
+        'squared_error': (predicted - actual) ** 2,
+    })
+
+
+def expected_rows(df):
+    """Rows of the filter used below, in key order, as the old pandas code selected them"""
+    rows = df[(df['district'] == 'Sirsa') & (df['absolute_error'] >= 1.0)]
+    return rows.sort_values('prediction_id').reset_index(drop=True)
+
+
+def read_ndjson(body):
+    return pd.read_json(io.BytesIO(body), lines=True)
+
+
+def read_csv(body):
+    return pd.read_csv(io.BytesIO(body))
+
+
+def read_arrow(body):
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(body).read_pandas()
+
+
+@pytest.mark.parametrize('stream, read', [(stream_ndjson, read_ndjson), (stream_csv, read_csv),
+                                          (stream_arrow, read_arrow)])
+@pytest.mark.parametrize('batch_size', [3, 1000])
+def test_export_matches_filtered_frame(stream, read, batch_size):
+    if stream is stream_arrow:
+        pytest.importorskip('pyarrow')
+    df = predictions()
+    index = PredictionIndex(df, version='v1')
+    selection = index.select(district='sirsa', min_abs_error=1.0)
+
+    chunks = list(stream(index, selection, batch_size))
+
+    expected = expected_rows(df)
+    assert len(expected) > 3
+    pd.testing.assert_frame_equal(read(b''.join(chunks)), expected, check_dtype=False)
+
+
+def test_empty_selection_keeps_header():
+    pytest.importorskip('pyarrow')
+    df = predictions()
+    index = PredictionIndex(df, version='v1')
+    selection = index.select(district='Atlantis')
+
+    assert list(read_csv(b''.join(stream_csv(index, selection))).columns) == list(df.columns)
+    assert b''.join(stream_ndjson(index, selection)) == b''
+    assert list(read_arrow(b''.join(stream_arrow(index, selection))).columns) == list(df.columns)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from prediction_index import PredictionIndex, decode_cursor, encode_cursor
+
+
+def predictions(n_rows=50, seed=0):
+    rng = np.random.default_rng(seed)
+    actual = rng.gamma(2.0, 5.0, n_rows)
+    actual[[3, 17, 40]] = np.nan
+    predicted = actual + rng.normal(0, 2, n_rows)
+    df = pd.DataFrame({
+        # Not in key order, with gaps
+        'prediction_id': rng.permutation(np.arange(n_rows) * 3),
+        'location_id': rng.integers(0, 5, n_rows),
+        'district': rng.choice(['Hisar', 'Sirsa', 'Ambala'], n_rows),
+        'actual_water_level': actual,
+        'predicted_water_level': predicted,
+        'error': predicted - actual,
+        'absolute_error': np.abs(predicted - actual),
+        'squared_error': (predicted - actual) ** 2,
+    })
+    return df
+
+
+def walk(index, selection, limit):
+    """Keys of every page, following nextCursor from the first page to the last"""
+    keys, after = [], None
+    while True:
+        ranks, next_key = index.page(selection, limit=limit, after=after)
+        keys.extend(index.keys[ranks].tolist())
+        if next_key is None:
+            return keys
+        after = decode_cursor(encode_cursor(next_key))
+
+
+@pytest.mark.parametrize('limit', [1, 7, 50, 100])
+def test_cursor_walk_returns_every_row_once(limit):
+    df = predictions()
+    index = PredictionIndex(df, version='v1')
+
+    keys = walk(index, index.select(), limit)
+
+    assert keys == sorted(df['prediction_id'].tolist())
+
+
+def test_cursor_walk_over_filtered_selection():
+    df = predictions()
+    index = PredictionIndex(df, version='v1')
+
+    keys = walk(index, index.select(district='HISAR', min_actual=5.0), 4)
+
+    expected = df[(df['district'] == 'Hisar') & (df['actual_water_level'] >= 5.0)]['prediction_id']
+    assert keys == sorted(expected.tolist())
+
+
+def test_range_filters_exclude_missing_values():
+    df = predictions()
+    index = PredictionIndex(df, version='v1')
+
+    for low, high in [(5.0, None), (None, 8.0), (2.0, 9.0)]:
+        ranks = index.select(min_actual=low, max_actual=high)
+        actual = df['actual_water_level']
+        mask = actual.notna()
+        if low is not None:
+            mask &= actual >= low
+        if high is not None:
+            mask &= actual <= high
+        assert sorted(index.keys[ranks].tolist()) == sorted(df.loc[mask, 'prediction_id'].tolist())
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor!')
+
+
+def test_invalid_cursor_is_a_bad_request():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    client = TestClient(main.app)
+    response = client.get('/api/predictions', params={'cursor': 'not a cursor!', 'limit': 5})
+    assert response.status_code == 400
+
+    first = client.get('/api/predictions', params={'district': 'Hisar', 'limit': 5}).json()
+    second = client.get('/api/predictions', params={'district': 'Hisar', 'limit': 5,
+                                                     'cursor': first['nextCursor']}).json()
+    assert first['nextCursor'] and len(second['predictions']) == 5
+    assert {row['predictionId'] for row in first['predictions']}.isdisjoint(
+        row['predictionId'] for row in second['predictions'])
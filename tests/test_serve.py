@@ -0,0 +1,26 @@
+import gc
+import weakref
+
+import pytest
+
+
+class _Node:
+    def __init__(self):
+        self.me = self
+
+
+def test_reload_collects_objects_frozen_by_the_previous_load():
+    pytest.importorskip("main")
+    from serve import PreforkServer
+
+    server = PreforkServer(1, "127.0.0.1", 0)
+    # Stands in for the previous data set: alive at the first freeze, garbage (a cycle) after it
+    node = _Node()
+    dead = weakref.ref(node)
+    try:
+        server.load()
+        del node
+        server.load()
+        assert dead() is None
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,22 @@
+import numpy as np
+
+from groundwater_lstm.pipeline import temperature
+
+
+def test_cell_codes_skip_missing_coordinates():
+    lat = np.array([28.0, np.nan, 28.0, 29.0, 28.0, 29.0])
+    lon = np.array([76.0, 76.0, np.nan, 77.0, 76.0, 76.0])
+
+    codes, cell_lat, cell_lon = temperature._cell_codes(lat, lon)
+
+    # Cells in first-appearance order; rows with a missing coordinate belong to none
+    np.testing.assert_array_equal(codes, [0, -1, -1, 1, 0, 2])
+    np.testing.assert_array_equal(cell_lat, [28.0, 29.0, 29.0])
+    np.testing.assert_array_equal(cell_lon, [76.0, 77.0, 76.0])
+
+
+def test_cell_codes_all_missing():
+    codes, cell_lat, cell_lon = temperature._cell_codes(np.array([np.nan, np.nan]), np.array([76.0, np.nan]))
+
+    np.testing.assert_array_equal(codes, [-1, -1])
+    assert len(cell_lat) == len(cell_lon) == 0